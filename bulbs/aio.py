@@ -0,0 +1,865 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Base classes for using Bulbs from an asyncio event loop (Python 3.5+).
+
+The async clients reuse the synchronous client code -- since the client
+methods return whatever Request returns, swapping in AsyncRequest makes them
+return coroutines. Only the client methods that post-process the Response
+need to be overridden, which is done in each backend's aio module.
+
+Requires aiohttp.
+
+.. note:: The async layer supports the generic Vertex and Edge classes and
+          their proxies; Models are not supported yet.
+
+"""
+import asyncio
+
+import aiohttp
+import httplib2
+import six
+
+from .rest import Request
+from .groovy import registered, is_unknown_method
+from .retry import connection_errors, monotonic
+from .element import Vertex, Edge, build_data, coerce_vertices, get_shared_proxy
+from .utils import initialize_element, initialize_elements, get_one_result
+from .utils import get_logger
+
+
+log = get_logger(__name__)
+
+# Errors raised when the server can't be reached or drops the connection
+async_connection_errors = connection_errors + (aiohttp.ClientError, asyncio.TimeoutError)
+
+
+class AsyncRequest(Request):
+    """
+    Used for connecting to a REST server over HTTP from an asyncio event loop.
+
+    The request methods (get, put, post, delete, send, request) are coroutines
+    that return the same Response objects the synchronous Request returns.
+
+    .. note:: The aiohttp session is created on first use so it's bound to
+              the running event loop. Call close() when you're done with it.
+
+    """
+    def _build_http(self, config):
+        # aiohttp manages its own connection pool
+        return None
+
+    def _initialize(self):
+        self.session = None
+
+    def _add_credentials(self, username, password):
+        self.auth = None
+        if username and password:
+            self.auth = aiohttp.BasicAuth(username, password)
+
+    async def request(self, method, path, params, read_only=None):
+        """
+        Sends a request to the client.
+
+        :param method: HTTP method: GET, PUT, POST, or DELETE.
+        :type method: str
+
+        :param path: Path to the server resource, relative to the root URI.
+        :type path: str
+
+        :param params: Optional URI parameters for the resource.
+        :type params: dict
+
+        :param read_only: True if the request doesn't modify the database so 
+            it can be sent to a replica. Defaults to None (only GETs are).
+        :type read_only: bool
+
+        :rtype: Response
+
+        """
+        uri, method, body, headers = self._build_request_args(path, method, params)
+
+        self._display_debug(uri, method, body)
+
+        if isinstance(body, six.text_type):
+            body = body.encode('utf-8')
+
+        if read_only is None:
+            read_only = (method == "GET")
+        start = monotonic()
+        attempt = 0
+        while True:
+            endpoint, target, breaker = self._get_target(uri, read_only)
+            self.router.begin(endpoint)
+            try:
+                http_resp = await self._send(target, method, body, headers)
+            except async_connection_errors as error:
+                delay = self._get_retry_delay(endpoint, breaker, target, method,
+                                              attempt, start, error)
+                if delay is None:
+                    raise
+            else:
+                status = http_resp[0].status
+                delay = self._get_retry_delay(endpoint, breaker, target, method,
+                                              attempt, start, status)
+                if delay is None:
+                    break
+            finally:
+                self.router.end(endpoint)
+            if endpoint is None:
+                # failing over from a replica doesn't count as a retry
+                await asyncio.sleep(delay)
+                attempt += 1
+
+        return self.response_class(http_resp, self.config)
+
+    async def _send(self, uri, method, body, headers):
+        session = self._get_session()
+        async with session.request(method, uri, data=body, headers=headers) as resp:
+            content = await resp.read()
+            http_resp = self._build_http_response(resp)
+        return http_resp, content
+
+    def stream(self, method, path, params, read_only=None):
+        raise NotImplementedError("Streaming isn't supported by the async clients")
+
+    async def close(self):
+        """
+        Closes the aiohttp session and its connections.
+
+        :rtype: None
+
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self):
+        if self.session is None or self.session.closed:
+            timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+            self.session = aiohttp.ClientSession(auth=self.auth, timeout=timeout)
+        return self.session
+
+    def _build_http_response(self, resp):
+        # The Response classes expect an httplib2.Response for the headers
+        info = dict((key.lower(), value) for key, value in resp.headers.items())
+        info['status'] = str(resp.status)
+        http_resp = httplib2.Response(info)
+        http_resp.reason = resp.reason
+        return http_resp
+
+    # the aiohttp session can't be pickled
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['session'] = None
+        state['breakers'] = dict()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+
+async def execute_script(scripts, send, script):
+    """
+    Sends the script and returns the Response. The coroutine version of 
+    GroovyScripts.execute(), which registers methods if 
+    Config.register_scripts is True.
+
+    :param scripts: GroovyScripts object.
+    :type scripts: bulbs.groovy.GroovyScripts
+
+    :param send: Function that returns a coroutine that sends a script.
+    :type send: function
+
+    :param script: Gremlin script returned by GroovyScripts.get().
+    :type script: str
+
+    :rtype: Response
+
+    """
+    registration = scripts.registrations.get(script)
+    if registration is None:
+        return await send(script)
+    key = (scripts.config.root_uri, registration.sha1)
+    if key not in registered:
+        resp = await send(registration.script)
+        registered.add(key)
+        return resp
+    try:
+        return await send(script)
+    except (ValueError, SystemError) as error:
+        if not is_unknown_method(error, registration.name):
+            raise
+        log.debug("Registering %s again.", registration.name)
+        return await send(registration.script)
+
+
+#
+# Elements
+#
+
+class AsyncVertex(Vertex):
+    """
+    A Vertex whose traversal and save methods are coroutines.
+
+    Example:
+
+    >>> james = await g.vertices.get(1)
+    >>> friends = await james.outV("knows")
+
+    """
+    @property
+    def _vertices(self):
+        return get_shared_proxy(self._client, AsyncVertexProxy, AsyncVertex)
+
+    @property
+    def _edges(self):
+        return get_shared_proxy(self._client, AsyncEdgeProxy, AsyncEdge)
+
+    @classmethod
+    def get_proxy_class(cls):
+        """
+        Returns the proxy class. Defaults to AsyncVertexProxy.
+
+        :rtype: class
+
+        """
+        return AsyncVertexProxy
+
+    async def outE(self, label=None, start=None, limit=None):
+        """
+        Returns the outgoing edges.
+
+        :param label: Optional edge label.
+        :type label: str or None
+
+        :rtype: Edge generator
+
+        """
+        resp = await self._client.outE(self._id, label, start, limit)
+        return initialize_elements(self._client, resp)
+
+    async def inE(self, label=None, start=None, limit=None):
+        """
+        Returns the incoming edges.
+
+        :param label: Optional edge label.
+        :type label: str or None
+
+        :rtype: Edge generator
+
+        """
+        resp = await self._client.inE(self._id, label, start, limit)
+        return initialize_elements(self._client, resp)
+
+    async def bothE(self, label=None, start=None, limit=None):
+        """
+        Returns the incoming and outgoing edges.
+
+        :param label: Optional edge label.
+        :type label: str or None
+
+        :rtype: Edge generator
+
+        """
+        resp = await self._client.bothE(self._id, label, start, limit)
+        return initialize_elements(self._client, resp)
+
+    async def outV(self, label=None, start=None, limit=None):
+        """
+        Returns the out-adjacent vertices.
+
+        :param label: Optional edge label.
+        :type label: str or None
+
+        :rtype: Vertex generator
+
+        """
+        resp = await self._client.outV(self._id, label, start, limit)
+        return initialize_elements(self._client, resp)
+
+    async def inV(self, label=None, start=None, limit=None):
+        """
+        Returns the in-adjacent vertices.
+
+        :param label: Optional edge label.
+        :type label: str or None
+
+        :rtype: Vertex generator
+
+        """
+        resp = await self._client.inV(self._id, label, start, limit)
+        return initialize_elements(self._client, resp)
+
+    async def bothV(self, label=None, start=None, limit=None):
+        """
+        Returns all incoming- and outgoing-adjacent vertices.
+
+        :param label: Optional edge label.
+        :type label: str or None
+
+        :rtype: Vertex generator
+
+        """
+        resp = await self._client.bothV(self._id, label, start, limit)
+        return initialize_elements(self._client, resp)
+
+    async def save(self):
+        """
+        Saves the vertex in the database.
+
+        :rtype: Response
+
+        """
+        return await self._vertices.update(self._id, self._data)
+
+
+class AsyncEdge(Edge):
+    """A Edge whose traversal and save methods are coroutines."""
+
+    @property
+    def _vertices(self):
+        return get_shared_proxy(self._client, AsyncVertexProxy, AsyncVertex)
+
+    @property
+    def _edges(self):
+        return get_shared_proxy(self._client, AsyncEdgeProxy, AsyncEdge)
+
+    @classmethod
+    def get_proxy_class(cls):
+        """
+        Returns the proxy class. Defaults to AsyncEdgeProxy.
+
+        :rtype: class
+
+        """
+        return AsyncEdgeProxy
+
+    async def outV(self):
+        """
+        Returns the outgoing (start) Vertex of the edge.
+
+        :rtype: Vertex
+
+        """
+        return await self._vertices.get(self._outV)
+
+    async def inV(self):
+        """
+        Returns the incoming (end) Vertex of the edge.
+
+        :rtype: Vertex
+
+        """
+        return await self._vertices.get(self._inV)
+
+    async def save(self):
+        """
+        Saves the edge in the database.
+
+        :rtype: Response
+
+        """
+        return await self._edges.update(self._id, self._data)
+
+
+#
+# Element Proxies
+#
+
+class AsyncVertexProxy(object):
+    """
+    A proxy for interacting with vertices from an asyncio event loop.
+
+    :param element_class: The element class managed by this proxy instance.
+    :type element_class: AsyncVertex class
+
+    :param client: The async Client object for the database.
+    :type client: Client
+
+    :ivar element_class: Element class.
+    :ivar client: Client object.
+    :ivar index: The primary index object or None.
+
+    Example::
+
+    >>> from bulbs.neo4jserver.aio import AsyncGraph
+    >>> g = await AsyncGraph().open()
+    >>> james = await g.vertices.create(name="James")
+    >>> james = await g.vertices.get(james.eid)
+    >>> await g.vertices.delete(james.eid)
+
+    """
+    def __init__(self, element_class, client):
+        assert issubclass(element_class, Vertex)
+
+        self.element_class = element_class
+        self.client = client
+        self.index = None
+
+        # Add element class to Registry so we can initialize query results.
+        self.client.registry.add_class(element_class)
+
+    async def create(self, _data=None, _keys=None, **kwds):
+        """
+        Adds a vertex to the database and returns it.
+
+        :param _data: Optional property data dict.
+        :type _data: dict
+
+        :param kwds: Optional property data keyword pairs.
+        :type kwds: dict
+
+        :rtype: Vertex
+
+        """
+        data = build_data(_data, kwds)
+        resp = await self.client.create_vertex(data, keys=_keys)
+        return initialize_element(self.client, resp.results)
+
+    async def get(self, _id):
+        """
+        Returns the vertex for the given ID.
+
+        :param _id: The vertex ID.
+        :type _id: int or str
+
+        :rtype: Vertex or None
+
+        """
+        try:
+            resp = await self.client.get_vertex(_id)
+            return initialize_element(self.client, resp.results)
+        except LookupError:
+            return None
+
+    async def get_or_create(self, key, value, _data=None, _keys=None, **kwds):
+        """
+        Lookup a vertex in the index and create it if it doesn't exsit.
+
+        :param key: Index key.
+        :type key: str
+
+        :param value: Index value.
+        :type value: str, int, long
+
+        :param _data: Optional property data dict.
+        :type _data: dict
+
+        :param kwds: Optional property data keyword pairs.
+        :type kwds: dict
+
+        :rtype: Vertex
+
+        """
+        vertex = await self.index.get_unique(key, value)
+        if vertex is None:
+            vertex = await self.create(_data, _keys, **kwds)
+        return vertex
+
+    async def get_all(self):
+        """
+        Returns all the vertices in the graph.
+
+        :rtype: Vertex generator
+
+        """
+        resp = await self.client.get_all_vertices()
+        return initialize_elements(self.client, resp)
+
+    async def update(self, _id, _data=None, _keys=None, **kwds):
+        """
+        Updates an element in the graph DB.
+
+        :param _id: The vertex ID.
+        :type _id: int or str
+
+        :param _data: Optional property data dict.
+        :type _data: dict
+
+        :param kwds: Optional property data keyword pairs.
+        :type kwds: dict
+
+        :rtype: Response
+
+        """
+        data = build_data(_data, kwds)
+        return await self.client.update_vertex(_id, data, keys=_keys)
+
+    async def delete(self, _id):
+        """
+        Deletes a vertex from the graph database and returns the response.
+
+        :param _id: The vertex ID.
+        :type _id: int or str
+
+        :rtype: Response
+
+        """
+        return await self.client.delete_vertex(_id)
+
+
+class AsyncEdgeProxy(object):
+    """
+    A proxy for interacting with edges from an asyncio event loop.
+
+    :param element_class: The element class managed by this proxy instance.
+    :type element_class: AsyncEdge class
+
+    :param client: The async Client object for the database.
+    :type client: Client
+
+    :ivar element_class: Element class
+    :ivar client: Client object.
+    :ivar index: The primary index object or None.
+
+    """
+    def __init__(self, element_class, client):
+        assert issubclass(element_class, Edge)
+
+        self.element_class = element_class
+        self.client = client
+        self.index = None
+
+        # Add element class to Registry so we can initialize query results.
+        self.client.registry.add_class(element_class)
+
+    async def create(self, outV, label, inV, _data=None, _keys=None, **kwds):
+        """
+        Creates an edge in the database and returns it.
+
+        :param outV: The outgoing vertex.
+        :type outV: Vertex or int
+
+        :param label: The edge's label.
+        :type label: str
+
+        :param inV: The incoming vertex.
+        :type inV: Vertex or int
+
+        :param _data: Optional property data dict.
+        :type _data: dict
+
+        :param kwds: Optional property data keyword pairs.
+        :type kwds: dict
+
+        :rtype: Edge
+
+        """
+        assert label is not None
+        data = build_data(_data, kwds)
+        outV, inV = coerce_vertices(outV, inV)
+        resp = await self.client.create_edge(outV, label, inV, data, keys=_keys)
+        return initialize_element(self.client, resp.results)
+
+    async def get(self, _id):
+        """
+        Retrieves an edge from the database and returns it.
+
+        :param _id: The edge ID.
+        :type _id: int or str
+
+        :rtype: Edge or None
+
+        """
+        try:
+            resp = await self.client.get_edge(_id)
+            return initialize_element(self.client, resp.results)
+        except LookupError:
+            return None
+
+    async def get_all(self):
+        """
+        Returns all the edges in the graph.
+
+        :rtype: Edge generator
+
+        """
+        resp = await self.client.get_all_edges()
+        return initialize_elements(self.client, resp)
+
+    async def update(self, _id, _data=None, _keys=None, **kwds):
+        """
+        Updates an edge in the database.
+
+        :param _id: The edge ID.
+        :type _id: int or str
+
+        :param _data: Optional property data dict.
+        :type _data: dict
+
+        :param kwds: Optional property data keyword pairs.
+        :type kwds: dict
+
+        :rtype: Response
+
+        """
+        data = build_data(_data, kwds)
+        return await self.client.update_edge(_id, data, keys=_keys)
+
+    async def delete(self, _id):
+        """
+        Deletes an edge from the graph database and returns the response.
+
+        :param _id: The edge ID.
+        :type _id: int or str
+
+        :rtype: Response
+
+        """
+        return await self.client.delete_edge(_id)
+
+
+#
+# Indices
+#
+
+class AsyncIndexMixin(object):
+    """
+    Makes an Index's lookup methods coroutines.
+
+    Mix it into a backend Index class. The Index methods that just return the
+    client's Response, such as put and remove, already return coroutines
+    when used with an async client.
+
+    """
+    async def lookup(self, key=None, value=None, **pair):
+        """
+        Return all the elements in the index where key equals value.
+
+        :param key: The index key.
+        :type key: str
+
+        :param value: The key's value.
+        :type value: str or int
+
+        :param pair: Optional key/value pair. Example: name="James"
+        :type pair: key/value pair
+
+        :rtype: Element generator
+
+        """
+        key, value = self._get_key_value(key, value, pair)
+        lookup = getattr(self.client, "lookup_%s" % self.index_class)
+        resp = await lookup(self.index_name, key, value)
+        return initialize_elements(self.client, resp)
+
+    async def get_unique(self, key=None, value=None, **pair):
+        """
+        Returns a max of 1 elements in the index matching the key/value pair.
+
+        :param key: The index key.
+        :type key: str
+
+        :param value: The key's value.
+        :type value: str or int
+
+        :param pair: Optional key/value pair. Example: name="James"
+        :type pair: key/value pair
+
+        :rtype: Element or None
+
+        """
+        key, value = self._get_key_value(key, value, pair)
+        lookup = getattr(self.client, "lookup_%s" % self.index_class)
+        resp = await lookup(self.index_name, key, value)
+        if resp.total_size > 0:
+            result = get_one_result(resp)
+            return initialize_element(self.client, result)
+
+
+#
+# Gremlin
+#
+
+class AsyncGremlin(object):
+    """
+    An interface for executing Gremlin scripts from an asyncio event loop.
+
+    :param client: The async Client object for the database.
+    :type client: Client
+
+    """
+    def __init__(self, client):
+        self.client = client
+
+    async def command(self, script, params=None):
+        """
+        Returns the raw Result object from an arbitrary Gremlin command.
+
+        :param script: Gremlin script to execute on the client.
+        :type script: str
+
+        :param params: Optional paramaters to bind to the Gremlin script.
+        :type params: dict or None
+
+        :rtype: Result
+
+        """
+        resp = await self.client.gremlin(script, params)
+        if resp.total_size > 0:
+            result = get_one_result(resp)
+            return result.raw
+
+    async def query(self, script, params=None):
+        """
+        Returns initialized Element objects from an arbitrary Gremlin query.
+
+        :param script: Gremlin script to execute on the client.
+        :type script: str
+
+        :param params: Optional paramaters to bind to the Gremlin script.
+        :type params: dict or None
+
+        :rtype: Generator of objects: Vertex or Edge
+
+        """
+        resp = await self.client.gremlin(script, params)
+        return initialize_elements(self.client, resp)
+
+    async def execute(self, script, params=None):
+        """
+        Returns the raw Response object from an arbitrary Gremlin script.
+
+        :param script: Gremlin script to execute on the client.
+        :type script: str
+
+        :param params: Optional paramaters to bind to the Gremlin script.
+        :type params: dict or None
+
+        :rtype: Response
+
+        """
+        return await self.client.gremlin(script, params)
+
+
+#
+# Graph
+#
+
+class AsyncGraph(object):
+    """
+    Abstract base class for the server-specific async Graph implementations.
+
+    Looking up the primary indices requires server round trips, which can't
+    be done in __init__, so call open() before using the proxies, or use
+    the Graph as an async context manager.
+
+    :param config: Optional Config object. Defaults to the default config.
+    :type config: Config
+
+    :cvar client_class: Async Client class.
+    :cvar default_index: Default async Index class.
+
+    :ivar client: Async Client object.
+    :ivar config: Config object.
+    :ivar vertices: AsyncVertexProxy object.
+    :ivar edges: AsyncEdgeProxy object.
+    :ivar gremlin: AsyncGremlin object.
+
+    Example:
+
+    >>> from bulbs.neo4jserver.aio import AsyncGraph
+    >>> async with AsyncGraph() as g:
+    ...     james, julie = await asyncio.gather(
+    ...         g.vertices.create(name="James"),
+    ...         g.vertices.create(name="Julie"))
+    ...     await g.edges.create(james, "knows", julie)
+
+    """
+    client_class = None
+    default_index = None
+
+    def __init__(self, config=None):
+        self.client = self.client_class(config)
+        self.config = self.client.config
+
+        # (element proxy, index proxy, index name) waiting on open()
+        self._unopened = []
+
+        self.vertices = self.build_proxy(AsyncVertex)
+        self.edges = self.build_proxy(AsyncEdge)
+
+        self.gremlin = AsyncGremlin(self.client)
+        self.scripts = self.client.scripts    # for convienience
+
+    async def open(self):
+        """
+        Gets or creates the primary indices for the proxies and returns self.
+
+        :rtype: AsyncGraph
+
+        """
+        unopened, self._unopened = self._unopened, []
+        tasks = [index_proxy.get_or_create(index_name)
+                 for proxy, index_proxy, index_name in unopened]
+        indices = await asyncio.gather(*tasks)
+        for (proxy, index_proxy, index_name), index in zip(unopened, indices):
+            proxy.index = index
+        return self
+
+    async def close(self):
+        """
+        Closes the connections to the server.
+
+        :rtype: None
+
+        """
+        await self.client.request.close()
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def add_proxy(self, proxy_name, element_class, index_class=None):
+        """
+        Adds an element proxy to the Graph object for the element class.
+
+        :param proxy_name: Attribute name to use for the proxy.
+        :type proxy_name: str
+
+        :param element_class: Element class managed by this proxy.
+        :type element_class: Element
+
+        :param index_class: Index class for Element's primary index.
+            Defaults to default_index.
+        :type index_class: Index
+
+        :rtype: None
+
+        .. note:: Call open() after adding proxies to set up their indices.
+
+        """
+        proxy = self.build_proxy(element_class, index_class)
+        self.client.registry.add_proxy(proxy_name, proxy)
+        setattr(self, proxy_name, proxy)
+
+    def build_proxy(self, element_class, index_class=None):
+        """
+        Returns an element proxy whose index will be set up by open().
+
+        :param element_class: Element class managed by this proxy.
+        :type element_class: Element
+
+        :param index_class: Optional Index class for Element's primary index.
+            Defaults to default_index.
+        :type index_class: Index
+
+        :rtype: Element proxy
+
+        """
+        if not index_class:
+            index_class = self.default_index
+        proxy_class = element_class.get_proxy_class()
+        proxy = proxy_class(element_class, self.client)
+        base_type = element_class.get_base_type()
+        index_proxy_class = index_class.get_proxy_class(base_type)
+        index_proxy = index_proxy_class(index_class, self.client)
+        index_name = element_class.get_index_name(self.config)
+        self._unopened.append((proxy, index_proxy, index_name))
+        return proxy
@@ -7,4 +7,4 @@ from bulbs.config import Config, DEBUG, INFO, WARNING, ERROR, CRITICAL
 from .graph import Graph
 from .client import Client, Response, Result
 from .index import VertexIndexProxy, EdgeIndexProxy, Index
-from .typesystem import TypeSystem, Converter
+from .typesystem import TypeSystem, Converter, get_type_system
@@ -14,6 +14,7 @@ import inspect
 from bulbs.config import Config, DEBUG
 from bulbs.registry import Registry
 from bulbs.utils import get_logger
+from bulbs.cache import ElementCache
 
 from .typesystem import TypeSystem
 
@@ -52,7 +53,12 @@ class Result(object):
     :ivar raw: The raw result.
     :ivar data: The data in the result.
 
+    .. note:: A Result is created for each result in a response so Result 
+              classes use __slots__, and fields parsed out of the raw result
+              are parsed on first access and memoized.
+
     """
+    __slots__ = ['config', 'raw', '_data']
 
     def __init__(self, result, config):
         self.config = config
@@ -60,8 +66,18 @@ class Result(object):
         # The raw result.
         self.raw = result
         
-        # The data in the result.
-        self.data = None
+        # The data in the result, set on first access.
+        self._data = None
+
+    @property
+    def data(self):
+        """The data in the result."""
+        if self._data is None:
+            self._data = self._get_data(self.raw)
+        return self._data
+
+    def _get_data(self, result):
+        return None
 
     def get_id(self):
         """
@@ -156,6 +172,14 @@ class Result(object):
         """
         return self.raw[attribute]
 
+    # Objects with __slots__ need these to be pickled with protocols 0 and 1.
+    # The memoized fields aren't pickled; they're parsed again when accessed.
+    def __getstate__(self):
+        return dict(config=self.config, raw=self.raw)
+
+    def __setstate__(self, state):
+        self.__init__(state['raw'], state['config'])
+
 
 class Response(object):
     """
@@ -281,6 +305,7 @@ class Client(object):
     :ivar registry: Registry object.
     :ivar type_system: TypeSystem object.
     :ivar request: Request object.
+    :ivar cache: ElementCache object or None.
 
     Example:
 
@@ -302,6 +327,22 @@ class Client(object):
         self.type_system = TypeSystem()
         self.request = self.request_class(self.config, self.type_system.content_type)
 
+    @property
+    def cache(self):
+        """
+        Returns the read-through element cache if Config.cache is set.
+
+        :rtype: bulbs.cache.ElementCache or None
+
+        """
+        backend = getattr(self.config, "cache", None)
+        if backend is None:
+            return None
+        cache = self.__dict__.get('_cache')
+        if cache is None or cache.backend is not backend:
+            cache = self._cache = ElementCache(self, backend)
+        return cache
+
     # Vertex Proxy
 
     def create_vertex(self, data):
@@ -337,6 +378,19 @@ class Client(object):
         """
         raise NotImplementedError 
 
+    def multi_get_vertices(self, id_list):
+        """
+        Gets the vertices with the IDs and returns the Response. 
+        The vertices that don't exist aren't returned.
+
+        :param id_list: Vertex IDs.
+        :type id_list: list
+
+        :rtype: Response
+
+        """
+        raise NotImplementedError 
+
     def update_vertex(self, _id, data):
         """
         Updates the vertex with the _id and returns the Response.
@@ -408,6 +462,19 @@ class Client(object):
         """
         raise NotImplementedError 
 
+    def multi_get_edges(self, id_list):
+        """
+        Gets the edges with the IDs and returns the Response. 
+        The edges that don't exist aren't returned.
+
+        :param id_list: Edge IDs.
+        :type id_list: list
+
+        :rtype: Response
+
+        """
+        raise NotImplementedError 
+
     def update_edge(self, _id, data):
         """
         Updates the edge with the _id and returns the Response.
@@ -744,6 +811,25 @@ class Client(object):
         """
         raise NotImplementedError 
 
+    def create_indexed_vertices(self, data_list, index_name, keys=None):
+        """
+        Creates the vertices in one transaction, indexes them, and returns the 
+        Response, which has the vertices in the order of the data.
+
+        :param data_list: Property data dicts.
+        :type data_list: list
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: Response
+
+        """
+        raise NotImplementedError 
+
     def update_indexed_vertex(self, _id, data, index_name, keys=None):
         """
         Updates an indexed vertex and returns the Response.
@@ -765,6 +851,28 @@ class Client(object):
         """
         raise NotImplementedError 
 
+    def patch_indexed_vertex(self, _id, data, index_name, keys=None):
+        """
+        Updates the changed properties of an indexed vertex, reindexes only 
+        those keys, and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param data: Changed property data. Properties set to None are removed.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: Response
+
+        """
+        raise NotImplementedError 
+
     # Model Proxy - Edge
 
     def create_indexed_edge(self, data, index_name, keys=None):
@@ -794,6 +902,28 @@ class Client(object):
         """
         raise NotImplementedError 
 
+    def create_indexed_edges(self, label, edges, index_name, keys=None):
+        """
+        Creates the edges in one transaction, indexes them, and returns the 
+        Response, which has the edges in the order they were passed in.
+
+        :param label: Edge label.
+        :type label: str
+
+        :param edges: List of (outV, inV, data) tuples.
+        :type edges: list
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: Response
+
+        """
+        raise NotImplementedError 
+
     def update_indexed_edge(self, _id, data, index_name, keys=None):
         """
         Updates an indexed edge and returns the Response.
@@ -814,5 +944,27 @@ class Client(object):
 
         """
         raise NotImplementedError 
+
+    def patch_indexed_edge(self, _id, data, index_name, keys=None):
+        """
+        Updates the changed properties of an indexed edge, reindexes only 
+        those keys, and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :param data: Changed property data. Properties set to None are removed.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: Response
+
+        """
+        raise NotImplementedError 
     
         
@@ -8,6 +8,7 @@ from bulbs.factory import Factory
 from bulbs.element import Vertex, Edge
 from bulbs.model import Relationship
 from bulbs.utils import initialize_elements
+from bulbs.session import Session
 
 from bulbs.base.client import Client
 from bulbs.base.index import Index
@@ -84,6 +85,23 @@ class Graph(object):
             edges = initialize_elements(self.client, resp)
             return list(edges)
         
+    def session(self):
+        """
+        Returns a session that loads each element once while it's open.
+
+        Use it as a context manager, or call open() and close().
+
+        :rtype: bulbs.session.Session
+
+        Example:
+
+        >>> with g.session():
+        ...     james = g.vertices.get(1)
+        ...     assert g.vertices.get(1) is james
+
+        """
+        return Session(self.client)
+
     def add_proxy(self, proxy_name, element_class, index_class=None):
         """
         Adds an element proxy to the Graph object for the element class.
@@ -123,6 +141,26 @@ class Graph(object):
             index_class = self.default_index
         return self.factory.build_element_proxy(element_class, index_class)
 
+    def ensure_indices(self):
+        """
+        Gets or creates the primary index of every proxy in one request.
+
+        Otherwise each proxy gets or creates its index the first time it's
+        used. Indices are cached for the process, so other Graph objects for
+        the same database won't request them again.
+
+        :rtype: None
+
+        Example:
+
+        >>> g = Graph()
+        >>> g.add_proxy("people", Person)
+        >>> g.add_proxy("knows", Knows)
+        >>> g.ensure_indices()
+
+        """
+        self.factory.ensure_indices()
+
     def load_graphml(self, uri):
         """
         Loads a GraphML file into the database and returns the response.
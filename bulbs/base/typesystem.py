@@ -7,6 +7,8 @@
 Bulbs supports plugabble type systems.
 
 """
+from importlib import import_module
+
 
 class TypeSystem(object):
     """
@@ -25,6 +27,32 @@ class TypeSystem(object):
 class Converter(object):
     """Abstract base class of conversion methods called by DataType classes."""
 
+    def convert_column(self, name, values):
+        """
+        Converts a column of values, e.g. one Property's values across a 
+        result set, with the conversion method named name.
+
+        Converters can define a vectorized version of a method named with a 
+        "_column" suffix, e.g. to_datetime_column; otherwise the method is 
+        called for each value.
+
+        :param name: Conversion method name, e.g. "to_datetime".
+        :type name: str
+
+        :param values: Property values.
+        :type values: list
+
+        :rtype: list
+
+        :raises: ValueError
+
+        """
+        convert = getattr(self, name + "_column", None)
+        if convert is not None:
+            return convert(values)
+        convert = getattr(self, name)
+        return [convert(value) for value in values]
+
     def to_string(self, value):
         raise NotImplementedError
 
@@ -51,3 +79,29 @@ class Converter(object):
 
     def to_document(self, value):
         raise NotImplementedError
+
+
+# Type systems selected by name with Config.type_system. They're imported 
+# when they're selected since they may require optional modules.
+type_systems = {"json": ("bulbs.json", "JSONTypeSystem"),
+                "msgpack": ("bulbs.messagepack", "MessagePackTypeSystem")}
+
+
+def get_type_system(name="json"):
+    """
+    Returns a type system object by name.
+
+    :param name: Type system name, e.g. "json" or "msgpack". Defaults to "json".
+    :type name: str
+
+    :rtype: TypeSystem
+
+    :raises: ValueError if the type system doesn't exist, ImportError if 
+             it requires a module that isn't installed.
+
+    """
+    if name not in type_systems:
+        raise ValueError("Unknown type system: %s" % name)
+    module_name, class_name = type_systems[name]
+    type_system_class = getattr(import_module(module_name), class_name)
+    return type_system_class()
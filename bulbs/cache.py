@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Read-through cache for element gets and index lookups.
+
+The cache stores the raw results returned by the server, and the element 
+IDs returned by index lookups, so any store that can hold dicts and lists 
+can be used as a backend. Caching is enabled by setting Config.cache to a 
+backend, e.g. LocalCache(), which is shared by every client built with the 
+config.
+
+"""
+import time
+import threading
+from decimal import Decimal
+from collections import OrderedDict
+
+import six  # Python 3
+
+from .utils import initialize_element
+
+
+# Value cached for elements that don't exist
+NOT_FOUND = "__bulbs_not_found__"
+
+
+class CacheBackend(object):
+    """
+    Abstract base class for cache stores, e.g. memcached or redis.
+
+    Values are dicts, lists, strings, and ints.
+
+    """
+    def get(self, key):
+        """
+        Returns the value for the key, or None if it's not cached.
+
+        :param key: Cache key.
+        :type key: str
+
+        :rtype: object or None
+
+        """
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        """
+        Caches the value for ttl seconds.
+
+        :param key: Cache key.
+        :type key: str
+
+        :param value: Value to cache.
+        :type value: object
+
+        :param ttl: Optional time to live in seconds. Defaults to None, which
+            uses the backend's default.
+        :type ttl: int
+
+        :rtype: None
+
+        """
+        raise NotImplementedError
+
+    def delete(self, key):
+        """
+        Removes the key from the cache.
+
+        :param key: Cache key.
+        :type key: str
+
+        :rtype: None
+
+        """
+        raise NotImplementedError
+
+    def incr(self, key):
+        """
+        Atomically increments the int value of the key and returns it.
+
+        :param key: Cache key.
+        :type key: str
+
+        :rtype: int
+
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        """
+        Removes all the keys from the cache.
+
+        :rtype: None
+
+        """
+        raise NotImplementedError
+
+
+class LocalCache(CacheBackend):
+    """
+    In-process cache with LRU eviction and per-key expiration.
+
+    :param max_size: Max number of keys. Defaults to 10000.
+    :type max_size: int
+
+    :param ttl: Default time to live in seconds. Defaults to None (no expiry).
+    :type ttl: int
+
+    :param packed: If True, values are stored packed as MessagePack, which 
+        uses less memory than dicts but unpacks each value that's read. 
+        Requires msgpack. Defaults to False.
+    :type packed: bool
+
+    """
+    def __init__(self, max_size=10000, ttl=None, packed=False):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.packed = packed
+        self._codec = None
+        if packed:
+            from .messagepack import MessagePackCodec
+            self._codec = MessagePackCodec()
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.pop(key, None)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.time():
+                return None
+            # re-insert the key to mark it as the most recently used
+            self._data[key] = item
+        if self._codec is not None:
+            value = self._codec.loads(value)
+        return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        if self._codec is not None:
+            value = self._codec.dumps(value)
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (value, expires_at)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            value, expires_at = self._data.pop(key, (None, None))
+            if self._codec is not None and value is not None:
+                value = self._codec.loads(value)
+            value = (value or 0) + 1
+            stored = self._codec.dumps(value) if self._codec is not None else value
+            self._data[key] = (stored, expires_at)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    # the lock can't be pickled, and the cached values stay in this process
+    def __getstate__(self):
+        return dict(max_size=self.max_size, ttl=self.ttl, packed=self.packed)
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+class ElementCache(object):
+    """
+    Read-through cache of a client's element gets and index lookups.
+
+    Index lookups are cached as the IDs of the elements they return, and 
+    the elements are got from the element cache, or with a multi-get.
+
+    Writes made through Bulbs expire the element's key and the lookups of
+    the key/value pairs they index. Writes that reindex an element by 
+    values that aren't known expire all the lookups of the index, which
+    are versioned by a per-index generation number stored in the backend,
+    so clients in other processes see the invalidation too.
+
+    :param client: Client object.
+    :type client: bulbs.base.client.Client
+
+    :param backend: Cache store.
+    :type backend: CacheBackend
+
+    """
+    def __init__(self, client, backend):
+        config = client.config
+        self.client = client
+        self.backend = backend
+        self.result_class = client.request.response_class.result_class
+        self.ttl = getattr(config, "cache_ttl", 60)
+        self.negative_ttl = getattr(config, "cache_negative_ttl", 5)
+        # keys are namespaced by graph so graphs can share a backend
+        self.prefix = "bulbs:%s:" % config.root_uri.rstrip("/")
+
+    def get_element(self, base_type, _id, load):
+        """
+        Returns the element from the cache, or loads and caches it.
+
+        :param base_type: Base type, either "vertex" or "edge".
+        :type base_type: str
+
+        :param _id: Element ID.
+        :type _id: int or str
+
+        :param load: Client method that gets the element by ID.
+        :type load: function
+
+        :rtype: Element or None
+
+        """
+        key = self._element_key(base_type, _id)
+        raw = self.backend.get(key)
+        if raw == NOT_FOUND:
+            return None
+        if raw is None:
+            try:
+                resp = load(_id)
+            except LookupError:
+                self.backend.set(key, NOT_FOUND, self.negative_ttl)
+                return None
+            raw = resp.results.raw
+            self.backend.set(key, raw, self.ttl)
+        return self._initialize_element(raw)
+
+    def get_elements(self, base_type, ids, load):
+        """
+        Returns the elements from the cache, and loads and caches the others.
+
+        :param base_type: Base type, either "vertex" or "edge".
+        :type base_type: str
+
+        :param ids: Element IDs.
+        :type ids: list
+
+        :param load: Function that gets the elements by IDs and returns a dict 
+            of Result objects keyed by the string ID.
+        :type load: function
+
+        :rtype: dict of elements keyed by the string ID
+
+        """
+        elements = {}
+        missing = []
+        for _id in ids:
+            raw = self.backend.get(self._element_key(base_type, _id))
+            if raw is None:
+                missing.append(_id)
+            elif raw != NOT_FOUND:
+                elements[str(_id)] = self._initialize_element(raw)
+        if missing:
+            results = load(missing)
+            for _id in missing:
+                key = self._element_key(base_type, _id)
+                result = results.get(str(_id))
+                if result is None:
+                    self.backend.set(key, NOT_FOUND, self.negative_ttl)
+                else:
+                    self.backend.set(key, result.raw, self.ttl)
+                    elements[str(_id)] = initialize_element(self.client, result)
+        return elements
+
+    def set_elements(self, base_type, results):
+        """
+        Caches the elements loaded by another request, e.g. a lookup.
+
+        :param base_type: Base type, either "vertex" or "edge".
+        :type base_type: str
+
+        :param results: Result objects.
+        :type results: list
+
+        :rtype: None
+
+        """
+        for result in results:
+            key = self._element_key(base_type, result.get_id())
+            self.backend.set(key, result.raw, self.ttl)
+
+    def lookup_key(self, index_class, index_name, key, value):
+        """
+        Returns the cache key of the index lookup in the current generation.
+
+        Get the key before loading the lookup so a write made while it loads
+        expires the IDs that are cached under it.
+
+        :param index_class: Index class, either "vertex" or "edge".
+        :type index_class: str
+
+        :param index_name: Index name.
+        :type index_name: str
+
+        :param key: The index key.
+        :type key: str
+
+        :param value: The key's value.
+        :type value: str or int
+
+        :rtype: str
+
+        """
+        generation = self.backend.get(self._generation_key(index_class, index_name)) or 0
+        return "%slookup:%s:%s:%s:%s=%s" % (self.prefix, generation, index_class, 
+                                            index_name, key, index_string(value))
+
+    def get_lookup(self, cache_key):
+        """
+        Returns the element IDs cached for the lookup, or None.
+
+        :param cache_key: Cache key returned by lookup_key().
+        :type cache_key: str
+
+        :rtype: list or None
+
+        """
+        return self.backend.get(cache_key)
+
+    def set_lookup(self, cache_key, ids):
+        """
+        Caches the element IDs returned by the lookup.
+
+        :param cache_key: Cache key returned by lookup_key().
+        :type cache_key: str
+
+        :param ids: Element IDs.
+        :type ids: list
+
+        :rtype: None
+
+        """
+        self.backend.set(cache_key, list(ids), self.ttl)
+
+    def expire(self, base_type, _id):
+        """
+        Expires the element.
+
+        Cached lookups that return the element still have its ID, and get 
+        the element again, or leave it out if it was deleted.
+
+        :param base_type: Base type, either "vertex" or "edge".
+        :type base_type: str
+
+        :param _id: Element ID.
+        :type _id: int or str
+
+        :rtype: None
+
+        """
+        self.backend.delete(self._element_key(base_type, _id))
+
+    def expire_lookup(self, index_class, index_name, key, value):
+        """
+        Expires the index lookup for the key and value.
+
+        :param index_class: Index class, either "vertex" or "edge".
+        :type index_class: str
+
+        :param index_name: Index name.
+        :type index_name: str
+
+        :param key: The index key.
+        :type key: str
+
+        :param value: The key's value.
+        :type value: str or int
+
+        :rtype: None
+
+        """
+        self.backend.delete(self.lookup_key(index_class, index_name, key, value))
+
+    def expire_index(self, index_class, index_name):
+        """
+        Expires all the lookups of the index by starting a new generation.
+
+        :param index_class: Index class, either "vertex" or "edge".
+        :type index_class: str
+
+        :param index_name: Index name.
+        :type index_name: str
+
+        :rtype: None
+
+        """
+        self.backend.incr(self._generation_key(index_class, index_name))
+
+    def _element_key(self, base_type, _id):
+        return "%s%s:%s" % (self.prefix, base_type, _id)
+
+    def _generation_key(self, index_class, index_name):
+        return "%sgeneration:%s:%s" % (self.prefix, index_class, index_name)
+
+    def _initialize_element(self, raw):
+        result = self.result_class(raw, self.client.config)
+        return initialize_element(self.client, result)
+
+
+def index_string(value):
+    """
+    Returns the value as the string it's indexed by on the server, which is
+    Java's String.valueOf(), so lookups the server treats as equal, e.g. 
+    True and "true", share a cache entry.
+
+    :param value: Index value.
+    :type value: str, int, float, or bool
+
+    :rtype: unicode
+
+    """
+    if isinstance(value, bool):
+        return u"true" if value else u"false"
+    if value is None:
+        return u"null"
+    if isinstance(value, float):
+        return _java_double_string(value)
+    if isinstance(value, six.binary_type):
+        return value.decode("utf-8")
+    return six.text_type(value)
+
+def _java_double_string(value):
+    # Formats a float like Java's Double.toString(), e.g. 1e20 => "1.0E20".
+    if value != value:
+        return u"NaN"
+    if value in (float("inf"), float("-inf")):
+        return u"Infinity" if value > 0 else u"-Infinity"
+    if value == 0 or 1e-3 <= abs(value) < 1e7:
+        return six.text_type(repr(value))
+    sign, digits, exponent = Decimal(repr(value)).as_tuple()
+    exponent = exponent + len(digits) - 1
+    digits = "".join(str(digit) for digit in digits).rstrip("0") or "0"
+    mantissa = "%s.%s" % (digits[0], digits[1:] or "0")
+    return u"%s%sE%d" % ("-" if sign else "", mantissa, exponent)
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Pluggable JSON codecs used to encode requests and decode responses.
+
+The codec is selected by name with Config.json_codec. The default, "auto",
+uses the fastest codec that's installed: orjson, ujson, simplejson, then
+the standard library's json.
+
+"""
+import sys
+from collections import OrderedDict
+
+from .utils import get_logger
+
+
+log = get_logger(__name__)
+
+
+class Codec(object):
+    """
+    Abstract base class for a JSON codec.
+
+    :cvar name: Name used to select the codec in Config.json_codec.
+    :cvar module_name: Name of the module the codec requires.
+
+    """
+    name = None
+    module_name = None
+
+    def __init__(self):
+        self.module = __import__(self.module_name)
+
+    def dumps(self, value):
+        """
+        Encodes a Python value as a JSON document.
+
+        :param value: Python value.
+        :type value: dict, list, or primitive
+
+        :rtype: str or bytes
+
+        """
+        return self.module.dumps(value)
+
+    def loads(self, content):
+        """
+        Decodes a UTF-8 encoded JSON document.
+
+        :param content: JSON document.
+        :type content: bytes
+
+        :rtype: dict, list, or primitive
+
+        """
+        return self.module.loads(content)
+
+
+class OrjsonCodec(Codec):
+
+    name = "orjson"
+    module_name = "orjson"
+
+    def __init__(self):
+        super(OrjsonCodec, self).__init__()
+        # params dicts may have non-string keys, e.g. element IDs
+        self.options = self.module.OPT_NON_STR_KEYS
+
+    def dumps(self, value):
+        return self.module.dumps(value, option=self.options)
+
+
+class UjsonCodec(Codec):
+
+    name = "ujson"
+    module_name = "ujson"
+
+
+class SimplejsonCodec(Codec):
+
+    name = "simplejson"
+    module_name = "simplejson"
+
+
+class JsonCodec(Codec):
+
+    name = "json"
+    module_name = "json"
+
+    def loads(self, content):
+        # json.loads() only accepts bytes in Python 3.6+
+        if isinstance(content, bytes) and (3, 0) <= sys.version_info < (3, 6):
+            content = content.decode('utf-8')
+        return self.module.loads(content)
+
+
+class OmnijsonCodec(Codec):
+
+    name = "omnijson"
+    module_name = "omnijson"
+
+    def loads(self, content):
+        if isinstance(content, bytes):
+            content = content.decode('utf-8')
+        return self.module.loads(content)
+
+
+# The codecs "auto" tries, in order of preference
+codec_classes = OrderedDict()
+for codec_class in (OrjsonCodec, UjsonCodec, SimplejsonCodec, JsonCodec, OmnijsonCodec):
+    codec_classes[codec_class.name] = codec_class
+
+_codecs = dict()
+
+
+def register_codec(codec_class):
+    """
+    Registers a codec class so it can be selected by its name.
+
+    :param codec_class: Codec class.
+    :type codec_class: class
+
+    :rtype: None
+
+    """
+    codec_classes[codec_class.name] = codec_class
+    _codecs.pop(codec_class.name, None)
+
+
+def get_codec(name="auto"):
+    """
+    Returns the codec with the name; "auto" returns the fastest installed codec.
+
+    :param name: Codec name. Defaults to "auto".
+    :type name: str
+
+    :rtype: Codec
+
+    :raises: ValueError if the codec doesn't exist, ImportError if it isn't
+             installed.
+
+    """
+    codec = _codecs.get(name)
+    if codec is not None:
+        return codec
+    if name == "auto":
+        codec = _get_auto_codec()
+    elif name in codec_classes:
+        codec = codec_classes[name]()
+    else:
+        raise ValueError("Unknown JSON codec: %s" % name)
+    _codecs[name] = codec
+    return codec
+
+
+# Codecs for binary content types, e.g. MessagePack, keyed by content type.
+# JSON content is encoded with the codec selected by Config.json_codec.
+content_codecs = dict()
+
+
+def register_content_codec(content_type, codec):
+    """
+    Registers the codec that encodes and decodes a binary content type.
+
+    :param content_type: Content type, e.g. "application/x-msgpack".
+    :type content_type: str
+
+    :param codec: Codec object.
+    :type codec: Codec
+
+    :rtype: None
+
+    """
+    content_codecs[content_type] = codec
+
+
+def get_content_codec(config, content_type=None):
+    """
+    Returns the codec for the content type, or the JSON codec selected by 
+    Config.json_codec if the content type isn't a registered binary type.
+
+    :param config: Config object.
+    :type config: bulbs.config.Config
+
+    :param content_type: Optional content type, e.g. a Content-Type header.
+    :type content_type: str
+
+    :rtype: Codec
+
+    """
+    if content_type:
+        media_type = content_type.split(";")[0].strip().lower()
+        codec = content_codecs.get(media_type)
+        if codec is not None:
+            return codec
+    return get_codec(getattr(config, "json_codec", "auto"))
+
+
+def _get_auto_codec():
+    for name, codec_class in codec_classes.items():
+        try:
+            codec = codec_class()
+        except ImportError:
+            continue
+        log.debug("Using the %s JSON codec.", name)
+        return codec
+    raise ImportError("No JSON codec is installed")
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Compression of request bodies and decompression of response bodies.
+
+Request bodies are only compressed if Config.compression is set because the
+server has to be configured to accept compressed requests.
+
+"""
+import zlib
+
+import six
+
+
+GZIP = "gzip"
+DEFLATE = "deflate"
+
+# Accept-Encoding header sent with requests whose responses Bulbs decompresses
+ACCEPT_ENCODING = "gzip, deflate"
+
+# zlib window sizes for each encoding
+_wbits = {GZIP: 16 + zlib.MAX_WBITS, DEFLATE: zlib.MAX_WBITS}
+
+
+def compress(body, encoding):
+    """
+    Returns the body compressed with the encoding.
+
+    :param body: Request body.
+    :type body: str or bytes
+
+    :param encoding: Content encoding, either "gzip" or "deflate".
+    :type encoding: str
+
+    :rtype: bytes
+
+    :raises: ValueError if the encoding isn't supported.
+
+    """
+    if encoding not in _wbits:
+        raise ValueError("Unsupported content encoding: %s" % encoding)
+    if isinstance(body, six.text_type):
+        body = body.encode('utf-8')
+    compressor = zlib.compressobj(6, zlib.DEFLATED, _wbits[encoding])
+    return compressor.compress(body) + compressor.flush()
+
+
+def get_decompressor(encoding):
+    """
+    Returns a zlib decompress object for the response's content encoding.
+
+    :param encoding: Value of the Content-Encoding header or None.
+    :type encoding: str
+
+    :rtype: zlib decompress object or None if the content isn't compressed
+
+    """
+    if encoding:
+        encoding = encoding.strip().lower()
+    if encoding == GZIP:
+        return zlib.decompressobj(_wbits[GZIP])
+    if encoding == DEFLATE:
+        # some servers send gzip data as deflate; 32 + MAX_WBITS detects either
+        return zlib.decompressobj(32 + zlib.MAX_WBITS)
+    return None
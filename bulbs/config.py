@@ -5,6 +5,7 @@
 #
 import os
 from .utils import bulbs_logger, get_logger, urlparse
+from .router import MASTER, REPLICA
 from logging import StreamHandler, DEBUG, INFO, WARNING, ERROR, CRITICAL
 
 log = get_logger(__name__)
@@ -31,12 +32,65 @@ class Config(object):
     :ivar id_var: Name of the element ID variable. Defaults to "eid".
     :ivar type_var: Name of the type variable. Defaults to "element_type".
     :ivar label_var: Name of the label variable. Defaults to "label".
-    :ivar type_system: Name of the type system. Defaults to "json".
+    :ivar type_system: Name of the type system: "json", or "msgpack" for 
+        Rexster and Titan servers that accept MessagePack (requires msgpack). 
+        Defaults to "json".
     :ivar vertex_index: Name of the vertex index. Defaults to "vertex". 
     :ivar edge_index: Name of the edge index. Defaults to "edge". 
     :ivar autoindex: Enable auto indexing. Defaults to True.
     :ivar server_scripts: Scripts are defined server side. Defaults to False.
+    :ivar register_scripts: Register each Gremlin script with the server the 
+        first time it's used, and then call it by name with only the params.
+        Defaults to False.
+    :ivar script_cache_dir: Directory where the parsed Gremlin script files 
+        are cached so new processes don't parse them again. Defaults to "auto",
+        which uses the user's cache directory; None disables it.
     :ivar timeout: Optional timeout in seconds. Defaults to None
+    :ivar pool_size: Max size of the HTTP connection pool. Defaults to None,
+        which disables pooling and uses a single connection per client.
+    :ivar pool_max_per_host: Max pooled connections per host. Defaults to None
+        (limited by pool_size).
+    :ivar json_codec: Name of the JSON codec, see bulbs.codec. Defaults to
+        "auto", which uses the fastest installed codec.
+    :ivar batch_size: Max number of operations sent per batch request. 
+        Defaults to 1000.
+    :ivar multi_get_size: Max number of IDs sent per multi-get request, 
+        which keeps the request URL short. Defaults to 100.
+    :ivar hydrate_size: Max number of results whose elements are initialized
+        together, which lets Models convert their Property data a column at 
+        a time. Defaults to 1000.
+    :ivar retries: Max number of times a failed request is retried, see 
+        bulbs.retry. Defaults to 0 (disabled).
+    :ivar retry_backoff: Backoff in seconds before the first retry; it doubles
+        with each retry. Defaults to 0.1.
+    :ivar retry_max_backoff: Max backoff in seconds. Defaults to 10.
+    :ivar retry_max_elapsed: Optional max seconds spent on a request, 
+        including retries. Defaults to None (no limit).
+    :ivar retry_methods: HTTP methods that are retried. Defaults to the
+        idempotent methods: GET, PUT, and DELETE.
+    :ivar retry_statuses: HTTP statuses that are retried. Defaults to 502, 
+        503, and 504. (Neo4j Server returns 500 for script errors.)
+    :ivar breaker_threshold: Number of consecutive failures that opens an 
+        endpoint's circuit breaker. Defaults to None (disabled).
+    :ivar breaker_timeout: Seconds an open circuit fails fast before a trial 
+        request is sent. Defaults to 30.
+    :ivar endpoints: List of (uri, role) tuples added by add_endpoint().
+    :ivar load_balancer: How reads are spread across replicas: "round_robin" 
+        or "least_outstanding". Defaults to "round_robin".
+    :ivar eject_timeout: Seconds a failed replica isn't used. Defaults to 30.
+    :ivar compression: Content encoding used to compress request bodies: 
+        "gzip", "deflate", or None. The server must accept compressed requests.
+        Defaults to None. (Compressed responses are always accepted.)
+    :ivar compression_threshold: Min size in bytes of a request body that's 
+        compressed. Defaults to 1024.
+    :ivar cache: Cache backend used for element gets and index lookups, e.g.
+        bulbs.cache.LocalCache(). Defaults to None (disabled).
+    :ivar cache_ttl: Seconds an element or lookup is cached. Defaults to 60.
+    :ivar cache_negative_ttl: Seconds a missing element is cached. Defaults 
+        to 5.
+    :ivar compact_elements: Load generic vertices and edges as compact 
+        elements, which use __slots__ and share the client at class level to 
+        use less memory. Defaults to False.
 
     Example:
 
@@ -58,11 +112,36 @@ class Config(object):
         self.type_var = "element_type"
         self.label_var = "label"
         self.type_system = "json" 
+        self.json_codec = "auto"
         self.vertex_index = "vertex"
         self.edge_index = "edge"
         self.autoindex = True         # Titan Client sets autoindex to false
         self.server_scripts = False
+        self.register_scripts = False
+        self.script_cache_dir = "auto"
         self.timeout = timeout
+        self.pool_size = None         # set to enable thread-safe pooling
+        self.pool_max_per_host = None
+        self.batch_size = 1000
+        self.multi_get_size = 100
+        self.hydrate_size = 1000
+        self.retries = 0              # set to retry failed idempotent requests
+        self.retry_backoff = 0.1
+        self.retry_max_backoff = 10
+        self.retry_max_elapsed = None
+        self.retry_methods = ["GET", "PUT", "DELETE"]
+        self.retry_statuses = [502, 503, 504]
+        self.breaker_threshold = None # set to enable the circuit breaker
+        self.breaker_timeout = 30
+        self.endpoints = []           # read replicas; root_uri is the master
+        self.load_balancer = "round_robin"
+        self.eject_timeout = 30
+        self.compression = None       # set to "gzip" to compress requests
+        self.compression_threshold = 1024
+        self.cache = None             # set to a bulbs.cache backend to cache reads
+        self.cache_ttl = 60
+        self.cache_negative_ttl = 5
+        self.compact_elements = False # set to save memory when caching elements
         
         # Set the default log level and log handler
         self.set_logger(self.log_level, self.log_handler)
@@ -70,6 +149,30 @@ class Config(object):
         # Sanity checks...
         assert self.root_uri is not None
 
+    def add_endpoint(self, uri, role=REPLICA):
+        """
+        Adds a server endpoint. 
+
+        Reads (GETs and read-only Gremlin scripts) are spread across the 
+        replicas, and everything else is sent to the master.
+
+        :param uri: Root URI of the server.
+        :type uri: str
+
+        :param role: Either "replica" or "master". Defaults to "replica".
+        :type role: str
+
+        :rtype: None
+
+        .. note:: Add the endpoints before creating the Graph.
+
+        """
+        if role not in (MASTER, REPLICA):
+            raise ValueError("Unknown endpoint role: %s" % role)
+        if role == MASTER:
+            self.root_uri = uri
+        self.endpoints.append((uri, role))
+
     # TODO: fix duplicate log issue from setting logger multiple times
     def set_logger(self, log_level, log_handler=None):
         """
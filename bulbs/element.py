@@ -7,15 +7,52 @@
 Vertex and Edge container classes and associated proxy classes.
 
 """
+from abc import ABCMeta
+
+import six  # Python 3
+
 from .utils import u  # Python 3 unicode
-from .utils import initialize_element, initialize_elements, coerce_id, get_logger
+from .utils import initialize_element, initialize_elements, initialize_element_list, \
+    coerce_id, expire_element, expire_lookup, expire_indexed, expire_index, \
+    get_logger, get_chunks, get_results_list
+from .session import get_session
 
 log = get_logger(__name__)
 
 
-class Element(object):
+# Element ID property installed as Config.id_var, e.g. eid
+pretty_id = property(lambda self: self._result.get_id())
+
+
+class PrimaryIndex(object):
+    """
+    Descriptor for an element proxy's primary index.
+
+    The Factory sets a loader instead of the index so the index isn't looked
+    up, or created, until the first time it's used. Setting the index
+    replaces the loader.
+
+    """
+    def __get__(self, proxy, owner=None):
+        if proxy is None:
+            return self
+        if proxy._index_loader is not None:
+            # only drop the loader once it succeeds so a failure can be retried
+            proxy._index = proxy._index_loader()
+            proxy._index_loader = None
+        return proxy._index
+
+    def __set__(self, proxy, index):
+        proxy._index_loader = None
+        proxy._index = index
+
+
+class Element(six.with_metaclass(ABCMeta, object)):  # Python 3
     """An abstract base class for Vertex and Edge containers."""
 
+    # Subclasses have a __dict__ unless they're compact elements.
+    __slots__ = ()
+
     def __init__(self, client):
 
         # NOTE: moved all private prop defs here so they are declared and
@@ -30,12 +67,6 @@ class Element(object):
         # Result object.
         self._result = None
 
-        # Vertex Proxy Object
-        self._vertices = None
-
-        # Edge Proxy Object
-        self._edges = None
-
         # Initialized Flag
         # Initialize all non-database properties here because when _initialized
         # is set to True, __setattr__ will assume all non-defined properties 
@@ -54,18 +85,60 @@ class Element(object):
         """
         self._result = result
 
-        # TODO: Do we really need to make a copy?
-        self._data = result.get_data().copy() 
+        # The data is shared with the result until the element changes it.
+        self._data = result.get_data()
 
         # Sets the element ID to the var defined in Config. Defaults to eid.
         self._set_pretty_id(self._client)
 
-        # These vertex and edge proxies are primarily used for gets; 
-        # all mutable methods that use these are overloaded in Model.
-        self._vertices = VertexProxy(Vertex,self._client)
-        self._edges = EdgeProxy(Edge,self._client)
+    def _own_data(self):
+        """
+        Copies the result's data before the element changes it.
+
+        :rtype: dict
+
+        """
+        if self._result is not None and self._data is self._result.get_data():
+            self._data = self._data.copy()
+        return self._data
+
+    # These vertex and edge proxies are primarily used for gets; 
+    # all mutable methods that use these are overloaded in Model.
+
+    @property
+    def _vertices(self):
+        """
+        Returns the VertexProxy shared by the client's elements.
+
+        :rtype: VertexProxy
+
+        """
+        return get_shared_proxy(self._client, VertexProxy, Vertex)
 
+    @property
+    def _edges(self):
+        """
+        Returns the EdgeProxy shared by the client's elements.
+
+        :rtype: EdgeProxy
+
+        """
+        return get_shared_proxy(self._client, EdgeProxy, Edge)
        
+    @classmethod
+    def get_compact_class(cls, client):
+        """
+        Returns the compact version of this element class for the client, or
+        this class if it can't be compacted.
+
+        :param client: Client object.
+        :type client: Client
+
+        :rtype: class
+
+        """
+        return get_compact_class(client, cls)
+
     @classmethod
     def get_base_type(cls):
         """
@@ -159,8 +232,9 @@ class Element(object):
 
         """
         pretty_var = client.config.id_var
-        fget = lambda self: self._result.get_id()
-        setattr(Element, pretty_var, property(fget))                    
+        # it's installed on the class once instead of for each element
+        if Element.__dict__.get(pretty_var) is not pretty_id:
+            setattr(Element, pretty_var, pretty_id)
 
     def __setattr__(self, key, value):
         """
@@ -189,7 +263,7 @@ class Element(object):
             object.__setattr__(self, key, value)
         else:
             # set the attribute as a data property
-            self._data[key] = value
+            self._own_data()[key] = value
 
     def __getattr__(self, name):
         """
@@ -291,8 +365,6 @@ class Element(object):
         client_class = state['_client_class']
         client = client_class(config)
         state['_client'] = client
-        state['_vertices'] = VertexProxy(Vertex, client)
-        state['_edges'] = EdgeProxy(Edge, client)
         del state['_client_class']
         del state['_config']
         self.__dict__ = state
@@ -302,8 +374,6 @@ class Element(object):
         state['_config'] = self._client.config
         state['_client_class'] = self._client.__class__
         del state['_client']
-        del state['_vertices']
-        del state['_edges']
         return state
         
     def get(self, name, default_value=None):
@@ -330,7 +400,8 @@ class Element(object):
         :rtype: dict
 
         """
-        return self._data
+        # the caller can change it so it can't be shared with the result
+        return self._own_data()
 
     def map(self):
         """
@@ -524,7 +595,8 @@ class VertexProxy(object):
 
     :ivar element_class: Element class.
     :ivar client: Client object.
-    :ivar index: The primary index object or None.
+    :ivar index: The primary index object or None. Looked up on first use
+        when the proxy was built by the Factory.
 
     .. note:: The Graph object contains a VertexProxy instance named "vertices".
 
@@ -538,11 +610,14 @@ class VertexProxy(object):
     >>> g.vertices.delete(james.eid)                 # Delete vertex
 
     """
+    index = PrimaryIndex()
+
     def __init__(self,element_class, client):
         assert issubclass(element_class, Vertex)
 
         self.element_class = element_class
         self.client = client
+        self._index_loader = None
         self.index = None
 
         # Add element class to Registry so we can initialize query results.
@@ -563,6 +638,10 @@ class VertexProxy(object):
         """
         data = build_data(_data, kwds)
         resp = self.client.create_vertex(data, keys=_keys)
+        expire_element(self.client, "vertex", resp.results.get_id())
+        if _keys or self.client.config.autoindex is True:
+            index_name = self.client.config.vertex_index
+            expire_indexed(self.client, "vertex", index_name, data, _keys)
         return initialize_element(self.client, resp.results)
 
     def get(self, _id):
@@ -575,11 +654,34 @@ class VertexProxy(object):
         :rtype: Vertex or None
 
         """
+        session = get_session(self.client)
+        if session is not None:
+            element = session.get("vertex", _id)
+            if element is not None:
+                return element
+        if self.client.cache is not None:
+            return self.client.cache.get_element("vertex", _id, self.client.get_vertex)
         try:
             resp = self.client.get_vertex(_id)
             return initialize_element(self.client, resp.results)
         except LookupError:
             return None
+
+    def get_many(self, ids):
+        """
+        Returns the vertices for the given IDs in the order of the IDs, with 
+        None for the IDs that don't exist.
+
+        The vertices are loaded in chunks of Config.multi_get_size IDs per 
+        request.
+
+        :param ids: The vertex IDs.
+        :type ids: iterable
+
+        :rtype: list
+
+        """
+        return get_elements(self.client, "vertex", ids, self.client.multi_get_vertices)
         
     def get_or_create(self, key, value, _data=None, _keys=None, **kwds):
         """
@@ -609,14 +711,18 @@ class VertexProxy(object):
             vertex = self.create(_data, keys=_keys, **kwds)
         return vertex
 
-    def get_all(self):
+    def get_all(self, stream=False):
         """
         Returns all the vertices in the graph.
+
+        :param stream: If True, the vertices are initialized as the response 
+                       is read instead of after it's read. Defaults to False.
+        :type stream: bool
         
         :rtype: Vertex generator
  
         """
-        resp = self.client.get_all_vertices()
+        resp = self.client.get_all_vertices(stream=stream)
         return initialize_elements(self.client, resp)
 
     def update(self,_id, _data=None, _keys=None, **kwds):
@@ -638,7 +744,10 @@ class VertexProxy(object):
         # NOTE: this no longer returns an initialized element because not all 
         # Clients return element data, e.g. Neo4jServer retuns nothing.
         data = build_data(_data, kwds)
-        self.client.update_vertex(_id, _data, keys=_keys)
+        self.client.update_vertex(_id, data, keys=_keys)
+        expire_element(self.client, "vertex", _id)
+        # not all Clients reindex updated vertices
+        expire_index(self.client, "vertex", self.client.config.vertex_index)
 
     def remove_properties(self, _id):
         """
@@ -650,7 +759,9 @@ class VertexProxy(object):
         :rtype: Response
 
         """ 
-        return self.client.remove_vertex_properties(_id)
+        resp = self.client.remove_vertex_properties(_id)
+        expire_element(self.client, "vertex", _id)
+        return resp
                     
     def delete(self, _id):
         """
@@ -662,7 +773,9 @@ class VertexProxy(object):
         :rtype: Response
         
         """
-        return self.client.delete_vertex(_id)
+        resp = self.client.delete_vertex(_id)
+        expire_element(self.client, "vertex", _id)
+        return resp
 
 
 #
@@ -825,7 +938,8 @@ class EdgeProxy(object):
 
     :ivar element_class: Element class
     :ivar client: Client object.
-    :ivar index: The primary index object or None.
+    :ivar index: The primary index object or None. Looked up on first use
+        when the proxy was built by the Factory.
 
     .. note:: The Graph object contains an EdgeProxy instance named "edges".
 
@@ -841,11 +955,14 @@ class EdgeProxy(object):
     >>> g.edges.delete(knows.eid)                     # Delete edge
 
     """
+    index = PrimaryIndex()
+
     def __init__(self, element_class, client):
         assert issubclass(element_class, Edge)
 
         self.element_class = element_class
         self.client = client
+        self._index_loader = None
         self.index = None
 
         # Add element class to Registry so we can initialize query results.
@@ -877,6 +994,12 @@ class EdgeProxy(object):
         data = build_data(_data, kwds)
         outV, inV = coerce_vertices(outV, inV)
         resp = self.client.create_edge(outV, label, inV, data, keys=_keys)
+        expire_element(self.client, "edge", resp.results.get_id())
+        if _keys or self.client.config.autoindex is True:
+            index_name = self.client.config.edge_index
+            expire_indexed(self.client, "edge", index_name, data, _keys)
+            expire_lookup(self.client, "edge", index_name, 
+                          self.client.config.label_var, label)
         return initialize_element(self.client, resp.results)
 
     def get(self,_id):
@@ -889,20 +1012,47 @@ class EdgeProxy(object):
         :rtype: Edge or None
 
         """
+        session = get_session(self.client)
+        if session is not None:
+            element = session.get("edge", _id)
+            if element is not None:
+                return element
+        if self.client.cache is not None:
+            return self.client.cache.get_element("edge", _id, self.client.get_edge)
         try:
             resp = self.client.get_edge(_id)
             return initialize_element(self.client, resp.results)
         except LookupError:
             return None
 
-    def get_all(self):
+    def get_many(self, ids):
+        """
+        Returns the edges for the given IDs in the order of the IDs, with 
+        None for the IDs that don't exist.
+
+        The edges are loaded in chunks of Config.multi_get_size IDs per 
+        request.
+
+        :param ids: The edge IDs.
+        :type ids: iterable
+
+        :rtype: list
+
+        """
+        return get_elements(self.client, "edge", ids, self.client.multi_get_edges)
+
+    def get_all(self, stream=False):
         """
         Returns all the edges in the graph.
+
+        :param stream: If True, the edges are initialized as the response 
+                       is read instead of after it's read. Defaults to False.
+        :type stream: bool
         
         :rtype: Edge generator
  
         """
-        resp = self.client.get_all_edges()
+        resp = self.client.get_all_edges(stream=stream)
         return initialize_elements(self.client, resp)
 
 
@@ -925,7 +1075,11 @@ class EdgeProxy(object):
         # NOTE: this no longer returns an initialized element because 
         # not all Clients return element data, e.g. Neo4jServer retuns nothing.
         data = build_data(_data, kwds)
-        return self.client.update_edge(_id, data, keys=_keys)
+        resp = self.client.update_edge(_id, data, keys=_keys)
+        expire_element(self.client, "edge", _id)
+        # not all Clients reindex updated edges
+        expire_index(self.client, "edge", self.client.config.edge_index)
+        return resp
                     
     def remove_properties(self, _id):
         """
@@ -937,7 +1091,9 @@ class EdgeProxy(object):
         :rtype: Response
         
         """
-        return self.client.remove_edge_properties(_id)
+        resp = self.client.remove_edge_properties(_id)
+        expire_element(self.client, "edge", _id)
+        return resp
 
     def delete(self, _id):
         """
@@ -949,13 +1105,274 @@ class EdgeProxy(object):
         :rtype: Response
 
         """
-        return self.client.delete_edge(_id)
+        resp = self.client.delete_edge(_id)
+        expire_element(self.client, "edge", _id)
+        return resp
+
+
+#
+# Compact Elements
+#
+
+class CompactElement(Element):
+    """
+    An abstract base class for compact Vertex and Edge containers.
+
+    Compact elements store only their Result and property data in 
+    __slots__. The client is shared at class level by a subclass built 
+    for each client, see get_compact_class(). They're used for generic 
+    vertices and edges when Config.compact_elements is True, which cuts 
+    the memory used by each element loaded in bulk or cached.
+
+    Models and other Element subclasses aren't compacted because they store 
+    their attributes in the instance __dict__.
+
+    """
+    __slots__ = ("_result", "_data")
+
+    # Set on the client's subclass.
+    _client = None
+
+    _initialized = True
+
+    def __init__(self, client=None):
+        # The client is the class's client.
+        object.__setattr__(self, "_result", None)
+        object.__setattr__(self, "_data", {})
+
+    def __setattr__(self, key, value):
+        """
+        Overloaded to set the slots or the property data.
+
+        :param key: Database property key.
+        :type key: str
+
+        :param value: Database property value.
+        :type value: str, int, long, float, list, dict
+
+        :rtype: None
+
+        """
+        if key in CompactElement.__slots__:
+            object.__setattr__(self, key, value)
+        else:
+            self._own_data()[key] = value
+
+    def __reduce__(self):
+        # Compact classes are built for each client so the element is 
+        # restored with a compact class built for a new client.
+        args = (self.get_base_type(), self._client.__class__, 
+                self._client.config, self._result, self._data)
+        return (_restore_compact_element, args)
+
+
+def _copy_methods(element_class, compact_class):
+    # Compact elements can't subclass Vertex and Edge because they have a 
+    # __dict__, so they share their methods and are registered as virtual 
+    # subclasses instead.
+    for key, value in element_class.__dict__.items():
+        if key in ("__dict__", "__weakref__", "__module__", "__doc__", 
+                   "__abstractmethods__") or key.startswith("_abc_"):
+            # skip the class's own attributes and its ABC registry
+            continue
+        setattr(compact_class, key, value)
+    return compact_class
+
+
+class CompactVertex(CompactElement):
+    """
+    A compact container for a Vertex. It has the same API as Vertex and 
+    passes isinstance() checks for it.
+
+    """
+    __slots__ = ()
+
+_copy_methods(Vertex, CompactVertex)
+Vertex.register(CompactVertex)
+
+
+class CompactEdge(CompactElement):
+    """
+    A compact container for an Edge. It has the same API as Edge and 
+    passes isinstance() checks for it.
+
+    """
+    __slots__ = ()
+
+_copy_methods(Edge, CompactEdge)
+Edge.register(CompactEdge)
+
+
+# Compact classes for the element classes that can be compacted
+COMPACT_CLASSES = {Vertex: CompactVertex, Edge: CompactEdge}
+
+
+def _restore_compact_element(base_type, client_class, config, result, data):
+    client = client_class(config)
+    element_class = dict(vertex=Vertex, edge=Edge)[base_type]
+    element = get_compact_class(client, element_class)(client)
+    element._initialize(result)
+    element._data = data
+    return element
 
 
 #
 # Element Utils
 #
 
+def get_compact_class(client, element_class):
+    """
+    Returns the compact class that shares the client at class level, or the 
+    element class if it can't be compacted.
+
+    :param client: Client object.
+    :type client: Client
+
+    :param element_class: Element class, e.g. Vertex.
+    :type element_class: class
+
+    :rtype: class
+
+    """
+    compact_base = COMPACT_CLASSES.get(element_class)
+    if compact_base is None:
+        return element_class
+    classes = client.__dict__.setdefault("_compact_classes", {})
+    compact_class = classes.get(compact_base)
+    if compact_class is None:
+        # named after the element class for repr()
+        namespace = dict(__slots__=(), _client=client)
+        compact_class = type(element_class.__name__, (compact_base,), namespace)
+        classes[compact_base] = compact_class
+    return compact_class
+
+
+def get_elements(client, base_type, ids, multi_get):
+    """
+    Returns the elements for the IDs in the order of the IDs, with None for 
+    the IDs that don't exist. 
+
+    Elements in the session or the cache aren't loaded again, and the others
+    are loaded in chunks of Config.multi_get_size IDs per request.
+
+    :param client: Client object.
+    :type client: Client
+
+    :param base_type: Base type, either "vertex" or "edge".
+    :type base_type: str
+
+    :param ids: Element IDs.
+    :type ids: iterable
+
+    :param multi_get: Client method that gets the elements by IDs, e.g. 
+        multi_get_vertices.
+    :type multi_get: function
+
+    :rtype: list
+
+    """
+    ids = list(ids)
+    elements = {}
+    session = get_session(client)
+    missing = []
+    for _id in ids:
+        # IDs are keyed as strings so 1 and "1" map to the same element
+        key = str(_id)
+        if key in elements:
+            continue
+        element = session.get(base_type, _id) if session is not None else None
+        elements[key] = element
+        if element is None:
+            missing.append(_id)
+    if missing:
+        load = lambda id_list: _multi_get_results(client, multi_get, id_list)
+        if client.cache is not None:
+            elements.update(client.cache.get_elements(base_type, missing, load))
+        else:
+            results = load(missing)
+            keys = list(results)
+            loaded = initialize_element_list(client, [results[key] for key in keys])
+            elements.update(zip(keys, loaded))
+    return [elements.get(str(_id)) for _id in ids]
+
+def lookup_elements(client, base_type, index_name, key, value, load, multi_get):
+    """
+    Returns the elements in the index for the key and value. 
+
+    The IDs are cached, and the elements are got from the element cache, 
+    or with a multi-get; otherwise the lookup is loaded and its IDs and 
+    elements are cached.
+
+    :param client: Client object with a cache.
+    :type client: bulbs.base.client.Client
+
+    :param base_type: Base type, either "vertex" or "edge".
+    :type base_type: str
+
+    :param index_name: Index name.
+    :type index_name: str
+
+    :param key: The index key.
+    :type key: str
+
+    :param value: The key's value.
+    :type value: str or int
+
+    :param load: Function that looks up the key and value and returns the
+        Response.
+    :type load: function
+
+    :param multi_get: Client method that gets the elements by IDs, e.g. 
+        multi_get_vertices.
+    :type multi_get: function
+
+    :rtype: list
+
+    """
+    cache = client.cache
+    cache_key = cache.lookup_key(base_type, index_name, key, value)
+    ids = cache.get_lookup(cache_key)
+    if ids is not None:
+        elements = get_elements(client, base_type, ids, multi_get)
+        return [element for element in elements if element is not None]
+    results = get_results_list(load())
+    cache.set_lookup(cache_key, [result.get_id() for result in results])
+    cache.set_elements(base_type, results)
+    return initialize_element_list(client, results)
+
+def _multi_get_results(client, multi_get, ids):
+    # Returns a dict of the Results that exist, keyed by the string ID.
+    results = {}
+    chunk_size = getattr(client.config, "multi_get_size", None)
+    for chunk in get_chunks(ids, chunk_size):
+        resp = multi_get(chunk)
+        for result in get_results_list(resp):
+            results[str(result.get_id())] = result
+    return results
+
+def get_shared_proxy(client, proxy_class, element_class):
+    """
+    Returns the proxy shared by the client's elements, built on first use.
+
+    :param client: Client object.
+    :type client: Client
+
+    :param proxy_class: Proxy class, e.g. VertexProxy.
+    :type proxy_class: class
+
+    :param element_class: Element class managed by the proxy.
+    :type element_class: class
+
+    :rtype: Element proxy
+
+    """
+    proxies = client.__dict__.setdefault("_shared_proxies", {})
+    key = (proxy_class, element_class)
+    proxy = proxies.get(key)
+    if proxy is None:
+        proxy = proxies[key] = proxy_class(element_class, client)
+    return proxy
+
 def build_data(_data, kwds):
     """
     Returns property data dict, regardless of how it was entered.
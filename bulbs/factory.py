@@ -7,24 +7,64 @@
 Build instances used to interact with the backend clients.
 
 """
+import copy
+
+# Indices that have been looked up in this process, keyed by
+# (root_uri, index_class, base_type, index_name), so each Graph
+# doesn't have to get or create them again.
+indices = dict()
+
+
+class IndexLoader(object):
+    """
+    Gets or creates an element proxy's primary index the first time it's used.
+
+    :ivar factory: Factory object.
+    :ivar element_class: Element class managed by the proxy.
+    :ivar index_class: Index class for Element's primary index.
+    :ivar index_name: Index name.
+
+    """
+    def __init__(self, factory, element_class, index_class, index_name):
+        self.factory = factory
+        self.element_class = element_class
+        self.index_class = index_class
+        self.index_name = index_name
+
+    def __call__(self):
+        return self.factory.get_index(self.element_class, self.index_class,
+                                      self.index_name)
+
 
 class Factory(object):
 
     def __init__(self, client):
         self.client = client
 
+        # Element proxies whose index may not have been loaded yet.
+        self.proxies = []
+
     def build_element_proxy(self, element_class, index_class, index_name=None):
         proxy_class = element_class.get_proxy_class()
         element_proxy = proxy_class(element_class, self.client)
-        primary_index = self.get_index(element_class,index_class,index_name)
-        element_proxy.index = primary_index
+        if index_name is None:
+            index_name = element_class.get_index_name(self.client.config)
+        # the index is looked up on first use, see ensure_indices()
+        loader = IndexLoader(self, element_class, index_class, index_name)
+        element_proxy._index_loader = loader
+        self.proxies.append(element_proxy)
         return element_proxy
 
     def get_index(self, element_class, index_class, index_name=None):
         if index_name is None:
             index_name = element_class.get_index_name(self.client.config)
+        key = self._get_index_key(element_class, index_class, index_name)
+        index = indices.get(key)
+        if index is not None:
+            return self._bind_index(index, index_name)
         index_proxy = self.build_index_proxy(element_class, index_class)
         index = index_proxy.get_or_create(index_name)
+        indices[key] = index
         return index
 
     def build_index_proxy(self, element_class, index_class):
@@ -33,5 +73,76 @@ class Factory(object):
         index_proxy = proxy_class(index_class, self.client)
         return index_proxy
 
-    
+    def ensure_indices(self):
+        """
+        Gets or creates the primary index of each element proxy that hasn't
+        loaded it yet in one request.
+
+        :rtype: None
+
+        """
+        proxies = [proxy for proxy in self.proxies if proxy._index_loader is not None]
+        self.proxies = []
+        wanted, keys = [], set()
+        for proxy in proxies:
+            loader = proxy._index_loader
+            key = self._get_index_key(loader.element_class, loader.index_class,
+                                      loader.index_name)
+            if key not in indices and key not in keys:
+                wanted.append((key, loader))
+                keys.add(key)
+        if wanted:
+            self._get_or_create_indices(wanted)
+        for proxy in proxies:
+            # the loader finds the index in the process cache
+            proxy.index
+
+    def _get_or_create_indices(self, wanted):
+        index_proxies = [self.build_index_proxy(loader.element_class, loader.index_class)
+                         for key, loader in wanted]
+        params_list = [(loader.index_name, loader.element_class.get_base_type(),
+                        index_proxy.get_index_params())
+                       for (key, loader), index_proxy in zip(wanted, index_proxies)]
+        try:
+            resp = self.client.get_or_create_indices(params_list)
+        except NotImplementedError:
+            # The backend doesn't have to make a request to get its indices.
+            return
+        for (key, loader), index_proxy, result in zip(wanted, index_proxies, resp.results):
+            index = index_proxy.index_class(self.client, result)
+            self.client.registry.add_index(loader.index_name, index)
+            indices[key] = index
+
+    def _get_index_key(self, element_class, index_class, index_name):
+        base_type = element_class.get_base_type()
+        return (self.client.config.root_uri, index_class, base_type, index_name)
+
+    def _bind_index(self, index, index_name):
+        # the cached index may belong to another Graph's client
+        if index.client is not self.client:
+            index = copy.copy(index)
+            index.client = self.client
+        self.client.registry.add_index(index_name, index)
+        return index
+
+
+def evict_index(client, base_type, index_name):
+    """
+    Removes an index from the process cache, e.g. after it's been deleted.
+
+    :param client: Client object.
+    :type client: bulbs.base.client.Client
+
+    :param base_type: Index base type, either vertex or edge.
+    :type base_type: str
+
+    :param index_name: Index name.
+    :type index_name: str
+
+    :rtype: None
 
+    """
+    root_uri = client.config.root_uri
+    for key in list(indices):
+        if key[0] == root_uri and key[2:] == (base_type, index_name):
+            del indices[key]
@@ -25,6 +25,26 @@ def get_edges() {
   g.getEdges()
 }
 
+// Returns the vertices that exist for the IDs.
+def get_vertices_by_id(id_list) {
+  vertices = []
+  for (_id in id_list) {
+    vertex = g.v(_id)
+    if (vertex != null) vertices.add(vertex)
+  }
+  return vertices
+}
+
+// Returns the edges that exist for the IDs.
+def get_edges_by_id(id_list) {
+  edges = []
+  for (_id in id_list) {
+    edge = g.e(_id)
+    if (edge != null) edges.add(edge)
+  }
+  return edges
+}
+
 // Vertices
 
 // These edge-label conditionals are a messy hack until Gremin allows null labels. 
@@ -112,6 +132,49 @@ def delete_vertex(_id) {
   g.removeVertex(vertex)
 }
 
+// Sets the changed properties and removes the deleted ones, leaving the rest.
+def patch_vertex(_id, data, removed) {
+  vertex = g.v(_id)
+  for (String key in removed)
+    vertex.removeProperty(key)
+  for (entry in data.entrySet())
+    vertex.setProperty(entry.key, entry.value)
+  return vertex
+}
+
+def patch_edge(_id, data, removed) {
+  edge = g.e(_id)
+  for (String key in removed)
+    edge.removeProperty(key)
+  for (entry in data.entrySet())
+    edge.setProperty(entry.key, entry.value)
+  return edge
+}
+
+// Creates the vertices and returns them in order.
+def create_vertices(data_list) {
+  vertices = []
+  for (data in data_list) {
+    vertex = g.addVertex()
+    for (entry in data.entrySet())
+      vertex.setProperty(entry.key, entry.value)
+    vertices.add(vertex)
+  }
+  return vertices
+}
+
+// Creates the edges, a list of [outV, inV, data], and returns them in order.
+def create_edges(label, edges) {
+  results = []
+  for (item in edges) {
+    edge = g.addEdge(g.v(item[0]), g.v(item[1]), label)
+    for (entry in item[2].entrySet())
+      edge.setProperty(entry.key, entry.value)
+    results.add(edge)
+  }
+  return results
+}
+
 // Indices
 
 def index_count(index_name, key, value) {
@@ -169,6 +232,36 @@ def get_or_create_edge_index(index_name, index_params) {
   return transaction(getOrCreateEdgeIndex);
 }
 
+// indices is a list of [index_name, index_class, index_params] lists
+def get_or_create_indices(indices) {
+  def getOrCreateIndices = { 
+    for (entry in indices) {
+      def (index_name, index_class, index_params) = entry
+      index = g.idx(index_name)
+      if (index == null) {
+        element_class = (index_class == "edge") ? Edge.class : Vertex.class
+        if (index_params == null) {
+          g.createIndex(index_name, element_class)
+        } else {
+          g.createIndex(index_name, element_class, index_params)
+        }
+      }
+    }
+    return null
+  }
+  def transaction = { final Closure closure ->
+    try {
+      results = closure();
+      g.commit();
+      return results; 
+    } catch (e) {
+      g.rollback();
+      throw e;
+    }
+  }
+  return transaction(getOrCreateIndices);
+}
+
 // Utils
 
 def warm_cache() {
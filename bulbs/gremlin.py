@@ -43,7 +43,7 @@ class Gremlin(object):
             result = get_one_result(resp)
             return result.raw
 
-    def query(self, script, params=None):
+    def query(self, script, params=None, stream=False, read_only=False):
         """
         Returns initialized Element objects from an arbitrary Gremlin query.
 
@@ -53,13 +53,21 @@ class Gremlin(object):
         :param params: Optional paramaters to bind to the Gremlin script. 
         :type params: dict or None
 
+        :param stream: If True, the elements are initialized as the response
+                       is read instead of after it's read. Defaults to False.
+        :type stream: bool
+
+        :param read_only: True if the script doesn't modify the database so it
+                          can be sent to a read replica. Defaults to False.
+        :type read_only: bool
+
         :rtype: Generator of objects: Vertex, Edge, Node, or Relationship
 
         .. note:: Use this when you are returning elements that need to 
                   be initialized.
 
         """
-        resp = self.client.gremlin(script, params)
+        resp = self.client.gremlin(script, params, stream=stream, read_only=read_only)
         return initialize_elements(self.client, resp)
  
     def execute(self, script, params=None):
@@ -2,15 +2,16 @@ import os
 import io
 import re
 import string
-import sre_parse
-import sre_compile
+import threading
 from collections import OrderedDict, namedtuple
-from sre_constants import BRANCH, SUBPATTERN
 import hashlib
 from . import utils
+from .utils import json
 
 # GroovyScripts is the only public class
 
+log = utils.get_logger(__name__)
+
 #
 # The scanner code came from the TED project.
 #
@@ -21,6 +22,20 @@ from . import utils
 
 Method = namedtuple('Method', ['definition', 'signature', 'body', 'sha1'])
 
+# A method that's registered with the server and then called by name. The
+# name is suffixed with the sha1 so each version is registered separately.
+Registration = namedtuple('Registration', ['name', 'sha1', 'call', 'script'])
+
+# (root_uri, sha1) of the methods registered with each server
+registered = set()
+
+# Parsed methods of each script file, shared by all the clients in the 
+# process: parsed[file_path] = (mtime, size, methods)
+parsed = dict()
+
+# Version of the on-disk cache format
+CACHE_VERSION = 1
+
 class LastUpdatedOrderedDict(OrderedDict):
     """Store items in the order the keys were last added."""
 
@@ -51,6 +66,7 @@ class GroovyScripts(object):
     .. note:: Use the update() method to add subsequent script files. 
               Order matters. Groovy methods are overridden if subsequently added
               files contain the same method name as a previously added file.
+              The files are parsed the first time a script is used.
 
     """
     #: Relative path to the default script file
@@ -63,7 +79,11 @@ class GroovyScripts(object):
 
         # may have model-specific namespaces
         # methods format: methods[method_name] = method_object
-        self.namespace_map = OrderedDict()     # namespace_map[namespace] = methods
+        self._namespace_map = OrderedDict()    # namespace_map[namespace] = methods
+
+        # (file_path, namespace) pairs added but not parsed yet
+        self._unparsed = []
+        self._lock = threading.Lock()
 
         if file_path is None:
             file_path = self._get_default_file()
@@ -73,6 +93,10 @@ class GroovyScripts(object):
         self.default_namespace = self._get_filename(file_path) 
         self.update(file_path, self.default_namespace)
 
+        # registrations[call] = registration, see Config.register_scripts
+        self.registrations = dict()
+        self._calls = dict()
+
 
     def get(self, method_name, namespace=None):
         """
@@ -88,9 +112,79 @@ class GroovyScripts(object):
         #          my_method, my_namespace  # pass in namespace as an arg
         #          my_namespace:my_method   # pass in  namespace via a method_name prefix
         method = self.get_method(method_name, namespace)
-        script = method.signature if self.config.server_scripts is True else method.body 
-        #script = self._build_script(method_definition, method_signature)
-        return script
+        if self.config.server_scripts is True:
+            return method.signature
+        if getattr(self.config, "register_scripts", False) is True:
+            return self._get_call(method)
+        return method.body
+
+    def execute(self, send, script):
+        """
+        Sends the script and returns the Response. A call to a registered 
+        method registers the method with the server the first time it's sent,
+        and again if the server reports the method is unknown, e.g. after 
+        the server restarts or if the request is sent to another replica.
+
+        :param send: Function that sends a script, e.g. to the Gremlin 
+            extension, and returns the Response.
+        :type send: function
+
+        :param script: Gremlin script returned by get().
+        :type script: str
+
+        :rtype: Response
+
+        """
+        registration = self.registrations.get(script)
+        if registration is None:
+            return send(script)
+        key = (self.config.root_uri, registration.sha1)
+        if key not in registered:
+            resp = send(registration.script)
+            registered.add(key)
+            return resp
+        try:
+            return send(script)
+        except (ValueError, SystemError) as error:
+            if not is_unknown_method(error, registration.name):
+                raise
+            log.debug("Registering %s again.", registration.name)
+            return send(registration.script)
+
+    def get_definition(self, script):
+        """
+        Returns the script with the definition of the registered method it 
+        calls, if any, so it can be sent before the method is registered.
+
+        :param script: Gremlin script returned by get().
+        :type script: str
+
+        :rtype: str
+
+        """
+        registration = self.registrations.get(script)
+        if registration is None:
+            return script
+        return registration.script
+
+    @property
+    def namespace_map(self):
+        """
+        Returns the OrderedDict mapping each namespace to its methods.
+
+        :rtype: OrderedDict
+
+        """
+        if self._unparsed:
+            # files are parsed in order so later methods override earlier ones
+            with self._lock:
+                while self._unparsed:
+                    file_path, namespace = self._unparsed[0]
+                    methods = self._get_methods(file_path)
+                    self._maybe_create_namespace(namespace)
+                    self._namespace_map[namespace].update(methods)
+                    self._unparsed.pop(0)
+        return self._namespace_map
 
     def get_methods(self, namespace):
         return self.namespace_map[namespace]
@@ -117,12 +211,11 @@ class GroovyScripts(object):
 
         """
         file_path = os.path.abspath(file_path)
-        methods = self._get_methods(file_path)
         if namespace is None:
             namespace = self._get_filename(file_path)
-        self._maybe_create_namespace(namespace)
         self.source_file_map[file_path] = namespace
-        self.namespace_map[namespace].update(methods)
+        # parsed by namespace_map when a script is first used
+        self._unparsed.append((file_path, namespace))
 
     def refresh(self):
         """
@@ -137,9 +230,9 @@ class GroovyScripts(object):
             self.namespace_map[namespace].update(methods)
 
     def _maybe_create_namespace(self, namespace):
-        if namespace not in self.namespace_map:
+        if namespace not in self._namespace_map:
             methods = LastUpdatedOrderedDict()
-            self.namespace_map[namespace] = methods
+            self._namespace_map[namespace] = methods
 
     def _get_filename(self, file_path):
         base_name = os.path.basename(file_path)
@@ -157,33 +250,121 @@ class GroovyScripts(object):
         return namespace, method_name
 
     def _get_methods(self,file_path):
-        return Parser(file_path).get_methods()
+        cache_dir = getattr(self.config, "script_cache_dir", None)
+        return get_methods(file_path, cache_dir)
 
     def _get_default_file(self):
         file_path = utils.get_file_path(__file__, self.default_file)
         return file_path
 
-    def _build_script(definition, signature): 
-        # This method isn't be used right now...
-        # This method is not current (rework it to suit needs).
-        script = """
-        try {
-          current_sha1 = methods[name]
-        } catch(e) {
-          current_sha1 = null
-          methods = [:]
-          methods[name] = sha1
-        }
-        if (current_sha1 == sha1) 
-          %s
+    def _get_call(self, method):
+        # Returns the script that calls the registered method
+        call = self._calls.get(method.sha1)
+        if call is None:
+            registration = self._build_registration(method)
+            self.registrations[registration.call] = registration
+            call = self._calls[method.sha1] = registration.call
+        return call
+
+    def _build_registration(self, method): 
+        # The Gremlin-Groovy script engine keeps the methods defined by a 
+        # script so later scripts can call them with only the params.
+        method_name = method.signature.split("(")[0].strip()
+        name = "%s_%s" % (method_name, method.sha1)
+        call = name + method.signature[len(method_name):]
+        definition = re.sub(r"^def\s+%s" % re.escape(method_name), "def " + name, 
+                            method.definition, count=1)
+        script = "%s\n%s" % (definition, call)
+        return Registration(name, method.sha1, call, script)
+
+
+def get_methods(file_path, cache_dir=None):
+    """
+    Returns the Groovy methods in the script file. 
+    
+    The parsed methods are cached in the process until the file's mtime or
+    size changes, and in the cache directory by the sha1 of the file so new
+    processes don't parse the file again.
+
+    :param file_path: Absolute path to the script file.
+    :type file_path: str
+
+    :param cache_dir: Optional cache directory; "auto" uses the user's cache 
+        directory. Defaults to None, which disables the on-disk cache.
+    :type cache_dir: str
+
+    :rtype: OrderedDict
 
-        try { 
-          return %s
-        } catch(e) {
+    """
+    stat = os.stat(file_path)
+    entry = parsed.get(file_path)
+    if entry is not None and entry[:2] == (stat.st_mtime, stat.st_size):
+        return entry[2]
+    methods = None
+    if cache_dir:
+        if cache_dir == "auto":
+            cache_dir = get_cache_dir()
+        with io.open(file_path, 'rb') as fin:
+            sha1 = hashlib.sha1(fin.read()).hexdigest()
+        cache_path = os.path.join(cache_dir, "%s.json" % sha1)
+        methods = _read_methods(cache_path)
+        if methods is None:
+            methods = Parser(file_path).get_methods()
+            _write_methods(cache_path, methods)
+    else:
+        methods = Parser(file_path).get_methods()
+    parsed[file_path] = (stat.st_mtime, stat.st_size, methods)
+    return methods
+
+def get_cache_dir():
+    # The user's cache directory, so other users can't change the scripts 
+    base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base_dir, "bulbs", "scripts")
+
+def _read_methods(cache_path):
+    try:
+        with io.open(cache_path, 'rb') as fin:
+            data = json.loads(fin.read().decode('utf-8'))
+    except (IOError, OSError, ValueError):
+        return None
+    if data.get('version') != CACHE_VERSION:
+        return None
+    methods = OrderedDict()
+    for name, method in data['methods']:
+        methods[name] = Method(*method)
+    return methods
+
+def _write_methods(cache_path, methods):
+    # Written to a temp file and renamed so readers don't see partial files
+    data = dict(version=CACHE_VERSION, methods=list(methods.items()))
+    temp_path = "%s.%d.tmp" % (cache_path, os.getpid())
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        with io.open(temp_path, 'wb') as fout:
+            fout.write(json.dumps(data).encode('utf-8'))
+        os.rename(temp_path, cache_path)
+    except (IOError, OSError) as error:
+        log.debug("Can't cache the Groovy scripts in %s: %s", cache_path, error)
+
+
+def is_unknown_method(error, name):
+    """
+    Returns True if the request error says the server doesn't know the method.
 
-          return %s 
-        }""" % (signature, definition, signature)
-        return script
+    :param error: Error raised by the request.
+    :type error: Exception
+
+    :param name: Name of the registered method.
+    :type name: str
+
+    :rtype: bool
+
+    """
+    message = str(error)
+    return name in message and ("MissingMethodException" in message or 
+                                "No signature of method" in message)
 
 
 
@@ -193,17 +374,16 @@ class Scanner:
         self.group_pattern = self._get_group_pattern(flags)
         
     def _get_group_pattern(self,flags):
-        # combine phrases into a compound pattern
+        # combine phrases into a compound pattern, with each phrase wrapped 
+        # in a top-level group so match.lastindex maps back to its callback
         patterns = []
-        sub_pattern = sre_parse.Pattern()
-        sub_pattern.flags = flags
+        self.group_callbacks = {}
+        group_index = 1
         for phrase, action in self.lexicon:
-            patterns.append(sre_parse.SubPattern(sub_pattern, [
-                (SUBPATTERN, (len(patterns) + 1, sre_parse.parse(phrase, flags))),
-                ]))
-        sub_pattern.groups = len(patterns) + 1
-        group_pattern = sre_parse.SubPattern(sub_pattern, [(BRANCH, (None, patterns))])
-        return sre_compile.compile(group_pattern)
+            patterns.append("(%s)" % phrase)
+            self.group_callbacks[group_index] = action
+            group_index += 1 + re.compile(phrase, flags).groups
+        return re.compile("|".join(patterns), flags)
 
     def get_multiline(self,f,m):
         content = []
@@ -224,10 +404,10 @@ class Scanner:
         # to make sure the record data is grouped properly
         # so make sure you add content by calling callback()
         # before doing any recursive calls
-        match = self.group_pattern.scanner(line).match() 
+        match = self.group_pattern.match(line)
         if not match:
             return
-        callback = self.lexicon[match.lastindex-1][1]
+        callback = self.group_callbacks[match.lastindex]
         if "def" in match.group():
             # this is a multi-line get
             first_line = match.group()
@@ -14,9 +14,21 @@ if sys.version > '3':
     long = int
     unicode = str
 
+import datetime
+
 from bulbs.base import TypeSystem, Converter
 from .utils import to_timestamp, to_datetime, to_datestamp, to_date, json
 
+# NumPy is optional; it vectorizes timestamp conversion. It's slow to import
+# so it's imported the first time a column is converted, see _import_numpy().
+numpy = False
+
+# Range of the timestamps that can be converted to a Python datetime
+MIN_TIMESTAMP = to_timestamp(datetime.datetime.min)
+MAX_TIMESTAMP = to_timestamp(datetime.datetime.max)
+
+NUMERIC_TYPES = set([int, long, float])
+
 
 class DatabaseConverter(Converter):
     """
@@ -295,6 +307,39 @@ class PythonConverter(Converter):
         """
         if value is not None:
             return to_datetime(value)
+
+    def to_datetime_column(self, values):
+        """
+        Converts a column of JSON timestamps to Python datetime objects. 
+        Uses NumPy's datetime64 if it's installed.
+
+        :param values: Property values.
+        :type values: list
+
+        :rtype: list
+
+        :raises: ValueError
+
+        """
+        present = values
+        if None in values:
+            present = [value for value in values if value is not None]
+        if _import_numpy() is None or not _is_numeric(present):
+            return [self.to_datetime(value) for value in values]
+        timestamps = numpy.array(present, dtype="float64")
+        if len(present) and not (MIN_TIMESTAMP <= timestamps.min() and 
+                                 timestamps.max() < MAX_TIMESTAMP + 1):
+            # Out of range or NaN; let to_datetime raise the error.
+            return [self.to_datetime(value) for value in values]
+        # Round to microseconds like datetime.utcfromtimestamp() does.
+        seconds = numpy.floor(timestamps)
+        micros = numpy.round((timestamps - seconds) * 1e6).astype("int64")
+        micros += seconds.astype("int64") * 1000000
+        converted = micros.astype("datetime64[us]").tolist()
+        if len(present) == len(values):
+            return converted
+        converted = iter(converted)
+        return [None if value is None else next(converted) for value in values]
             
     def to_date(self, value):
         """
@@ -329,6 +374,21 @@ class PythonConverter(Converter):
         return None
 
 
+def _import_numpy():
+    # Returns the numpy module, or None if it isn't installed.
+    global numpy
+    if numpy is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+    return numpy
+
+def _is_numeric(values):
+    # NumPy would also parse strings and bools, which to_datetime rejects.
+    return set(map(type, values)) <= NUMERIC_TYPES
+
+
 class JSONTypeSystem(TypeSystem):
     """
     Converts database properties to and from their JSON representations.
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+The MessagePack Type System.
+
+MessagePack is a binary serialization that's smaller and faster to parse
+than JSON. Datetimes are stored as MessagePack timestamps, which keep their
+microseconds, and longs are stored as 64-bit integers.
+
+The type system is selected by setting Config.type_system to "msgpack". It
+requires the msgpack package and a server that accepts MessagePack.
+
+"""
+import datetime
+import calendar
+
+from bulbs.base import TypeSystem
+from bulbs.codec import Codec, register_content_codec
+from bulbs import json
+
+# msgpack is optional; it's only required if this type system is selected.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+CONTENT_TYPE = "application/x-msgpack"
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+class MessagePackCodec(Codec):
+    """Encodes requests and decodes responses as MessagePack."""
+
+    name = "msgpack"
+    module_name = "msgpack"
+
+    def dumps(self, value):
+        return self.module.packb(value, use_bin_type=True)
+
+    def loads(self, content):
+        # Element IDs can be map keys
+        return self.module.unpackb(content, raw=False, strict_map_key=False)
+
+
+class DatabaseConverter(json.DatabaseConverter):
+    """Converts Python values to database values."""
+
+    def to_datetime(self, value):
+        """
+        Converts a Python datetime object to a MessagePack timestamp.
+
+        :param value: Property value.
+        :type value: datetime or None
+
+        :rtype: msgpack.Timestamp or None
+
+        """
+        if value is not None:
+            seconds = calendar.timegm(value.utctimetuple())
+            return msgpack.Timestamp(seconds, value.microsecond * 1000)
+
+
+class PythonConverter(json.PythonConverter):
+    """Converts database values to Python values."""
+
+    def to_datetime(self, value):
+        """
+        Converts a MessagePack timestamp, or a timestamp number stored by
+        the JSON type system, to a Python datetime object.
+
+        :param value: Property value.
+        :type value: msgpack.Timestamp, int, or None
+
+        :rtype: datetime or None
+
+        :raises: ValueError
+
+        """
+        if isinstance(value, msgpack.Timestamp):
+            return EPOCH + datetime.timedelta(seconds=value.seconds,
+                                              microseconds=value.nanoseconds // 1000)
+        return json.PythonConverter.to_datetime(self, value)
+
+    def to_date(self, value):
+        """
+        Converts a MessagePack timestamp, or a timestamp number stored by
+        the JSON type system, to a Python date object.
+
+        :param value: Property value.
+        :type value: msgpack.Timestamp, int, or None
+
+        :rtype: date or None
+
+        :raises: ValueError
+
+        """
+        if isinstance(value, msgpack.Timestamp):
+            value = value.seconds
+        return json.PythonConverter.to_date(self, value)
+
+
+class MessagePackTypeSystem(TypeSystem):
+    """
+    Converts database properties to and from their MessagePack representations.
+
+    :cvar content_type: The backend client's content type.
+    :cvar database: Converter object. Converts Python values to database values.
+    :cvar python: Converter object. Converts database values to Python values.
+
+    :raises: ImportError if msgpack isn't installed.
+
+    """
+    content_type = CONTENT_TYPE
+
+    database = DatabaseConverter()
+    python = PythonConverter()
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("The MessagePack type system requires msgpack")
+
+
+if msgpack is not None:
+    register_content_codec(CONTENT_TYPE, MessagePackCodec())
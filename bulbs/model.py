@@ -10,12 +10,17 @@ Base classes for modeling domain objects that wrap vertices and edges.
 import six  # Python 3
 import inspect
 import types
-from collections import Callable
+from abc import ABCMeta
+try:
+    from collections.abc import Callable
+except ImportError:
+    from collections import Callable  # Python 2
 
 from bulbs.property import Property
 from bulbs.element import Element, Vertex, VertexProxy, Edge, EdgeProxy, \
     coerce_vertices, build_data
-from bulbs.utils import initialize_element, get_logger
+from bulbs.utils import initialize_element, expire_element, expire_lookup, \
+    expire_indexed, expire_index, get_logger, get_chunks
 
 
 # Model Modes
@@ -25,7 +30,7 @@ STRICT = 2
 log = get_logger(__name__)
 
 
-class ModelMeta(type):
+class ModelMeta(ABCMeta):
     """Metaclass used to set database Property definitions on Models."""
 
     def __init__(cls, name, base, namespace):
@@ -37,6 +42,10 @@ class ModelMeta(type):
         # Add new Properties
         cls._register_properties(namespace)
 
+        # Compile the Properties into a conversion plan
+        cls._plan = cls._compile_plan()
+        cls._converter_plans = {}
+
     def _get_initial_properties(cls):
         """
         Get Properties defined in the parent and inherit them.
@@ -121,6 +130,57 @@ class ModelMeta(type):
             property_value = None
         setattr(cls, key, property_value)
 
+    def _compile_plan(cls):
+        """
+        Returns a tuple of (key, property_instance, calculated, nullable, 
+        python_type, validated) for each Property, which load and save loop 
+        over instead of looking up each Property's definition.
+
+        The validated flag is False if the Property's validate() has been 
+        overridden and must be called instead of inlining the checks.
+
+        :rtype: tuple
+
+        """
+        plan = []
+        for key in cls._properties:  # Python 3
+            property_instance = cls._properties[key]
+            calculated = property_instance.fget is not None
+            validated = property_instance.has_default_validation()
+            plan.append((key, property_instance, calculated, 
+                         property_instance.nullable, 
+                         property_instance.python_type, validated))
+        return tuple(plan)
+
+    def _get_converter_plans(cls, type_system):
+        """
+        Returns the load and save plans for the type system, which add the
+        Properties' converter functions to the compiled plan.
+
+        The load plan is a tuple of (key, property_instance, to_python, 
+        to_python_column) for each stored Property, and the save plan is a 
+        tuple of the compiled plan's entries with to_db appended.
+
+        :param type_system: TypeSystem object.
+        :type type_system: TypeSystem
+
+        :rtype: tuple
+
+        """
+        plan_key = (type_system.database, type_system.python)
+        plans = cls._converter_plans.get(plan_key)
+        if plans is None:
+            load_plan, save_plan = [], []
+            for entry in cls._plan:
+                key, property_instance, calculated = entry[:3]
+                to_db, to_python = property_instance.get_converters(type_system, key)
+                if not calculated:
+                    to_python_column = property_instance.get_column_converter(type_system)
+                    load_plan.append((key, property_instance, to_python, to_python_column))
+                save_plan.append(entry + (to_db,))
+            plans = cls._converter_plans[plan_key] = (tuple(load_plan), tuple(save_plan))
+        return plans
+
 
 class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
     """Abstract base class for Node and Relationship container classes."""
@@ -152,6 +212,9 @@ class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
         """
         if key in self._properties:
             self._set_database_property(key, value)
+        elif key in self.__dict__:
+            # Existing attributes, e.g. _result, are set the same in any mode.
+            object.__setattr__(self, key, value)
         else:
             # If _mode = STRICT, set an instance var, which isn't saved to DB.
             # If _mode = NORMAL, store in self._data, which is saved to DB
@@ -177,6 +240,7 @@ class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
         if not self._is_calculated_property(key):
             value = self._coerce_property_value(key, value)
             object.__setattr__(self, key, value)
+            self._mark_dirty(key)
 
     def _set_normal_attribute(self, key, value):
         """
@@ -197,6 +261,27 @@ class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
         else:
             # Store the attribute in self._data, which are saved to database.
             Element.__setattr__(self, key, value)        
+            if key not in self.__dict__:
+                self._mark_dirty(key)
+
+    def _mark_dirty(self, key):
+        """
+        Records that a database property changed so save() will send it.
+
+        :param key: Attribute key
+        :type key: str
+
+        :rtype: None
+
+        """
+        # _dirty is None until the element is initialized with DB data
+        dirty = self.__dict__.get("_dirty")
+        if dirty is not None:
+            dirty.add(key)
+
+    def _reset_dirty(self):
+        # The element's data matches the DB after it's loaded or saved.
+        object.__setattr__(self, "_dirty", set())
 
     def _is_calculated_property(self, key):
         """
@@ -291,19 +376,107 @@ class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
 
         """
         type_system = self._client.type_system
-        for key in self._properties:   # Python 3
-            
-            # Don't set calculted property values, i.e. those with fset defined.
-            if self._is_calculated_property(key): continue
+        load_plan = type(self)._get_converter_plans(type_system)[0]
+        data = self._data
+        values = {}
+
+        # Calculated properties aren't in the load plan.
+        for key, property_instance, to_python, to_python_column in load_plan:
+            value = data.get(key, None)
+            try:
+                value = to_python(value)
+            except Exception:
+                # Logs the error and sets the value to None.
+                value = property_instance.convert_to_python(type_system, key, value)
+            values[key] = value
+
+        # Set them as attributes without going through the overloaded 
+        # __setattr__. No need to coerce them twice.
+        self.__dict__.update(values)
 
-            property_instance = self._properties[key]
-            #name = property_instance.name
-            value = self._data.get(key, None)
-            value = property_instance.convert_to_python(type_system, key, value)
+    @classmethod
+    def _set_property_data_many(cls, elements):
+        """
+        Sets Property data for a list of elements after they're retrieved 
+        from the DB, converting each Property's values a column at a time.
 
-            # TODO: Maybe need to wrap this in try/catch too.
-            # Notice that __setattr__ is overloaded. No need to coerce it twice.
-            object.__setattr__(self, key, value)
+        :param elements: Elements of this class that share a client.
+        :type elements: list
+
+        :rtype: None
+
+        .. note:: Sets the value to None if it's an invalid type.
+
+        """
+        type_system = elements[0]._client.type_system
+        load_plan = cls._get_converter_plans(type_system)[0]
+        dicts = [element.__dict__ for element in elements]
+        datas = [element._data for element in elements]
+
+        for key, property_instance, to_python, to_python_column in load_plan:
+            column = [data.get(key, None) for data in datas]
+            values = None
+            if to_python_column is not None:
+                try:
+                    values = to_python_column(column)
+                except Exception:
+                    # Convert each value to find the invalid ones.
+                    pass
+            if values is None:
+                values = []
+                for value in column:
+                    try:
+                        value = to_python(value)
+                    except Exception:
+                        value = property_instance.convert_to_python(type_system, key, value)
+                    values.append(value)
+            for element_dict, value in zip(dicts, values):
+                element_dict[key] = value
+
+    @classmethod
+    def _initialize_many(cls, elements, results):
+        """
+        Initializes a list of elements of this class, which convert their 
+        Property data a column at a time.
+
+        :param elements: Elements to initialize.
+        :type elements: list
+
+        :param results: Result object for each element.
+        :type results: list
+
+        :rtype: None
+
+        ..note:: Called by utils.initialize_element_list. Elements of classes
+                 that override _initialize() or _set_property_data() are 
+                 initialized one at a time so the overrides are called.
+
+        """
+        if cls._customizes_initialize():
+            for element, result in zip(elements, results):
+                element._initialize(result)
+            return
+        for element, result in zip(elements, results):
+            # Initializes the Vertex or Edge.
+            super(Model, element)._initialize(result)
+        cls._set_property_data_many(elements)
+        for element in elements:
+            element._reset_dirty()
+
+    @classmethod
+    def _customizes_initialize(cls):
+        """
+        Returns True if the class overrides how each element is initialized.
+
+        :rtype: bool
+
+        """
+        initialize = six.get_unbound_function(cls._initialize)
+        set_property_data = six.get_unbound_function(cls._set_property_data)
+        defaults = [six.get_unbound_function(Node._initialize),
+                    six.get_unbound_function(Relationship._initialize)]
+        return initialize not in defaults or \
+            set_property_data is not six.get_unbound_function(Model._set_property_data)
             
     def _get_property_data(self):
         """
@@ -317,6 +490,7 @@ class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
 
         type_var = self._client.config.type_var
         type_system = self._client.type_system
+        save_plan = type(self)._get_converter_plans(type_system)[1]
 
         if hasattr(self, type_var):
             # Add element_type to the database properties to be saved;
@@ -324,16 +498,134 @@ class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
             data[type_var] = object.__getattribute__(self, type_var)
 
         # Convert database Property values to their database types.
-        for key in self._properties:  # Python 3
-            property_instance = self._properties[key]
-            value = self._get_property_value(key)
-            property_instance.validate(key, value)
-            #name = property_instance.name
-            db_value = property_instance.convert_to_db(type_system, key, value)
-            data[key] = db_value
+        for entry in save_plan:
+            data[entry[0]] = self._get_db_value(entry)
 
         return data
 
+    def _get_changed_data(self):
+        """
+        Returns validated data for the properties changed since the element 
+        was loaded or saved, ready to be saved in the DB. Removed properties
+        are set to None.
+
+        :rtype: dict
+
+        .. note:: Properties are changed by setting them. Reassign mutable 
+                  values, e.g. lists, after changing them in place.
+
+        """
+        dirty = self._dirty
+        type_system = self._client.type_system
+        save_plan = type(self)._get_converter_plans(type_system)[1]
+        data = {}
+
+        for entry in save_plan:
+            # Calculated properties can depend on any attribute so check them 
+            # all; set properties are only sent if their DB value changed.
+            key, calculated = entry[0], entry[2]
+            if key not in dirty and not calculated:
+                continue
+            db_value = self._get_db_value(entry)
+            if db_value != self._data.get(key):
+                data[key] = db_value
+
+        if self.__mode__ == NORMAL:
+            # normal attributes are stored in self._data as they're set
+            for key in dirty:
+                if key not in self._properties:
+                    data[key] = self._data.get(key)
+
+        return data
+
+    def _get_db_value(self, entry):
+        """
+        Returns the validated value of a Property converted to its DB type.
+
+        :param entry: Save plan entry for the Property.
+        :type entry: tuple
+
+        :rtype: object
+
+        """
+        key, property_instance, calculated, nullable, python_type, \
+            validated, to_db = entry
+        # Notice that __getattr__ is overloaded in Element.
+        value = object.__getattribute__(self, key)
+        if callable(value):
+            value = value()
+        if validated is False:
+            property_instance.validate(key, value)
+        elif value is None:
+            if nullable is False:
+                # Logs and raises the error.
+                property_instance.validate(key, value)
+        elif isinstance(value, python_type) is False:
+            property_instance.validate(key, value)
+        return to_db(value)
+
+    def _get_saved_data(self, data):
+        """
+        Returns the element's DB data as it will be after the changed data is
+        saved, e.g. to check it before it's saved.
+
+        :param data: Changed data returned by _get_changed_data().
+        :type data: dict
+
+        :rtype: dict
+
+        """
+        saved_data = dict(self._data)
+        saved_data.update(data)
+        return saved_data
+
+    def _set_saved_data(self, data):
+        """
+        Updates the element's DB data after the changed data is saved.
+
+        :param data: Changed data returned by _get_changed_data().
+        :type data: dict
+
+        :rtype: None
+
+        """
+        saved_data = self._own_data()
+        for key in data:
+            if data[key] is None:
+                saved_data.pop(key, None)
+            else:
+                saved_data[key] = data[key]
+        self._reset_dirty()
+
+    def _expire_patched_lookups(self, base_type, index_name, data, keys):
+        """
+        Expires the cached lookups of the changed keys' old and new values,
+        which the patch reindexed. Call it before _set_saved_data().
+
+        :param base_type: Base type, either "vertex" or "edge".
+        :type base_type: str
+
+        :param index_name: Index name.
+        :type index_name: str
+
+        :param data: Changed data returned by _get_changed_data().
+        :type data: dict
+
+        :param keys: Property keys to index, or None for all of them.
+        :type keys: list
+
+        :rtype: None
+
+        """
+        if any(key not in self._properties for key in data):
+            # normal attributes are stored in self._data as they're set, so
+            # their old values aren't known
+            expire_index(self._client, base_type, index_name)
+            return
+        old_data = dict((key, self._data.get(key)) for key in data)
+        expire_indexed(self._client, base_type, index_name, old_data, keys)
+        expire_indexed(self._client, base_type, index_name, data, keys)
+
     def _get_initial_data(self):
         """
         Returns empty dict if __mode__ is set to STRICT, otherwise self._data.
@@ -380,6 +672,20 @@ class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
         keys = self.get_index_keys()
         return data, index_name, keys
 
+    def _get_create_bundle(self, _data):
+        """
+        Returns the validated bundle for creating the element from the data.
+
+        :param _data: Property data dict, or None.
+        :type _data: dict
+
+        :rtype: tuple
+
+        """
+        bundle = self.get_bundle(_data)
+        self.__check__(bundle[0])
+        return bundle
+
     def get_index_keys(self):
         """
         Returns Property keys to index in DB. Defaults to None (index all keys).
@@ -408,7 +714,8 @@ class Model(six.with_metaclass(ModelMeta, object)):  # Python 3
         """
         data = dict()
         if self.__mode__ == NORMAL:
-            data = self._data
+            # copy it so self._data still matches the DB for save()
+            data = self._data.copy()
 
         for key in self._properties: 
             # TODO: make this work for calculated values.
@@ -553,14 +860,31 @@ class Node(Model, Vertex):
         """
         Saves/updates the element's data in the database.
 
+        Only the properties changed since the element was loaded or last 
+        saved are sent and reindexed. Saving an unchanged element only checks it.
+
         :rtype: None
 
         """
-        data = self._get_property_data()
-        self.__check__(data)
         index_name = self.get_index_name(self._client.config)
         keys = self.get_index_keys()
-        self._client.update_indexed_vertex(self._id, data, index_name, keys)
+        if self.__dict__.get("_dirty") is None:
+            # not initialized from the DB, so replace all the properties
+            data = self._get_property_data()
+            self.__check__(data)
+            self._client.update_indexed_vertex(self._id, data, index_name, keys)
+            expire_element(self._client, "vertex", self._id)
+            expire_index(self._client, "vertex", index_name)
+            return
+        data = self._get_changed_data()
+        # check all the properties, but only send the changed ones
+        self.__check__(self._get_saved_data(data))
+        if not data:
+            return
+        self._client.patch_indexed_vertex(self._id, data, index_name, keys)
+        expire_element(self._client, "vertex", self._id)
+        self._expire_patched_lookups("vertex", index_name, data, keys)
+        self._set_saved_data(data)
         
     #
     # Override the _create and _update methods to cusomize behavior.
@@ -584,6 +908,8 @@ class Node(Model, Vertex):
         self.__check__(data)
         resp = self._client.create_indexed_vertex(data, index_name, keys)
         result = resp.one()
+        expire_element(self._client, "vertex", result.get_id())
+        expire_indexed(self._client, "vertex", index_name, data, keys)
         self._initialize(result)
         
     def _update(self, _id, _data, kwds):
@@ -606,6 +932,8 @@ class Node(Model, Vertex):
         self.__check__(data)
         resp = self._client.update_indexed_vertex(_id, data, index_name, keys)
         result = resp.one()
+        expire_element(self._client, "vertex", _id)
+        expire_index(self._client, "vertex", index_name)
         self._initialize(result)
         
     def _initialize(self, result):
@@ -621,9 +949,8 @@ class Node(Model, Vertex):
 
         """
         Vertex._initialize(self,result)
-        self._initialized = False
         self._set_property_data()
-        self._initialized = True
+        self._reset_dirty()
 
 
 class Relationship(Model, Edge):
@@ -731,15 +1058,31 @@ class Relationship(Model, Edge):
         """
         Saves/updates the element's data in the database.
 
+        Only the properties changed since the element was loaded or last 
+        saved are sent and reindexed. Saving an unchanged element only checks it.
+
         :rtype: None
 
         """
-        data = self._get_property_data()
-        self.__check__(data)
-
         index_name = self.get_index_name(self._client.config)
         keys = self.get_index_keys()
-        self._client.update_indexed_edge(self._id, data, index_name, keys)
+        if self.__dict__.get("_dirty") is None:
+            # not initialized from the DB, so replace all the properties
+            data = self._get_property_data()
+            self.__check__(data)
+            self._client.update_indexed_edge(self._id, data, index_name, keys)
+            expire_element(self._client, "edge", self._id)
+            expire_index(self._client, "edge", index_name)
+            return
+        data = self._get_changed_data()
+        # check all the properties, but only send the changed ones
+        self.__check__(self._get_saved_data(data))
+        if not data:
+            return
+        self._client.patch_indexed_edge(self._id, data, index_name, keys)
+        expire_element(self._client, "edge", self._id)
+        self._expire_patched_lookups("edge", index_name, data, keys)
+        self._set_saved_data(data)
 
     #
     # Override the _create and _update methods to customize behavior.
@@ -764,6 +1107,8 @@ class Relationship(Model, Edge):
         self.__check__(data)
         resp = self._client.create_indexed_edge(outV, label, inV, data, index_name, keys)
         result = resp.one()
+        expire_element(self._client, "edge", result.get_id())
+        _expire_created_edges(self._client, index_name, label, [data], keys)
         self._initialize(result)
         
     def _update(self, _id, _data, kwds):
@@ -786,6 +1131,8 @@ class Relationship(Model, Edge):
         self.__check__(data)
         resp = self._client.update_indexed_edge(_id, data, index_name, keys)
         result = resp.one()
+        expire_element(self._client, "edge", _id)
+        expire_index(self._client, "edge", index_name)
         self._initialize(result)
 
     def _initialize(self,result):
@@ -801,9 +1148,8 @@ class Relationship(Model, Edge):
 
         """
         Edge._initialize(self,result)
-        self._initialized = False
         self._set_property_data()
-        self._initialized = True
+        self._reset_dirty()
 
 
 class NodeProxy(VertexProxy):
@@ -824,6 +1170,35 @@ class NodeProxy(VertexProxy):
         node = self.element_class(self.client)
         node._create(_data, kwds)
         return node
+
+    def create_many(self, data_list):
+        """
+        Adds the vertices to the database and returns them.
+
+        Each vertex is validated like create(). The vertices are sent in chunks
+        of Config.batch_size, and each chunk is created by one Gremlin script 
+        in one transaction.
+
+        :param data_list: Property data dicts.
+        :type data_list: iterable
+
+        :rtype: list
+
+        """
+        nodes = []
+        batch_size = getattr(self.client.config, "batch_size", None)
+        for chunk in get_chunks(data_list, batch_size):
+            chunk_nodes = [self.element_class(self.client) for _data in chunk]
+            bundles = [node._get_create_bundle(_data) 
+                       for node, _data in zip(chunk_nodes, chunk)]
+            chunk_data = [data for data, index_name, keys in bundles]
+            index_name, keys = bundles[0][1:]
+            resp = self.client.create_indexed_vertices(chunk_data, index_name, keys)
+            _initialize_created(self.client, chunk_nodes, resp, "vertex")
+            for data in chunk_data:
+                expire_indexed(self.client, "vertex", index_name, data, keys)
+            nodes.extend(chunk_nodes)
+        return nodes
         
     def update(self, _id, _data=None, **kwds):
         """
@@ -892,6 +1267,39 @@ class RelationshipProxy(EdgeProxy):
         relationship._create(outV, inV, _data, kwds)
         return relationship
 
+    def create_many_edges(self, triples):
+        """
+        Creates the edges in the database and returns them.
+
+        Each edge is validated like create(). The edges are sent in chunks of 
+        Config.batch_size, and each chunk is created by one Gremlin script in 
+        one transaction.
+
+        :param triples: (outV, inV, data) tuples; data can be None.
+        :type triples: iterable
+
+        :rtype: list
+
+        """
+        relationships = []
+        config = self.client.config
+        label = self.element_class.get_label(config)
+        batch_size = getattr(config, "batch_size", None)
+        for chunk in get_chunks(triples, batch_size):
+            chunk_relationships = [self.element_class(self.client) for triple in chunk]
+            chunk_edges = []
+            chunk_data = []
+            for relationship, (outV, inV, _data) in zip(chunk_relationships, chunk):
+                outV, inV = coerce_vertices(outV, inV)
+                data, index_name, keys = relationship._get_create_bundle(_data)
+                chunk_edges.append((outV, inV, data))
+                chunk_data.append(data)
+            resp = self.client.create_indexed_edges(label, chunk_edges, index_name, keys)
+            _initialize_created(self.client, chunk_relationships, resp, "edge")
+            _expire_created_edges(self.client, index_name, label, chunk_data, keys)
+            relationships.extend(chunk_relationships)
+        return relationships
+
     def update(self, _id, _data=None, **kwds):
         """ 
         Updates an edge in the database and returns it. 
@@ -936,3 +1344,22 @@ class RelationshipProxy(EdgeProxy):
         """
         return self.element_class._properties.keys()
         
+
+
+def _initialize_created(client, elements, resp, base_type):
+    # Initializes the elements created by a bulk create with the results, 
+    # which are returned in the same order.
+    results = list(resp.results)
+    if len(results) != len(elements):
+        log.error("Created %s %ss, but %s were returned.", 
+                  len(elements), base_type, len(results))
+        raise ValueError
+    for element, result in zip(elements, results):
+        expire_element(client, base_type, result.get_id())
+        element._initialize(result)
+
+def _expire_created_edges(client, index_name, label, data_list, keys):
+    # Created edges are indexed by their label too.
+    for data in data_list:
+        expire_indexed(client, "edge", index_name, data, keys)
+    expire_lookup(client, "edge", index_name, client.config.label_var, label)
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Async client and Graph for Neo4j Server (Python 3.5+, requires aiohttp).
+
+"""
+from bulbs.aio import AsyncRequest, AsyncIndexMixin, AsyncGraph as BaseAsyncGraph, \
+    execute_script
+from bulbs.utils import build_path
+
+from .client import Neo4jClient, Neo4jResponse, Neo4jResult, \
+    index_path, vertex_path, edge_path, cypher_path
+from .index import VertexIndexProxy, EdgeIndexProxy, ExactIndex
+
+
+class AsyncNeo4jRequest(AsyncRequest):
+    """Makes async HTTP requests to Neo4j Server and returns a Neo4jResponse."""
+
+    response_class = Neo4jResponse
+
+
+class AsyncNeo4jClient(Neo4jClient):
+    """
+    Low-level client whose request methods are coroutines.
+
+    Only the methods that post-process the Response are overridden here; the
+    rest of the Neo4jClient methods return the AsyncRequest coroutine as is.
+
+    :param config: Optional Config object. Defaults to default Config.
+    :type config: bulbs.config.Config
+
+    Example:
+
+    >>> from bulbs.neo4jserver.aio import AsyncNeo4jClient
+    >>> client = AsyncNeo4jClient()
+    >>> script = client.scripts.get("get_vertices")
+    >>> response = await client.gremlin(script, params=None)
+    >>> result = response.results.next()
+
+    """
+    #: Request class for the Client.
+    request_class = AsyncNeo4jRequest
+
+    def gremlin(self, script, params=None, stream=False, read_only=False):
+        """
+        Executes a Gremlin script and returns the Response.
+
+        :param script: Gremlin script to execute.
+        :type script: str
+
+        :param params: Param bindings for the script.
+        :type params: dict
+
+        :rtype: coroutine
+
+        """
+        send = lambda script: self._send_gremlin(script, params, stream, read_only)
+        return execute_script(self.scripts, send, script)
+
+    async def cypher(self, query, params=None):
+        """
+        Executes a Cypher query and returns the Response.
+
+        :param query: Cypher query to execute.
+        :type query: str
+
+        :param params: Param bindings for the query.
+        :type params: dict
+
+        :rtype: Neo4jResponse
+
+        """
+        path = cypher_path
+        params = dict(query=query, params=params)
+        resp = await self.request.post(path, params)
+        resp.total_size = len(resp.results.data)
+        resp.results = (Neo4jResult(result[0], self.config) for result in resp.results.data)
+        return resp
+
+    async def create_vertex_index(self, index_name, *args, **kwds):
+        """
+        Creates a vertex index with the specified params.
+
+        :param index_name: Name of the index to create.
+        :type index_name: str
+
+        :rtype: Neo4jResponse
+
+        """
+        default_config = {'type': "exact", 'provider': "lucene"}
+        index_config = kwds.pop("index_config", default_config)
+        path = build_path(index_path, vertex_path)
+        params = dict(name=index_name, config=index_config)
+        resp = await self.request.post(path, params)
+        resp._set_index_name(index_name)
+        return resp
+
+    async def get_vertex_index(self, index_name):
+        """
+        Returns the vertex index with the index_name.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :rtype: Neo4jResponse
+
+        """
+        resp = await self.get_vertex_indices()
+        resp.results = self._get_index_results(index_name, resp)
+        if resp.results:
+            resp._set_index_name(index_name)
+        return resp
+
+    async def create_edge_index(self, index_name, *args, **kwds):
+        """
+        Creates an edge index with the specified params.
+
+        :param index_name: Name of the index to create.
+        :type index_name: str
+
+        :rtype: Neo4jResponse
+
+        """
+        default_config = {'type': "exact", 'provider': "lucene"}
+        index_config = kwds.pop("index_config", default_config)
+        path = build_path(index_path, edge_path)
+        params = dict(name=index_name, config=index_config)
+        resp = await self.request.post(path, params)
+        resp._set_index_name(index_name)
+        return resp
+
+    async def get_edge_index(self, index_name):
+        """
+        Returns the edge index with the index_name.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :rtype: Neo4jResponse
+
+        """
+        resp = await self.get_edge_indices()
+        resp.results = self._get_index_results(index_name, resp)
+        if resp.results:
+            resp._set_index_name(index_name)
+        return resp
+
+
+class AsyncVertexIndexProxy(VertexIndexProxy):
+    """Manage vertex indices on Neo4j Server from an asyncio event loop."""
+
+    async def create(self, index_name):
+        config = self._build_index_config(self.index_class)
+        resp = await self.client.create_vertex_index(index_name, index_config=config)
+        return self._add_index(index_name, resp)
+
+    async def get(self, index_name):
+        resp = await self.client.get_vertex_index(index_name)
+        if resp.results:
+            return self._add_index(index_name, resp)
+
+    async def get_or_create(self, index_name):
+        # Neo4j's create index endpoint returns the index if it already exists
+        return await self.create(index_name)
+
+    def _add_index(self, index_name, resp):
+        index = self.index_class(self.client, resp.results)
+        self.client.registry.add_index(index_name, index)
+        return index
+
+
+class AsyncEdgeIndexProxy(EdgeIndexProxy):
+    """Manage edge indices on Neo4j Server from an asyncio event loop."""
+
+    async def create(self, index_name):
+        config = self._build_index_config(self.index_class)
+        resp = await self.client.create_edge_index(index_name, index_config=config)
+        return self._add_index(index_name, resp)
+
+    async def get(self, index_name):
+        resp = await self.client.get_edge_index(index_name)
+        if resp.results:
+            return self._add_index(index_name, resp)
+
+    async def get_or_create(self, index_name):
+        # Neo4j's create index endpoint returns the index if it already exists
+        return await self.create(index_name)
+
+    def _add_index(self, index_name, resp):
+        index = self.index_class(self.client, resp.results)
+        self.client.registry.add_index(index_name, index)
+        return index
+
+
+class AsyncExactIndex(AsyncIndexMixin, ExactIndex):
+    """Neo4j's Lucene exact index with coroutine lookups."""
+
+    @classmethod
+    def get_proxy_class(cls, base_type):
+        """
+        Returns the async IndexProxy class.
+
+        :param base_type: Index base type, either vertex or edge.
+        :type base_type: str
+
+        :rtype: class
+
+        """
+        class_map = dict(vertex=AsyncVertexIndexProxy, edge=AsyncEdgeIndexProxy)
+        return class_map[base_type]
+
+
+class AsyncGraph(BaseAsyncGraph):
+    """
+    The asyncio interface to Neo4j Server.
+
+    :param config: Optional. Defaults to the default config.
+    :type config: bulbs.config.Config
+
+    Example:
+
+    >>> from bulbs.neo4jserver.aio import AsyncGraph
+    >>> async with AsyncGraph() as g:
+    ...     james = await g.vertices.create(name="James")
+    ...     julie = await g.vertices.create(name="Julie")
+    ...     await g.edges.create(james, "knows", julie)
+
+    """
+    client_class = AsyncNeo4jClient
+    default_index = AsyncExactIndex
@@ -1,17 +1,92 @@
-from .client import Neo4jRequest, Neo4jClient
-
+# -*- coding: utf-8 -*-
 #
-# Batch isn't fully baked yet
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
 #
+"""
+Batch client for Neo4j Server's REST batch endpoint.
+
+Requests made through the batch client are queued instead of sent, and each
+queued request returns a placeholder, such as "{1}", that can be used as an
+element ID in subsequent requests in the same batch. send() sends the queued
+requests in chunks of Config.batch_size operations.
+
+"""
+import re
+
+import six
+import httplib2
+
+from bulbs.rest import RESPONSE_HANDLERS, POST
+from bulbs.utils import initialize_element, get_logger
+
+from .client import Neo4jRequest, Neo4jResponse, Neo4jClient, vertex_path
+
+
+log = get_logger(__name__)
+
+batch_path = "batch"
+
+placeholder_pattern = re.compile(r"\{(\d+)\}")
+
+
+class Neo4jBatchResponse(Neo4jResponse):
+    """
+    Container class for the response to a single operation in a batch.
+
+    :param job: The job result returned by the batch endpoint.
+    :type job: dict
+
+    :param config: Config object.
+    :type config: bulbs.config.Config
+
+    :ivar placeholder: Placeholder returned when the operation was queued.
+    :ivar location: URI of the element created by the operation, or None.
+
+    """
+    def __init__(self, job, config):
+        self.placeholder = "{%d}" % job['id']
+        self.location = job.get('location')
+        super(Neo4jBatchResponse, self).__init__(job, config)
+
+    def handle_response(self, job):
+        # Neo4j rolls back the entire batch and returns an error if any
+        # operation fails, but check the status of each job anyway.
+        status = job.get('status', 200)
+        response_handler = RESPONSE_HANDLERS.get(status)
+        if response_handler is None:
+            raise SystemError("Unexpected status %s for batch job %s: %s" % 
+                              (status, job.get('id'), job.get('from')))
+        response_handler(job)
+
+    def get_headers(self, job):
+        info = dict(status=str(job.get('status', 200)))
+        if self.location is not None:
+            info['location'] = self.location
+        return httplib2.Response(info)
+
+    def get_content(self, job):
+        return job.get('body')
+
 
 class Neo4jBatchRequest(Neo4jRequest):
-    """Makes HTTP requests to Neo4j Server and returns a Neo4jResponse.""" 
-    
+    """
+    Queues HTTP requests and sends them to Neo4j Server's batch endpoint.
+
+    :ivar messages: List of queued operations.
+    :ivar message_id: ID of the last queued operation.
+    :ivar locations: Dict mapping sent operation IDs to element URIs.
+    :ivar responses: Responses of the chunks sent since the queue was last
+        emptied, which are kept if a later chunk fails.
+
+    """
     def _initialize(self):
         self.messages = []
         self.message_id = 0
+        self.locations = dict()
+        self.responses = []
 
-    def request(self, method, path, params):
+    def request(self, method, path, params, read_only=None):
         """
         Adds request to the messages list and returns a placeholder.
 
@@ -24,20 +99,23 @@ class Neo4jBatchRequest(Neo4jRequest):
         :param params: Optional URI parameters for the resource.
         :type params: dict
 
+        :param read_only: Ignored; batches are always sent to the master.
+        :type read_only: bool
+
         :rtype: str
 
         """
-                
         return self.add_message(method, path, params)
 
-        # return self 
-        # would allow you to do self.request.post(path, params).send()
-        # that won't work unless you always want to go throught the batch interface
-
+    def stream(self, method, path, params, read_only=None):
+        # results are returned by send() so there's nothing to stream
+        return self.add_message(method, path, params)
 
     def add_message(self, method, path, params):
         message_id = self.next_id()
-        message = dict(method=method, to=path, body=params, id=message_id)
+        message = dict(method=method, to=path, id=message_id)
+        if params is not None:
+            message['body'] = params
         self.messages.append(message)
         return self.placeholder(message_id)
 
@@ -50,20 +128,34 @@ class Neo4jBatchRequest(Neo4jRequest):
 
     def send(self):
         """
-        Convenience method that sends request messages to the client.
+        Sends the queued operations and returns a list of responses.
 
-        :param message: Tuple containing: (HTTP method, path, params)
-        :type path: tuple
+        Operations are sent in chunks of Config.batch_size; each chunk is
+        executed by the server in its own transaction. Placeholders that
+        refer to an operation in a previous chunk are replaced with the URI
+        of the element that operation created.
 
-        :param params: Optional URI params for the resource.
-        :type params: dict
+        If a chunk fails, it and the operations after it stay queued, and the
+        responses of the chunks that were executed are kept in responses 
+        and returned by the send() that empties the queue.
 
-        :rtype: Response
+        :rtype: list of Neo4jBatchResponse objects, in the order queued
 
         """
-        path = "batch"
-        params = self.messages
-        return Neo4jRequest.post(self, path, params)
+        batch_size = self.config.batch_size or len(self.messages) or 1
+        while self.messages:
+            chunk = self.messages[:batch_size]
+            chunk = [self._resolve_message(message) for message in chunk]
+            # go around the queuing request() method
+            resp = Neo4jRequest.request(self, POST, batch_path, chunk)
+            # the chunk was executed, so take it off the queue
+            del self.messages[:len(chunk)]
+            for job in resp.content:
+                batch_resp = Neo4jBatchResponse(job, self.config)
+                self.locations[job['id']] = batch_resp.location
+                self.responses.append(batch_resp)
+        responses, self.responses = self.responses, []
+        return responses
 
     def get_messages(self):
         return self.messages
@@ -71,33 +163,370 @@ class Neo4jBatchRequest(Neo4jRequest):
     def clear(self):
         self._initialize()
 
+    def _resolve_message(self, message):
+        # Only the structural fields can contain placeholders;
+        # property data is sent as is.
+        message = dict(message)
+        message['to'] = self._resolve(message['to'])
+        body = message.get('body')
+        if isinstance(body, dict) and ('uri' in body or 'to' in body):
+            body = dict(body)
+            for key in ('uri', 'to'):
+                if key in body:
+                    body[key] = self._resolve(body[key])
+            message['body'] = body
+        return message
+
+    def _resolve(self, value):
+        if not isinstance(value, six.string_types):
+            return value
+        return placeholder_pattern.sub(self._get_location, value)
+
+    def _get_location(self, match):
+        message_id = int(match.group(1))
+        if message_id not in self.locations:
+            # it's in the current chunk so let the server resolve it
+            return match.group()
+        location = self.locations[message_id]
+        if location is None:
+            raise ValueError("Operation %s didn't create an element" % match.group())
+        return location
+
 
 class Neo4jBatchClient(Neo4jClient):
+    """
+    Low-level client that queues requests and sends them in batches.
 
-    request_class = Neo4jBatchRequest
+    The client methods return a placeholder instead of a Response. The
+    placeholders can be used in place of element IDs in later requests, and
+    after send() they can be used to get the Response and Element for the
+    operation. Vertices and edges are indexed with REST requests instead
+    of Gremlin scripts so the entire batch is a single unit of work.
+
+    :param config: Optional Config object. Defaults to default Config.
+    :type config: bulbs.config.Config
+
+    :ivar responses: Dict mapping placeholders to the Response of the last send,
+        including the chunks that were executed before a chunk failed.
 
-    # Batch isn't fully baked yet
+    Example:
 
-    # Batch try (old -- from Neo4jClient)...
-    #def create_indexed_vertex(self,data,index_name,keys=None):
-    #    """Creates a vertex, indexes it, and returns the Response."""
-    #    batch = Neo4jBatch(self.client)
-    #    placeholder = batch.add(self.message.create_vertex(data))
-    #    for key in keys:
-    #        value = data.get(key)
-    #        if value is None: continue
-    #        batch.add(self.message.put_vertex(index_name,key,value,placeholder))
-    #    resp = batch.send()
-    #    #for result in resp.results:
+    >>> from bulbs.neo4jserver.batch import Neo4jBatchClient
+    >>> batch = Neo4jBatchClient()
+    >>> james = batch.create_vertex(dict(name="James"))
+    >>> julie = batch.create_vertex(dict(name="Julie"))
+    >>> knows = batch.create_edge(james, "knows", julie)
+    >>> responses = batch.send()
+    >>> james = batch.get_element(james)
 
+    .. note:: Vertices with edges can't be deleted in a batch; delete
+              their edges first.
+
+    """
+    request_class = Neo4jBatchRequest
+
+    def __init__(self, config=None):
+        super(Neo4jBatchClient, self).__init__(config)
+        self.responses = dict()
 
     def send(self):
-        return self.request.send()
+        """
+        Sends the queued operations and returns a list of responses.
+
+        :rtype: list of Neo4jBatchResponse objects, in the order queued
+
+        """
+        try:
+            responses = self.request.send()
+        except Exception:
+            # the chunks sent before the failure were executed
+            self._set_responses(self.request.responses)
+            raise
+        self._set_responses(responses)
+        return responses
+
+    def _set_responses(self, responses):
+        self.responses = dict((resp.placeholder, resp) for resp in responses)
+
+    def gremlin(self, script, params=None, stream=False, read_only=False):
+        """
+        Queues a Gremlin script and returns a placeholder.
+
+        Scripts aren't sent until send(), so calls to registered methods are
+        queued with the method's definition, and the method isn't marked as 
+        registered with the server.
+
+        :param script: Gremlin script to execute.
+        :type script: str
+
+        :param params: Params to bind to the variables in the script.
+        :type params: dict
+
+        :param stream: Ignored; results are returned by send().
+        :type stream: bool
+
+        :param read_only: Ignored; batches are always sent to the master.
+        :type read_only: bool
+
+        :rtype: str
+
+        """
+        script = self.scripts.get_definition(script)
+        return self._send_gremlin(script, params, stream, read_only)
+
+    def get_response(self, placeholder):
+        """
+        Returns the Response for a sent operation.
+
+        :param placeholder: Placeholder returned when the operation was queued.
+        :type placeholder: str
+
+        :rtype: Neo4jBatchResponse
+
+        """
+        return self.responses[placeholder]
+
+    def get_element(self, placeholder):
+        """
+        Returns the initialized Element for a sent operation or None.
+
+        :param placeholder: Placeholder returned when the operation was queued.
+        :type placeholder: str
+
+        :rtype: Vertex, Edge, or None
+
+        """
+        resp = self.get_response(placeholder)
+        if resp.total_size > 0:
+            return initialize_element(self, resp.results)
 
     def get_messages(self):
         return self.request.get_messages()
 
     def clear(self):
         self.request.clear()
+        self.responses = dict()
+
+    # Vertices
+
+    def delete_vertex(self, _id):
+        """
+        Queues a request to delete the vertex and returns the placeholder.
+
+        :param _id: Vertex ID or placeholder.
+        :type _id: int or str
+
+        :rtype: str
+
+        """
+        path = self._build_vertex_path(_id)
+        params = None
+        return self.request.delete(path, params)
+
+    def create_indexed_vertex(self, data, index_name, keys=None):
+        """
+        Queues requests to create and index a vertex and returns the placeholder.
+
+        :param data: Property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: str
+
+        """
+        data = self._remove_null_values(data)
+        placeholder = self.request.post(vertex_path, data)
+        for key, value in self._get_index_items(data, keys):
+            self.put_vertex(index_name, key, value, placeholder)
+        return placeholder
+
+    def update_indexed_vertex(self, _id, data, index_name, keys=None):
+        """
+        Queues requests to update and reindex a vertex.
+
+        :param _id: Vertex ID or placeholder.
+        :type _id: int or str
+
+        :param data: Property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: str
+
+        """
+        data = self._remove_null_values(data)
+        self._remove_from_index(self.remove_vertex, index_name, _id)
+        path = self._build_vertex_path(_id, "properties")
+        placeholder = self.request.put(path, data)
+        for key, value in self._get_index_items(data, keys):
+            self.put_vertex(index_name, key, value, _id)
+        return placeholder
+
+    def patch_indexed_vertex(self, _id, data, index_name, keys=None):
+        """
+        Queues requests to update and reindex the changed properties of a 
+        vertex.
+
+        :param _id: Vertex ID or placeholder.
+        :type _id: int or str
+
+        :param data: Changed property data. Properties set to None are removed.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: str
+
+        """
+        return self._patch_indexed_element(self._build_vertex_path, self.remove_vertex,
+                                           self.put_vertex, _id, data, index_name, keys)
+
+    # Edges
+
+    def create_indexed_edge(self, outV, label, inV, data, index_name, keys=None):
+        """
+        Queues requests to create and index an edge and returns the placeholder.
+
+        :param outV: Outgoing vertex ID or placeholder.
+        :type outV: int or str
+
+        :param label: Edge label.
+        :type label: str
+
+        :param inV: Incoming vertex ID or placeholder.
+        :type inV: int or str
+
+        :param data: Property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: str
+
+        """
+        data = self._remove_null_values(data or {})
+        path = self._build_vertex_path(outV, "relationships")
+        params = {'to': self._build_vertex_uri(inV), 'type': label, 'data': data}
+        placeholder = self.request.post(path, params)
+        for key, value in self._get_index_items(data, keys):
+            self.put_edge(index_name, key, value, placeholder)
+        self.put_edge(index_name, self.config.label_var, label, placeholder)
+        return placeholder
+
+    def update_indexed_edge(self, _id, data, index_name, keys=None):
+        """
+        Queues requests to update and reindex an edge.
+
+        :param _id: Edge ID or placeholder.
+        :type _id: int or str
+
+        :param data: Property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: str
+
+        """
+        data = self._remove_null_values(data)
+        self._remove_from_index(self.remove_edge, index_name, _id)
+        path = self._build_edge_path(_id, "properties")
+        placeholder = self.request.put(path, data)
+        for key, value in self._get_index_items(data, keys):
+            self.put_edge(index_name, key, value, _id)
+        return placeholder
+
+    def patch_indexed_edge(self, _id, data, index_name, keys=None):
+        """
+        Queues requests to update and reindex the changed properties of an 
+        edge.
+
+        :param _id: Edge ID or placeholder.
+        :type _id: int or str
+
+        :param data: Changed property data. Properties set to None are removed.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: str
+
+        """
+        return self._patch_indexed_element(self._build_edge_path, self.remove_edge,
+                                           self.put_edge, _id, data, index_name, keys)
+
+    # Index Container
+
+    def remove_vertex(self, index_name, _id, key=None, value=None):
+        self._check_not_placeholder(_id)
+        return super(Neo4jBatchClient, self).remove_vertex(index_name, _id, key, value)
+
+    def remove_edge(self, index_name, _id, key=None, value=None):
+        self._check_not_placeholder(_id)
+        return super(Neo4jBatchClient, self).remove_edge(index_name, _id, key, value)
+
+    def _remove_from_index(self, remove, index_name, _id, key=None):
+        # elements created in this batch aren't in the index yet
+        if self._placeholder(_id) is None:
+            remove(index_name, _id, key)
+
+    def _patch_indexed_element(self, build_path, remove, put, _id, data, 
+                               index_name, keys):
+        # one request per changed property instead of replacing them all
+        placeholder = None
+        for key in self._get_index_keys(data, keys):
+            self._remove_from_index(remove, index_name, _id, key)
+        for key in data:
+            path = build_path(_id, "properties", key)
+            if data[key] is None:
+                placeholder = self.request.delete(path, None)
+            else:
+                placeholder = self.request.put(path, data[key])
+        for key, value in self._get_index_items(self._remove_null_values(data), keys):
+            put(index_name, key, value, _id)
+        return placeholder
+
+    def _check_not_placeholder(self, _id):
+        # Neo4j replaces placeholders with the full URI, which isn't valid in
+        # the middle of an index path
+        if self._placeholder(_id):
+            raise ValueError("Can't remove a placeholder from an index: %s" % _id)
+
+    def _get_index_keys(self, data, keys):
+        return [key for key in data if keys is None or key in keys]
 
+    def _get_index_items(self, data, keys):
+        # index values as strings, like the Gremlin scripts do
+        for key in self._get_index_keys(data, keys):
+            yield key, self._to_index_value(data[key])
 
+    def _to_index_value(self, value):
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        return six.text_type(value)
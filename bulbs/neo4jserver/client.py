@@ -16,13 +16,12 @@ from bulbs.utils import get_logger
 # specific to this client
 from bulbs.json import JSONTypeSystem
 from bulbs.base import Client, Response, Result
-from bulbs.rest import Request, RESPONSE_HANDLERS, server_error
-from bulbs.utils import json, build_path, get_file_path, urlsplit
+from bulbs.codec import get_codec
+from bulbs.rest import Request, RESPONSE_HANDLERS, POST, server_error
+from bulbs.stream import StreamResponse
+from bulbs.utils import build_path, get_file_path, urlsplit
 from bulbs.groovy import GroovyScripts
 
-# TODO: Clean up and generalize Yaml
-from .cypher import Cypher, Yaml
-
 
 # The default URI
 NEO4J_URI = "http://localhost:7474/db/data/"
@@ -38,6 +37,11 @@ index_path = "index"
 gremlin_path = "ext/GremlinPlugin/graphdb/execute_script"
 cypher_path = "cypher"
 
+# The Gremlin plugin returns some exceptions as a JSON string with a 200 status.
+# The exception name is at the start of the body, so only the start is checked.
+gremlin_error_pattern = re.compile(b"\"java.(.*).Exception:")
+gremlin_error_prefix_size = 512
+
 
 class Neo4jResult(Result):
     """
@@ -53,16 +57,16 @@ class Neo4jResult(Result):
     :ivar data: The data in the result.
 
     """
-    def __init__(self, result, config):
-        self.config = config
+    __slots__ = ['_id', '_type']
 
-        # The raw result.
-        self.raw = result
+    type_map = dict(node="vertex",relationship="edge")
 
-        # The data in the result.
-        self.data = self._get_data(result)
+    def __init__(self, result, config):
+        super(Neo4jResult, self).__init__(result, config)
 
-        self.type_map = dict(node="vertex",relationship="edge")
+        # Parsed out of the URI on first access.
+        self._id = None
+        self._type = None
 
     def get_id(self):
         """
@@ -71,8 +75,10 @@ class Neo4jResult(Result):
         :rtype: int
 
         """
-        uri = self.raw.get('self')
-        return self._parse_id(uri)
+        if self._id is None:
+            uri = self.raw.get('self')
+            self._id = self._parse_id(uri)
+        return self._id
        
     def get_type(self):
         """
@@ -81,9 +87,11 @@ class Neo4jResult(Result):
         :rtype: str
 
         """
-        uri = self.get_uri()
-        neo4j_type = self._parse_type(uri)
-        return self.type_map[neo4j_type]
+        if self._type is None:
+            uri = self.get_uri()
+            neo4j_type = self._parse_type(uri)
+            self._type = self.type_map[neo4j_type]
+        return self._type
         
     def get_data(self):
         """
@@ -241,7 +249,7 @@ class Neo4jResponse(Response):
         # Temporary hack to catch Gremlin Plugin exceptions that return 200 status
         # See https://github.com/neo4j/community/issues/343
         # Example: '"java.lang.IllegalArgumentException: Unknown property type on..."'
-        if re.search(b"^\"java.(.*).Exception:", content):
+        if gremlin_error_pattern.match(content, 0, gremlin_error_prefix_size):
             # raise error...
             server_error(response)
         
@@ -279,7 +287,8 @@ class Neo4jResponse(Response):
 
         # Neo4jServer returns empty content on update
         if content:
-            content = json.loads(content.decode('utf-8'))
+            codec = get_codec(getattr(self.config, "json_codec", "auto"))
+            content = codec.loads(content)
             return content
 
     def get_results(self):
@@ -313,11 +322,23 @@ class Neo4jResponse(Response):
         self.results.raw['name'] = index_name
         
 
+class Neo4jStreamResponse(StreamResponse, Neo4jResponse):
+    """
+    Neo4jResponse whose results are decoded as the HTTP body is read.
+
+    Neo4j Server returns lists of results as a top-level JSON array.
+
+    """
+    stream_path = None
+
+
 class Neo4jRequest(Request):
     """Makes HTTP requests to Neo4j Server and returns a Neo4jResponse.""" 
     
     response_class = Neo4jResponse
 
+    stream_response_class = Neo4jStreamResponse
+
 
 class Neo4jClient(Client):
     """
@@ -366,7 +387,7 @@ class Neo4jClient(Client):
 
     # Gremlin
 
-    def gremlin(self, script, params=None): 
+    def gremlin(self, script, params=None, stream=False, read_only=False): 
         """
         Executes a Gremlin script and returns the Response.
 
@@ -376,12 +397,25 @@ class Neo4jClient(Client):
         :param params: Param bindings for the script.
         :type params: dict
 
+        :param stream: If True, decode the results as they're read. Defaults to False.
+        :type stream: bool
+
+        :param read_only: True if the script doesn't modify the database so it 
+            can be sent to a read replica. Defaults to False.
+        :type read_only: bool
+
         :rtype: Neo4jResponse
 
         """
+        send = lambda script: self._send_gremlin(script, params, stream, read_only)
+        return self.scripts.execute(send, script)
+
+    def _send_gremlin(self, script, params, stream, read_only):
         path = gremlin_path
         params = dict(script=script, params=params)
-        return self.request.post(path, params)
+        if stream:
+            return self.request.stream(POST, path, params, read_only)
+        return self.request.post(path, params, read_only)
 
     # Cypher
 
@@ -440,16 +474,34 @@ class Neo4jClient(Client):
         params = None
         return self.request.get(path, params)
         
-    def get_all_vertices(self):
+    def get_all_vertices(self, stream=False):
         """
         Returns a Response containing all the vertices in the Graph.
 
+        :param stream: If True, decode the results as they're read. Defaults to False.
+        :type stream: bool
+
         :rtype: Neo4jResponse
 
         """
         script = self.scripts.get("get_vertices")
         params = None
-        return self.gremlin(script, params)
+        return self.gremlin(script, params, stream=stream, read_only=True)
+
+    def multi_get_vertices(self, id_list):
+        """
+        Gets the vertices with the IDs and returns the Response. 
+        The vertices that don't exist aren't returned.
+
+        :param id_list: Vertex IDs.
+        :type id_list: list
+
+        :rtype: Neo4jResponse
+
+        """
+        script = self.scripts.get("get_vertices_by_id")
+        params = dict(id_list=list(id_list))
+        return self.gremlin(script, params, read_only=True)
 
     def update_vertex(self, _id, data, keys=None):
         """
@@ -511,7 +563,7 @@ class Neo4jClient(Client):
             return self.create_indexed_edge(outV,label,inV,data,index_name,keys=keys)
         data = self._remove_null_values(data)
         inV_uri = self._build_vertex_uri(inV)
-        path = build_path(vertex_path, outV, "relationships")
+        path = self._build_vertex_path(outV, "relationships")
         params = {'to':inV_uri, 'type':label, 'data':data}
         return self.request.post(path, params)
 
@@ -529,16 +581,34 @@ class Neo4jClient(Client):
         params = None
         return self.request.get(path, params)
         
-    def get_all_edges(self):
+    def get_all_edges(self, stream=False):
         """
         Returns a Response containing all the edges in the Graph.
 
+        :param stream: If True, decode the results as they're read. Defaults to False.
+        :type stream: bool
+
         :rtype: Neo4jResponse
 
         """
         script = self.scripts.get("get_edges")
         params = None
-        return self.gremlin(script, params)
+        return self.gremlin(script, params, stream=stream, read_only=True)
+
+    def multi_get_edges(self, id_list):
+        """
+        Gets the edges with the IDs and returns the Response. 
+        The edges that don't exist aren't returned.
+
+        :param id_list: Edge IDs.
+        :type id_list: list
+
+        :rtype: Neo4jResponse
+
+        """
+        script = self.scripts.get("get_edges_by_id")
+        params = dict(id_list=list(id_list))
+        return self.gremlin(script, params, read_only=True)
 
     def update_edge(self, _id, data, keys=None):
         """
@@ -556,7 +626,7 @@ class Neo4jClient(Client):
         if keys or self.config.autoindex is True:
             index_name = self.config.edge_index
             return self.update_indexed_edge(_id,data,index_name,keys=keys)
-        path = build_path(edge_path,_id,"properties")
+        path = self._build_edge_path(_id,"properties")
         params = self._remove_null_values(data)
         return self.request.put(path, params)
 
@@ -570,7 +640,7 @@ class Neo4jClient(Client):
         :rtype: Neo4jResponse
 
         """
-        path = build_path(edge_path,_id)
+        path = self._build_edge_path(_id)
         params = None
         return self.request.delete(path, params)
 
@@ -591,7 +661,7 @@ class Neo4jClient(Client):
         """
         script = self.scripts.get('outE')
         params = dict(_id=_id,label=label,start=start,limit=limit)
-        return self.gremlin(script,params)
+        return self.gremlin(script, params, read_only=True)
 
     def inE(self, _id, label=None, start=None, limit=None):
         """
@@ -608,7 +678,7 @@ class Neo4jClient(Client):
         """
         script = self.scripts.get('inE')
         params = dict(_id=_id,label=label,start=start,limit=limit)
-        return self.gremlin(script,params)
+        return self.gremlin(script, params, read_only=True)
 
     def bothE(self, _id, label=None, start=None, limit=None):
         """
@@ -625,7 +695,7 @@ class Neo4jClient(Client):
         """
         script = self.scripts.get('bothE')
         params = dict(_id=_id,label=label,start=start,limit=limit)
-        return self.gremlin(script,params)
+        return self.gremlin(script, params, read_only=True)
 
     def outV(self, _id, label=None, start=None, limit=None):
         """
@@ -642,7 +712,7 @@ class Neo4jClient(Client):
         """
         script = self.scripts.get('outV')
         params = dict(_id=_id,label=label,start=start,limit=limit)
-        return self.gremlin(script,params)
+        return self.gremlin(script, params, read_only=True)
         
     def inV(self, _id, label=None, start=None, limit=None):
         """
@@ -659,7 +729,7 @@ class Neo4jClient(Client):
         """
         script = self.scripts.get('inV')
         params = dict(_id=_id,label=label,start=start,limit=limit)
-        return self.gremlin(script,params)
+        return self.gremlin(script, params, read_only=True)
         
     def bothV(self, _id, label=None, start=None, limit=None):
         """
@@ -676,7 +746,7 @@ class Neo4jClient(Client):
         """
         script = self.scripts.get('bothV')
         params = dict(_id=_id,label=label,start=start,limit=limit)
-        return self.gremlin(script,params)
+        return self.gremlin(script, params, read_only=True)
 
     #: Index Proxy - Vertex
 
@@ -832,6 +902,34 @@ class Neo4jClient(Client):
         params = None
         return self.request.delete(path, params)
 
+    # Index Proxy - Bulk
+
+    def get_or_create_indices(self, indices):
+        """
+        Gets or creates the indices with one Gremlin script.
+
+        :param indices: List of (index_name, index_class, index_config) tuples,
+            where index_class is either "vertex" or "edge".
+        :type indices: list
+
+        :rtype: Neo4jResponse with a result for each index
+
+        """
+        script = self.scripts.get('get_or_create_indices')
+        params = dict(indices=[list(index) for index in indices])
+        resp = self.gremlin(script, params)
+        # build the results the create index endpoint would have returned
+        root_uri = self.config.root_uri.rstrip("/")
+        type_map = dict(vertex=vertex_path, edge=edge_path)
+        results = []
+        for index_name, index_class, index_config in indices:
+            path = build_path(index_path, type_map[index_class], index_name)
+            result = dict(index_config or {}, name=index_name)
+            result['template'] = "%s/%s/{key}/{value}" % (root_uri, path)
+            results.append(Neo4jResult(result, self.config))
+        resp.results = results
+        return resp
+
     # Index Container - Vertex
 
     def put_vertex(self, index_name, key, value, _id):
@@ -853,7 +951,7 @@ class Neo4jClient(Client):
         :rtype: Neo4jResponse
 
         """
-        uri = "%s/%s/%d" % (self.config.root_uri, vertex_path, _id)
+        uri = self._build_vertex_uri(_id)
         path = build_path(index_path, vertex_path, index_name)
         params = dict(key=key, value=value, uri=uri)
         return self.request.post(path, params)
@@ -964,7 +1062,7 @@ class Neo4jClient(Client):
         :rtype: Neo4jResponse
 
         """
-        uri = "%s/%s/%d" % (self.config.root_uri,edge_path,_id)
+        uri = self._build_edge_uri(_id)
         path = build_path(index_path, edge_path, index_name)
         params = dict(key=key,value=value,uri=uri)
         return self.request.post(path, params)
@@ -1052,6 +1150,28 @@ class Neo4jClient(Client):
         params = dict(data=data,index_name=index_name,keys=keys)
         script = self.scripts.get("create_indexed_vertex")
         return self.gremlin(script,params)
+
+    def create_indexed_vertices(self, data_list, index_name, keys=None):
+        """
+        Creates the vertices in one transaction, indexes them, and returns the 
+        Response, which has the vertices in the order of the data.
+
+        :param data_list: Property data dicts.
+        :type data_list: list
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: Neo4jResponse
+
+        """
+        data_list = [self._remove_null_values(data) for data in data_list]
+        params = dict(data_list=data_list,index_name=index_name,keys=keys)
+        script = self.scripts.get("create_indexed_vertices")
+        return self.gremlin(script,params)
     
     def update_indexed_vertex(self, _id, data, index_name, keys=None):
         """
@@ -1077,6 +1197,32 @@ class Neo4jClient(Client):
         script = self.scripts.get("update_indexed_vertex")
         return self.gremlin(script,params)
 
+    def patch_indexed_vertex(self, _id, data, index_name, keys=None):
+        """
+        Updates the changed properties of an indexed vertex, reindexes only 
+        those keys, and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param data: Changed property data. Properties set to None are removed.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: Neo4jResponse
+
+        """
+        removed = self._get_null_keys(data)
+        data = self._remove_null_values(data)
+        params = dict(_id=_id,data=data,removed=removed,index_name=index_name,keys=keys)
+        script = self.scripts.get("patch_indexed_vertex")
+        return self.gremlin(script,params)
+
     # Model Proxy - Edge
 
     def create_indexed_edge(self, outV, label, inV, data, index_name, keys=None):
@@ -1111,6 +1257,32 @@ class Neo4jClient(Client):
         script = self.scripts.get("create_indexed_edge")
         return self.gremlin(script,params)
 
+    def create_indexed_edges(self, label, edges, index_name, keys=None):
+        """
+        Creates the edges in one transaction, indexes them, and returns the 
+        Response, which has the edges in the order they were passed in.
+
+        :param label: Edge label.
+        :type label: str
+
+        :param edges: List of (outV, inV, data) tuples.
+        :type edges: list
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: Neo4jResponse
+
+        """
+        edges = [(outV, inV, self._remove_null_values(data)) for outV, inV, data in edges]
+        params = dict(label=label,edges=edges,index_name=index_name,keys=keys,
+                      label_var=self.config.label_var)
+        script = self.scripts.get("create_indexed_edges")
+        return self.gremlin(script,params)
+
 
     def update_indexed_edge(self, _id, data, index_name, keys=None):
         """
@@ -1136,6 +1308,32 @@ class Neo4jClient(Client):
         script = self.scripts.get("update_indexed_edge")
         return self.gremlin(script,params)
 
+    def patch_indexed_edge(self, _id, data, index_name, keys=None):
+        """
+        Updates the changed properties of an indexed edge, reindexes only 
+        those keys, and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :param data: Changed property data. Properties set to None are removed.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: Neo4jResponse
+
+        """
+        removed = self._get_null_keys(data)
+        data = self._remove_null_values(data)
+        params = dict(_id=_id,data=data,removed=removed,index_name=index_name,keys=keys)
+        script = self.scripts.get("patch_indexed_edge")
+        return self.gremlin(script,params)
+
 
     # Metadata
 
@@ -1171,7 +1369,7 @@ class Neo4jClient(Client):
         """
         script = self.scripts.get("get_metadata")
         params = dict(key=key, default_value=default_value)
-        return self.gremlin(script, params)
+        return self.gremlin(script, params, read_only=True)
 
     def remove_metadata(self, key):
         """
@@ -1190,6 +1388,10 @@ class Neo4jClient(Client):
 
     # Private 
 
+    def _get_null_keys(self, data):
+        """Returns the keys of properties set to null, which are removed."""
+        return [key for key in data if data[key] is None]
+
     def _remove_null_values(self,data):
         """Removes null property values because they aren't valid in Neo4j."""
         # Neo4j Server uses PUTs to overwrite all properties so no need
@@ -1219,29 +1421,32 @@ class Neo4jClient(Client):
     def _build_vertex_path(self,_id,*args):
         # if the _id is a placeholder, return the placeholder;
         # othewise, return a normal vertex path
+        return self._build_element_path(vertex_path, _id, *args)
+        
+    def _build_vertex_uri(self,_id,*args):
+        return self._build_element_uri(vertex_path, _id, *args)
+
+    def _build_edge_path(self,_id,*args):
+        # if the _id is a placeholder, return the placeholder;
+        # othewise, return a normal edge path
+        return self._build_element_path(edge_path, _id, *args)
+
+    def _build_edge_uri(self,_id,*args):
+        return self._build_element_uri(edge_path, _id, *args)
+
+    def _build_element_path(self, element_path, _id, *args):
+        # don't quote the placeholder, Neo4j needs the braces
         placeholder = self._placeholder(_id) 
         if placeholder:
-            segments = [placeholder]
-        else:
-            segments = [vertex_path,_id]
-        segments = segments + list(args)
+            return "/".join([placeholder, build_path(*args)]).rstrip("/")
+        segments = [element_path, _id] + list(args)
         return build_path(*segments)
-        
-    def _build_vertex_uri(self,_id,*args):
+
+    def _build_element_uri(self, element_path, _id, *args):
         placeholder = self._placeholder(_id) 
         if placeholder:
-            return placeholder
+            return self._build_element_path(element_path, _id, *args)
         root_uri = self.config.root_uri.rstrip("/")
-        segments = [vertex_path, _id] + list(args)
-        path = build_path(*segments)
+        path = self._build_element_path(element_path, _id, *args)
         uri = "%s/%s" % (root_uri, path)
         return uri
-
-    def _build_edge_path(self,_id):
-        # if the _id is a placeholder, return the placeholder;
-        # othewise, return a normal edge path
-        return self._placeholder(_id) or build_path(edge_path,_id)
-
-    def _build_edge_uri(self,_id):
-        pass
-
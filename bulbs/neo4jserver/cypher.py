@@ -7,7 +7,6 @@
 import os
 import io
 import re
-import yaml 
 from string import Template
 
 from bulbs.utils import initialize_elements
@@ -64,6 +63,8 @@ class Yaml(object):
         return file_name
 
     def _get_templates(self,file_name):
+        # PyYAML is slow to import so it's only imported when it's used
+        import yaml
         templates = dict()
         with io.open (file_name, encoding='utf-8') as f:
             yaml_map = yaml.load(f)    
@@ -103,6 +103,19 @@ class Graph(BaseGraph):
         """
         return self.client.remove_metadata(key)
         
+    def batch(self):
+        """
+        Returns a batch client that shares this Graph's config and registry.
+
+        :rtype: bulbs.neo4jserver.batch.Neo4jBatchClient
+
+        """
+        # imported here so it's only loaded if it's used
+        from .batch import Neo4jBatchClient
+        batch = Neo4jBatchClient(self.config)
+        batch.registry = self.client.registry
+        return batch
+        
     def load_graphml(self, uri):
         """
         Loads a GraphML file into the database and returns the response.
@@ -30,6 +30,32 @@ def create_indexed_vertex(data,index_name,keys) {
   }
 }
 
+// Creates the vertices in one transaction and returns them in order.
+def create_indexed_vertices(data_list,index_name,keys) {
+  neo4j = g.getRawGraph()
+  manager = neo4j.index()
+  g.setMaxBufferSize(0)
+  g.startTransaction()
+  try {
+    index = manager.forNodes(index_name)
+    vertices = []
+    for (data in data_list) {
+      vertex = neo4j.createNode()
+      for (entry in data.entrySet()) {
+        if (entry.value == null) continue;
+        vertex.setProperty(entry.key,entry.value)
+        if (keys == null || keys.contains(entry.key))
+	  index.add(vertex,entry.key,String.valueOf(entry.value))
+      }
+      vertices.add(vertex)
+    }
+    g.stopTransaction(TransactionalGraph.Conclusion.SUCCESS)
+    return vertices
+  } catch (e) {
+    g.stopTransaction(TransactionalGraph.Conclusion.FAILURE)  
+    return e
+  }
+}
 
 def update_indexed_vertex(_id, data, index_name, keys) {
   vertex = g.getRawGraph().getNodeById(_id)
@@ -55,6 +81,33 @@ def update_indexed_vertex(_id, data, index_name, keys) {
   }
 }
 
+def patch_indexed_vertex(_id, data, removed, index_name, keys) {
+  vertex = g.getRawGraph().getNodeById(_id)
+  manager = g.getRawGraph().index()
+  g.setMaxBufferSize(0)
+  g.startTransaction()
+  try {
+    index = manager.forNodes(index_name)
+    for (String key in removed) {
+      if (keys == null || keys.contains(key))
+	index.remove(vertex,key)
+      vertex.removeProperty(key)
+    }
+    for (entry in data.entrySet()) {
+      vertex.setProperty(entry.key,entry.value)
+      if (keys == null || keys.contains(entry.key)) {
+	index.remove(vertex,entry.key)
+	index.add(vertex,entry.key,String.valueOf(entry.value))
+      }
+    }
+    g.stopTransaction(TransactionalGraph.Conclusion.SUCCESS)
+    return vertex 
+  } catch (e) {
+    g.stopTransaction(TransactionalGraph.Conclusion.FAILURE)
+    return e
+  }
+}
+
 // Model - Edge
 
 def create_indexed_edge(outV,label,inV,data,index_name,keys,label_var) {
@@ -83,6 +136,38 @@ def create_indexed_edge(outV,label,inV,data,index_name,keys,label_var) {
   }
 }
 
+// Creates the edges, a list of [outV, inV, data], in one transaction and
+// returns them in order.
+def create_indexed_edges(label,edges,index_name,keys,label_var) {
+  import org.neo4j.graphdb.DynamicRelationshipType;
+  neo4j = g.getRawGraph()
+  manager = neo4j.index()
+  relationshipType = DynamicRelationshipType.withName(label)
+  g.setMaxBufferSize(0)
+  g.startTransaction()
+  try {
+    index = manager.forRelationships(index_name)
+    results = []
+    for (item in edges) {
+      vertex = neo4j.getNodeById(item[0])
+      edge = vertex.createRelationshipTo(neo4j.getNodeById(item[1]),relationshipType)
+      for (entry in item[2].entrySet()) {
+        if (entry.value == null) continue;
+        edge.setProperty(entry.key,entry.value)
+        if (keys == null || keys.contains(entry.key))
+	  index.add(edge,entry.key,String.valueOf(entry.value))
+      }
+      index.add(edge,label_var,String.valueOf(label))
+      results.add(edge)
+    }
+    g.stopTransaction(TransactionalGraph.Conclusion.SUCCESS)
+    return results
+  } catch (e) {
+    g.stopTransaction(TransactionalGraph.Conclusion.FAILURE)
+    return e
+  }
+}
+
 // don't need to update indexed label, it can't change
 def update_indexed_edge(_id, data, index_name, keys) {
   neo4j = g.getRawGraph()
@@ -109,6 +194,34 @@ def update_indexed_edge(_id, data, index_name, keys) {
   }
 }
 
+def patch_indexed_edge(_id, data, removed, index_name, keys) {
+  neo4j = g.getRawGraph()
+  manager = neo4j.index()
+  edge = neo4j.getRelationshipById(_id)
+  g.setMaxBufferSize(0)
+  g.startTransaction()
+  try {
+    index = manager.forRelationships(index_name)
+    for (String key in removed) {
+      if (keys == null || keys.contains(key))
+	index.remove(edge,key)
+      edge.removeProperty(key)
+    }
+    for (entry in data.entrySet()) {
+      edge.setProperty(entry.key,entry.value)
+      if (keys == null || keys.contains(entry.key)) {
+	index.remove(edge,entry.key)
+	index.add(edge,entry.key,String.valueOf(entry.value))
+      }
+    }
+    g.stopTransaction(TransactionalGraph.Conclusion.SUCCESS)
+    return edge
+  } catch (e) { 
+    g.stopTransaction(TransactionalGraph.Conclusion.FAILURE)
+    return e
+  }
+}
+
 // Indices
 
 def get_or_create_vertex_index(index_name, config) {
@@ -125,6 +238,20 @@ def get_or_create_edge_index(index_name, config) {
   return index
 }
 
+// indices is a list of [index_name, index_class, config] lists
+def get_or_create_indices(indices) {
+  manager = g.getRawGraph().index()
+  for (entry in indices) {
+    def (index_name, index_class, config) = entry
+    if (index_class == "edge") {
+      manager.forRelationships(index_name, config)
+    } else {
+      manager.forNodes(index_name, config)
+    }
+  }
+  return null
+}
+
 def query_exact_index(index_name, key, query_string) {
   // Neo4jTokens.QUERY_HEADER = "%query%"
   return g.idx(index_name).get(key, Neo4jTokens.QUERY_HEADER + query_string)
@@ -7,7 +7,10 @@
 An interface for interacting with indices on Neo4j Server.
 
 """
-from bulbs.utils import initialize_element, initialize_elements, get_one_result
+from bulbs.utils import initialize_element, initialize_elements, get_one_result, \
+    expire_lookup
+from bulbs.factory import evict_index
+from bulbs.element import lookup_elements
 
 
 class IndexProxy(object):
@@ -25,6 +28,15 @@ class IndexProxy(object):
         index_config = {'type':self.index_class.index_type,
                         'provider':self.index_class.index_provider}
         return index_config
+
+    def get_index_params(self):
+        """
+        Returns the config used to create the index.
+
+        :rtype: dict
+
+        """
+        return self._build_index_config(self.index_class)
     
 
 class VertexIndexProxy(IndexProxy):
@@ -99,6 +111,7 @@ class VertexIndexProxy(IndexProxy):
         :rtype: bulbs.neo4jserver.client.Neo4jResponse
 
         """
+        evict_index(self.client, "vertex", index_name)
         return self.client.delete_vertex_index(index_name)
 
 
@@ -174,6 +187,7 @@ class EdgeIndexProxy(IndexProxy):
         :rtype: bulbs.neo4jserver.client.Neo4jResponse
 
         """
+        evict_index(self.client, "edge", index_name)
         return self.client.delete_edge_index(index_name)
 
 #
@@ -246,7 +260,9 @@ class Index(object):
         """
         key, value = self._get_key_value(key,value,pair)
         put = self._get_method(vertex="put_vertex", edge="put_edge")
-        return put(self.index_name,key,value,_id)
+        resp = put(self.index_name,key,value,_id)
+        expire_lookup(self.client, self.index_class, self.index_name, key, value)
+        return resp
 
     def update(self, _id, key=None, value=None, **pair):
         """
@@ -266,8 +282,8 @@ class Index(object):
         """
         # TODO: This should be a Gremlin method
         key, value = self._get_key_value(key,value,pair)
-        for result in self.get(key,value):
-            self.remove(self.index_name, result._id, key, value)
+        for element in self.lookup(key, value) or []:
+            self.remove(element._id, key, value)
         return self.put(_id,key,value)
 
     def lookup(self, key=None, value=None, **pair):
@@ -287,6 +303,11 @@ class Index(object):
 
         """
         key, value = self._get_key_value(key,value,pair)
+        if self._caches_lookups():
+            elements = self._lookup_elements(key, value)
+            if elements:
+                return (element for element in elements)
+            return None
         lookup = self._get_method(vertex="lookup_vertex", edge="lookup_edge")
         resp = lookup(self.index_name,key,value)
         return initialize_elements(self.client, resp)
@@ -331,6 +352,9 @@ class Index(object):
 
         """
         key, value = self._get_key_value(key,value,pair)
+        if self._caches_lookups():
+            elements = self._lookup_elements(key, value)
+            return elements[0] if elements else None
         lookup = self._get_method(vertex="lookup_vertex", edge="lookup_edge")
         resp = lookup(self.index_name,key,value)
         if resp.total_size > 0:
@@ -359,6 +383,7 @@ class Index(object):
         data = {} if data is None else data
         create = self._get_method(vertex="create_unique_vertex")
         resp = create(self.index_name, key, value, data)
+        expire_lookup(self.client, "vertex", self.index_name, key, value)
         if resp.total_size > 0:
             result = get_one_result(resp)
             was_created = resp.headers['status'] == '201'
@@ -384,7 +409,9 @@ class Index(object):
         """
         key, value = self._get_key_value(key, value, pair)
         remove = self._get_method(vertex="remove_vertex", edge="remove_edge")
-        return remove(self.index_name,_id,key,value)
+        resp = remove(self.index_name,_id,key,value)
+        expire_lookup(self.client, self.index_class, self.index_name, key, value)
+        return resp
 
     def count(self, key=None, value=None, **pair):
         """
@@ -443,6 +470,37 @@ class Index(object):
         method = getattr(self.client, method_name)
         return method
 
+    def _caches_lookups(self):
+        """
+        Returns True if the index's lookups are cached. The server writes to 
+        automatic indices, and fulltext lookups match more than the value, 
+        so their cached lookups couldn't be kept current.
+
+        :rtype: bool
+
+        """
+        return self.client.cache is not None and \
+            self.blueprints_type == "MANUAL" and self.index_type == "exact"
+
+    def _lookup_elements(self, key, value):
+        """
+        Returns the elements for the key and value using the cache.
+
+        :param key: The index key. 
+        :type key: str
+
+        :param value: The key's value.
+        :type value: str or int
+
+        :rtype: list
+
+        """
+        lookup = self._get_method(vertex="lookup_vertex", edge="lookup_edge")
+        load = lambda: lookup(self.index_name, key, value)
+        multi_get = self._get_method(vertex="multi_get_vertices", edge="multi_get_edges")
+        return lookup_elements(self.client, self.index_class, self.index_name,
+                               key, value, load, multi_get)
+
 
 class ExactIndex(Index):
     """
@@ -1,12 +1,14 @@
 import unittest
 from .client_tests import neo4j_client_suite
 from .bulbs_tests import test_suite as bulbs_test_suite
+from .batch_tests import neo4j_batch_suite
 
 
 def test_suite():
     suite = unittest.TestSuite()
     suite.addTest(neo4j_client_suite())
     suite.addTest(bulbs_test_suite())
+    suite.addTest(neo4j_batch_suite())
     return suite
 
 if __name__ == '__main__':
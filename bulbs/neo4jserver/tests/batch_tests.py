@@ -0,0 +1,118 @@
+import json
+import unittest
+
+from bulbs.config import Config
+from bulbs.neo4jserver import NEO4J_URI
+from bulbs.neo4jserver.batch import Neo4jBatchClient, Neo4jBatchResponse
+from bulbs.tests import fakes
+
+
+class FakeHttp(fakes.FakeHttp):
+    """Executes batches, except the ones listed in fail, which are 500s."""
+
+    def __init__(self, fail=()):
+        self.fail = fail
+        self.batches = []
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        messages = json.loads(body)
+        self.batches.append(messages)
+        if len(self.batches) in self.fail:
+            content = dict(message="error", exception="BatchOperationFailedException")
+            return self.response(content, 500)
+        jobs = [dict(id=message['id'], status=201, body={}, 
+                     location=NEO4J_URI + "node/%d" % message['id'])
+                for message in messages]
+        return self.response(jobs)
+
+
+class Neo4jBatchClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        config = Config(NEO4J_URI)
+        config.autoindex = False
+        self.client = Neo4jBatchClient(config)
+
+    def test_queues_requests(self):
+        james = self.client.create_vertex(dict(name="James"))
+        julie = self.client.create_vertex(dict(name="Julie"))
+        knows = self.client.create_edge(james, "knows", julie)
+        assert (james, julie, knows) == ("{1}", "{2}", "{3}")
+
+        message = self.client.get_messages()[2]
+        assert message['method'] == "POST"
+        assert message['to'] == "{1}/relationships"
+        assert message['body']['to'] == "{2}"
+
+    def test_placeholder_paths_are_not_quoted(self):
+        james = self.client.create_vertex(dict(name="James"))
+        self.client.update_vertex(james, dict(name="James T"))
+        self.client.update_vertex(5, dict(name="Julie"))
+        messages = self.client.get_messages()
+        assert messages[1]['to'] == "{1}/properties"
+        assert messages[2]['to'] == "node/5/properties"
+
+    def test_indexed_create_uses_rest(self):
+        james = self.client.create_vertex(dict(name="James", age=34), keys=["name"])
+        messages = self.client.get_messages()
+        assert len(messages) == 2
+        assert messages[1]['to'] == "index/node/vertex"
+        assert messages[1]['body'] == dict(key="name", value="James", uri=james)
+
+    def test_resolves_placeholders_from_previous_chunks(self):
+        request = self.client.request
+        request.locations[1] = NEO4J_URI + "node/8"
+        message = dict(method="POST", to="{1}/relationships", id=3,
+                       body={'to': "{2}", 'type': "knows", 'data': {'x': "{1}"}})
+        resolved = request._resolve_message(message)
+        assert resolved['to'] == NEO4J_URI + "node/8/relationships"
+        assert resolved['body']['to'] == "{2}"
+        assert resolved['body']['data'] == {'x': "{1}"}
+
+    def test_remove_placeholder_from_index(self):
+        james = self.client.create_vertex(dict(name="James"))
+        self.assertRaises(ValueError, self.client.remove_vertex, "vertex", james)
+
+    def test_failed_chunk_stays_queued(self):
+        self.client.config.batch_size = 2
+        self.client.request.http = FakeHttp(fail=[2])
+        for name in ["James", "Julie", "Jack"]:
+            self.client.create_vertex(dict(name=name))
+        self.assertRaises(SystemError, self.client.send)
+        messages = self.client.get_messages()
+        assert [message['id'] for message in messages] == [3]
+        assert self.client.get_response("{2}").location.endswith("node/2")
+        self.client.request.http = FakeHttp()
+        responses = self.client.send()
+        assert [resp.placeholder for resp in responses] == ["{1}", "{2}", "{3}"]
+        assert self.client.get_response("{1}").location.endswith("node/1")
+        assert self.client.get_response("{2}").location.endswith("node/2")
+        assert self.client.get_messages() == []
+
+    def test_unexpected_job_status(self):
+        job = dict(id=3, status=302, body=None)
+        job['from'] = "/node"
+        try:
+            Neo4jBatchResponse(job, self.client.config)
+        except SystemError as error:
+            assert "status 302" in str(error) and "job 3" in str(error)
+        else:
+            self.fail("SystemError not raised")
+
+    def test_update_indexed_edge_removes_all_entries(self):
+        self.client.update_indexed_edge(5, dict(weight=1), "edge", keys=["weight"])
+        self.client.update_indexed_vertex(6, dict(name="James"), "vertex", keys=["name"])
+        messages = self.client.get_messages()
+        assert messages[0]['method'] == "DELETE"
+        assert messages[0]['to'] == "index/relationship/edge/5"
+        assert messages[3]['method'] == "DELETE"
+        assert messages[3]['to'] == "index/node/vertex/6"
+
+
+def neo4j_batch_suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(Neo4jBatchClientTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='neo4j_batch_suite')
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Thread-safe pool of persistent HTTP connections used by the REST Request.
+
+"""
+import threading
+
+import httplib2
+
+from .utils import get_logger, urlsplit
+
+
+log = get_logger(__name__)
+
+
+class ConnectionPool(object):
+    """
+    A thread-safe pool of persistent httplib2.Http objects.
+
+    An httplib2.Http object is not safe to share across threads, so each
+    request checks out an idle Http object, uses it, and returns it to the
+    pool. Each Http object keeps its own keep-alive connections, which are
+    reused by subsequent requests.
+
+    :param max_size: Max number of Http objects (concurrent requests).
+    :type max_size: int
+
+    :param max_per_host: Optional max number of concurrent requests per host.
+        Defaults to max_size.
+    :type max_per_host: int
+
+    :param timeout: Optional socket timeout in seconds. Defaults to None.
+    :type timeout: int
+
+    :param block_timeout: Optional number of seconds to wait for a free
+        connection before raising an error. Defaults to None (wait forever).
+    :type block_timeout: float
+
+    :ivar max_size: Max number of Http objects.
+    :ivar max_per_host: Max number of concurrent requests per host.
+    :ivar timeout: Socket timeout in seconds.
+    :ivar block_timeout: Seconds to wait for a free connection.
+
+    .. note:: The pool implements the part of the httplib2.Http interface
+              used by Request so it can be used in place of an Http object.
+
+    """
+    def __init__(self, max_size=10, max_per_host=None, timeout=None,
+                 block_timeout=None):
+        assert max_size > 0
+        self.max_size = max_size
+        self.max_per_host = max_per_host or max_size
+        self.timeout = timeout
+        self.block_timeout = block_timeout
+
+        # Idle Http objects, used as a stack so the warmest one is reused first
+        self._idle = []
+
+        # Number of Http objects created (idle and checked out)
+        self._size = 0
+
+        # Credentials applied to every Http object in the pool
+        self._credentials = []
+
+        self._condition = threading.Condition(threading.Lock())
+        self._host_lock = threading.Lock()
+        self._host_semaphores = dict()
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        """
+        Sends a request using a pooled Http object and returns the response.
+
+        :param uri: Absolute URI of the resource.
+        :type uri: str
+
+        :param method: HTTP method: GET, PUT, POST, or DELETE.
+        :type method: str
+
+        :param body: Optional request body.
+        :type body: str or None
+
+        :param headers: Optional request headers.
+        :type headers: dict or None
+
+        :rtype: tuple containing (httplib2.Response, content)
+
+        """
+        semaphore = self._get_host_semaphore(uri)
+        semaphore.acquire()
+        try:
+            http = self._acquire()
+            try:
+                response = http.request(uri, method, body, headers)
+            except Exception:
+                # the connection may be in an unknown state so don't reuse it
+                self._discard(http)
+                raise
+            self._release(http)
+            return response
+        finally:
+            semaphore.release()
+
+    def add_credentials(self, username, password):
+        """
+        Adds credentials to all the Http objects in the pool, which apply 
+        them when they're next checked out.
+
+        :param username: Username.
+        :type username: str
+
+        :param password: Password.
+        :type password: str
+
+        :rtype: None
+
+        """
+        with self._condition:
+            self._credentials.append((username, password))
+
+    def close(self):
+        """
+        Closes the idle connections and empties the pool.
+
+        :rtype: None
+
+        """
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for http in idle:
+            self._close_http(http)
+
+    def _build_http(self):
+        if self.timeout is not None:
+            http = httplib2.Http(timeout=int(self.timeout))
+        else:
+            http = httplib2.Http()
+        return http
+
+    def _acquire(self):
+        with self._condition:
+            while not self._idle and self._size >= self.max_size:
+                self._wait()
+            credentials = list(self._credentials)
+            http = self._idle.pop() if self._idle else None
+            if http is None:
+                self._size += 1
+        if http is None:
+            try:
+                http = self._build_http()
+            except Exception:
+                self._discard(None)
+                raise
+        self._apply_credentials(http, credentials)
+        return http
+
+    def _apply_credentials(self, http, credentials):
+        # Adds the credentials added to the pool since the Http object was 
+        # last checked out, including while it was checked out.
+        applied = getattr(http, "_pool_credentials", 0)
+        for username, password in credentials[applied:]:
+            http.add_credentials(username, password)
+        http._pool_credentials = len(credentials)
+
+    def _wait(self):
+        if self.block_timeout is None:
+            self._condition.wait()
+            return
+        self._condition.wait(self.block_timeout)
+        if not self._idle and self._size >= self.max_size:
+            log.error("Timed out waiting for a pooled connection.")
+            raise SystemError("Connection pool exhausted")
+
+    def _release(self, http):
+        with self._condition:
+            self._idle.append(http)
+            self._condition.notify()
+
+    def _discard(self, http):
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+        if http is not None:
+            self._close_http(http)
+
+    def _close_http(self, http):
+        for connection in list(http.connections.values()):
+            try:
+                connection.close()
+            except Exception:
+                log.debug("Error closing pooled connection.", exc_info=True)
+
+    def _get_host_semaphore(self, uri):
+        host = urlsplit(uri).netloc
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_per_host)
+                self._host_semaphores[host] = semaphore
+        return semaphore
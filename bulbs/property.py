@@ -14,8 +14,9 @@ if sys.version > '3':
     long = int
     unicode = str
 
+import inspect
 import datetime
-import dateutil.parser
+from functools import partial
 from numbers import Number
 
 from . import utils
@@ -52,6 +53,11 @@ class Property(object):
     .. note:: If no Properties have index=True, all Properties are indexed. 
 
     """
+    #: Names of the Converter methods called by to_db() and to_python(). 
+    #: Model conversion plans call them directly when they're set.
+    db_converter = None
+    python_converter = None
+
     def __init__(self, fget=None, name=None, default=None, \
                      nullable=True, unique=False, indexed=False):
         self.fget = fget
@@ -169,6 +175,82 @@ class Property(object):
         # overload coerce for special types like DateTime
         return self.python_type(value)
 
+    def get_converters(self, type_system, key):
+        """
+        Returns the functions that convert a Property value to its database 
+        representation and to its Python type, which Models compile into their 
+        conversion plans.
+
+        :param type_system: TypeSystem object.
+        :type type_system: TypeSystem
+
+        :param key: Property key.
+        :type key: str
+
+        :rtype: tuple
+
+        .. note:: The functions are the type system's Converter methods unless
+                  a subclass overrides how the Property is converted.
+
+        """
+        to_db = self._get_converter(type_system.database, "db_converter", 
+                                    "to_db", "convert_to_db")
+        if to_db is None:
+            to_db = partial(self.convert_to_db, type_system, key)
+        to_python = self._get_converter(type_system.python, "python_converter",
+                                        "to_python", "convert_to_python")
+        if to_python is None:
+            to_python = partial(self.convert_to_python, type_system, key)
+        return to_db, to_python
+
+    def get_column_converter(self, type_system):
+        """
+        Returns the function that converts a column of database values, 
+        e.g. the Property's values across a result set, to its Python type.
+
+        :param type_system: TypeSystem object.
+        :type type_system: TypeSystem
+
+        :rtype: function or None
+
+        .. note:: Returns None if a subclass overrides how the Property is
+                  converted, in which case each value must be converted.
+
+        """
+        converter = type_system.python
+        if self._get_converter(converter, "python_converter", "to_python", 
+                               "convert_to_python") is not None:
+            return partial(converter.convert_column, self.python_converter)
+
+    def _get_converter(self, converter, name_attr, method, convert_method):
+        # The Converter method can only be called directly if it's the one 
+        # that the Property's own to_db() or to_python() calls. 
+        name = getattr(self, name_attr)
+        cls = type(self)
+        if name is not None and \
+                _defined_in(cls, method) is _defined_in(cls, name_attr) and \
+                _defined_in(cls, convert_method) is Property:
+            return getattr(converter, name)
+
+    def has_default_validation(self):
+        """
+        Returns True if validate() only does the null and type checks, which 
+        Models inline in their conversion plans.
+
+        :rtype: bool
+
+        """
+        cls = type(self)
+        return all(_defined_in(cls, name) is Property for name in 
+                   ("validate", "_check_null", "_check_datatype"))
+
+
+def _defined_in(cls, name):
+    # Returns the class in the MRO that defines the attribute.
+    for klass in inspect.getmro(cls):
+        if name in klass.__dict__:
+            return klass
+
 class String(Property): 
     """
     :param fget: Method name that returns a calculated value. Defaults to None.
@@ -198,6 +280,10 @@ class String(Property):
     #: Python type
     python_type = unicode
 
+    #: Converter methods called by to_db() and to_python()
+    db_converter = "to_string"
+    python_converter = "to_string"
+
     def to_db(self,type_system,value):
         return type_system.database.to_string(value)
 
@@ -236,6 +322,10 @@ class Integer(Property):
     #: Python type
     python_type = int
 
+    #: Converter methods called by to_db() and to_python()
+    db_converter = "to_integer"
+    python_converter = "to_integer"
+
     def to_db(self,type_system,value):
         return type_system.database.to_integer(value)
     
@@ -271,6 +361,10 @@ class Long(Property):
     #: Python type
     python_type = long
 
+    #: Converter methods called by to_db() and to_python()
+    db_converter = "to_long"
+    python_converter = "to_long"
+
     def to_db(self,type_system,value):
         return type_system.database.to_long(value)
 
@@ -306,6 +400,10 @@ class Float(Property):
     #: Python type
     python_type = float
 
+    #: Converter methods called by to_db() and to_python()
+    db_converter = "to_float"
+    python_converter = "to_float"
+
     def to_db(self,type_system,value):
         return type_system.database.to_float(value)
     
@@ -341,6 +439,10 @@ class Bool(Property):
     #: Python type
     python_type = bool
 
+    #: Converter methods called by to_db() and to_python()
+    db_converter = "to_bool"
+    python_converter = "to_bool"
+
     def to_db(self,type_system,value):
         return type_system.database.to_bool(value)
 
@@ -376,6 +478,10 @@ class Null(Property):
     #: Python type
     python_type = None
 
+    #: Converter methods called by to_db() and to_python()
+    db_converter = "to_null"
+    python_converter = "to_null"
+
     def to_db(self,type_system,value):
         return type_system.database.to_null(value)
 
@@ -411,6 +517,10 @@ class List(Property):
     #: Python type
     python_type = list
 
+    #: Converter methods called by to_db() and to_python()
+    db_converter = "to_list"
+    python_converter = "to_list"
+
     def to_db(self,type_system,value):
         return type_system.database.to_list(value)
 
@@ -446,6 +556,10 @@ class Dictionary(Property):
     #: Python type
     python_type = dict
 
+    #: Converter methods called by to_db() and to_python()
+    db_converter = "to_dictionary"
+    python_converter = "to_dictionary"
+
     def to_db(self,type_system,value):
         return type_system.database.to_dictionary(value)
 
@@ -482,6 +596,10 @@ class Document(Property):
     #: Python type
     python_type = dict
 
+    #: Converter methods called by to_db() and to_python()
+    db_converter = "to_document"
+    python_converter = "to_dictionary"
+
     def to_db(self,type_system,value):
         return type_system.database.to_document(value)
 
@@ -518,6 +636,10 @@ class DateTime(Property):
     #: Python type
     python_type = datetime.datetime
 
+    #: Converter methods called by to_db() and to_python()
+    db_converter = "to_datetime"
+    python_converter = "to_datetime"
+
     def to_db(self, type_system, value):
         return type_system.database.to_datetime(value)
 
@@ -549,6 +671,7 @@ class DateTime(Property):
             dt = value
         else:
             # Python 3 unicode/str catchall
+            import dateutil.parser   # slow to import, so only when needed
             dt = dateutil.parser.parse(value)
 
         #if dt.tzinfo is None:
@@ -587,6 +710,10 @@ class Date(Property):
     #: Python type
     python_type = datetime.date
 
+    #: Converter methods called by to_db() and to_python()
+    db_converter = "to_date"
+    python_converter = "to_date"
+
     def to_db(self, type_system, value):
         return type_system.database.to_date(value)
 
@@ -617,6 +744,7 @@ class Date(Property):
             d = value
         else:
             # Python 3 unicode/str catchall
+            import dateutil.parser   # slow to import, so only when needed
             d = dateutil.parser.parse(value).date()
 
         return d
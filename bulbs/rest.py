@@ -8,11 +8,21 @@ Low-level module for connecting to the Rexster REST server and
 returning a Response object.
 
 """
+import time
+
 import httplib2
+import six  # Python 3
 
 import bulbs
 from bulbs.base import Response
-from .utils import json, get_logger, quote, urlencode, encode_dict
+from .pool import ConnectionPool
+from .codec import get_content_codec
+from .stream import open_stream
+from .retry import RetryPolicy, CircuitBreaker, CircuitOpenError, connection_errors, \
+    monotonic
+from .router import Router
+from .compression import compress
+from .utils import get_logger, quote, urlencode, encode_dict, urlsplit
 
 
 log = get_logger(__name__)
@@ -65,6 +75,12 @@ class Request(object):
 
     response_class = Response
 
+    #: Response class for streamed requests, see stream().
+    stream_response_class = None
+
+    #: Maximum size in bytes of each chunk read from a streamed response.
+    stream_chunk_size = 64 * 1024
+
     def __init__(self, config, content_type):
         """
         Initializes a client object.
@@ -75,15 +91,40 @@ class Request(object):
         self.config = config
         self.content_type = content_type
         self.user_agent = "bulbs/%s" % (bulbs.__version__)
-        if config.timeout is not None:
-            self.http = httplib2.Http(timeout=int(config.timeout))
-        else:
-            self.http = httplib2.Http()    
+        self.http = self._build_http(config)
+        self._codec = None
+        self.retry_policy = RetryPolicy.from_config(config)
+        self.breakers = dict()
+        self.router = Router(config)
         self._add_credentials(config.username, config.password)
         self._initialize()
 
     def _initialize(self):
         pass
+
+    @property
+    def codec(self):
+        """
+        Returns the Codec that encodes request bodies. It's looked up the 
+        first time it's used so the JSON library is only imported if needed.
+
+        :rtype: bulbs.codec.Codec
+
+        """
+        if self._codec is None:
+            self._codec = get_content_codec(self.config, self.content_type)
+        return self._codec
+
+    def _build_http(self, config):
+        # Pooled connections are safe to share across threads;
+        # a single httplib2.Http object is not.
+        pool_size = getattr(config, "pool_size", None)
+        if pool_size:
+            max_per_host = getattr(config, "pool_max_per_host", None)
+            return ConnectionPool(pool_size, max_per_host, config.timeout)
+        if config.timeout is not None:
+            return httplib2.Http(timeout=int(config.timeout))
+        return httplib2.Http()
     
     def get(self, path, params=None):
         """
@@ -115,7 +156,7 @@ class Request(object):
         """
         return self.request(PUT, path, params)
 
-    def post(self, path, params=None):
+    def post(self, path, params=None, read_only=False):
         """
         Convenience method that sends POST requests to the client.
 
@@ -125,10 +166,15 @@ class Request(object):
         :param params: Optional URI params for the resource.
         :type params: dict
 
+        :param read_only: True if the request doesn't modify the database,
+            e.g. a read-only Gremlin script, so it can be sent to a replica.
+            Defaults to False.
+        :type read_only: bool
+
         :rtype: Response
 
         """
-        return self.request(POST, path, params)
+        return self.request(POST, path, params, read_only)
 
     def delete(self, path, params=None):
         """
@@ -161,7 +207,7 @@ class Request(object):
         method, path, params = message
         return self.request(method, path, params)
 
-    def request(self, method, path, params):
+    def request(self, method, path, params, read_only=None):
         """
         Sends a request to the client.
 
@@ -174,6 +220,10 @@ class Request(object):
         :param params: Optional URI parameters for the resource.
         :type params: dict
 
+        :param read_only: True if the request doesn't modify the database so 
+            it can be sent to a replica. Defaults to None (only GETs are).
+        :type read_only: bool
+
         :rtype: Response
 
         """
@@ -181,17 +231,142 @@ class Request(object):
 
         self._display_debug(uri, method, body)
 
-        http_resp = self.http.request(uri, method, body, headers)
+        send = lambda target: self.http.request(target, method, body, headers)
+        http_resp = self._send_request(uri, method, read_only, send)
 
         return self.response_class(http_resp, self.config)
 
+    def stream(self, method, path, params, read_only=None):
+        """
+        Sends a request to the client and returns a streaming Response.
+
+        The results in the response body are decoded as they're read, so
+        response.results is a generator that holds one result in memory at a
+        time, and response.total_size is None.
+
+        :param method: HTTP method: GET, PUT, POST, or DELETE.
+        :type method: str
+
+        :param path: Path to the server resource, relative to the root URI.
+        :type path: str
+
+        :param params: Optional URI parameters for the resource.
+        :type params: dict
+
+        :param read_only: True if the request doesn't modify the database so 
+            it can be sent to a replica. Defaults to None (only GETs are).
+        :type read_only: bool
+
+        :rtype: Response
+
+        .. note:: The connection stays open until the results have been read
+                  so it's not taken from the connection pool.
+
+        """
+        if self.stream_response_class is None:
+            raise NotImplementedError("%s doesn't support streaming" % type(self).__name__)
+
+        uri, method, body, headers = self._build_request_args(path, method, params)
+
+        self._display_debug(uri, method, body)
+
+        send = lambda target: open_stream(target, method, body, headers, self.config,
+                                          self.stream_chunk_size)
+        stream_resp = self._send_request(uri, method, read_only, send)
+
+        return self.stream_response_class(stream_resp, self.config)
+
+    def _send_request(self, uri, method, read_only, send):
+        # Sends the request to the endpoint chosen by the router, failing
+        # over from replicas and retrying as the retry policy allows.
+        # Returns the (headers, content) tuple returned by send(uri).
+        if read_only is None:
+            read_only = (method == GET)
+        start = monotonic()
+        attempt = 0
+        while True:
+            endpoint, target, breaker = self._get_target(uri, read_only)
+            self.router.begin(endpoint)
+            try:
+                http_resp = send(target)
+            except connection_errors as error:
+                delay = self._get_retry_delay(endpoint, breaker, target, method,
+                                              attempt, start, error)
+                if delay is None:
+                    raise
+            else:
+                headers, content = http_resp
+                delay = self._get_retry_delay(endpoint, breaker, target, method,
+                                              attempt, start, headers.status)
+                if delay is None:
+                    return http_resp
+                if hasattr(content, "close"):
+                    content.close()
+            finally:
+                self.router.end(endpoint)
+            if endpoint is None:
+                # failing over from a replica doesn't count as a retry
+                time.sleep(delay)
+                attempt += 1
+
+    def _get_target(self, uri, read_only):
+        # Returns the endpoint (None for the master), the URI rewritten to it,
+        # and its circuit breaker. Replicas with an open circuit are ejected.
+        while True:
+            endpoint = self.router.get_endpoint(read_only)
+            target = self.router.get_uri(endpoint, uri)
+            breaker = self._get_breaker(target)
+            if breaker is None:
+                return endpoint, target, None
+            try:
+                breaker.before_request()
+            except CircuitOpenError:
+                if endpoint is None:
+                    raise
+                self.router.eject(endpoint)
+                continue
+            return endpoint, target, breaker
+
+    def _get_retry_delay(self, endpoint, breaker, uri, method, attempt, start, outcome):
+        # Records the outcome (the response status or the connection error)
+        # and returns the seconds to wait before retrying, or None if the
+        # request shouldn't be retried. Failed replicas are ejected and the
+        # request is retried right away on another endpoint.
+        failed = not isinstance(outcome, int) or self.retry_policy.is_failure(outcome)
+        if breaker is not None:
+            if failed:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        if not failed:
+            return None
+        if endpoint is not None:
+            self.router.eject(endpoint)
+            return 0
+        delay = self.retry_policy.get_delay(method, attempt, monotonic() - start)
+        if delay is not None:
+            log.warning("%s %s failed (%s); retrying in %.2fs", method, uri, outcome, delay)
+        return delay
+
+    def _get_breaker(self, uri):
+        # Returns the circuit breaker for the URI's endpoint, or None if disabled
+        threshold = getattr(self.config, "breaker_threshold", None)
+        if not threshold:
+            return None
+        endpoint = urlsplit(uri).netloc
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            reset_timeout = getattr(self.config, "breaker_timeout", 30)
+            breaker = CircuitBreaker(threshold, reset_timeout, endpoint)
+            breaker = self.breakers.setdefault(endpoint, breaker)
+        return breaker
 
     def _display_debug(self, uri, method, body):
         log.debug("%s url:  %s  ", method, uri)
         log.debug("%s body: %s ", method, body)
                     
     def _build_request_args(self, path, method, params):
-        headers = {'Accept': 'application/json',
+        headers = {'Accept': self.content_type,
                    'User-Agent': self.user_agent}
         body = None
 
@@ -206,23 +381,39 @@ class Request(object):
         
         if params and (method in [PUT, POST, DELETE]):
             #params = encode_dict(params)
-            body = json.dumps(params)
+            body = self.codec.dumps(params)
             post_headers = {'Content-Type': self.content_type}
             headers.update(post_headers)
+            body = self._maybe_compress(body, headers)
         
         return uri, method, body, headers 
 
+    def _maybe_compress(self, body, headers):
+        # Compresses bodies over the threshold if compression is enabled.
+        # The threshold is in bytes, so text bodies are measured as UTF-8.
+        encoding = getattr(self.config, "compression", None)
+        if not encoding:
+            return body
+        threshold = getattr(self.config, "compression_threshold", 1024)
+        data = body.encode('utf-8') if isinstance(body, six.text_type) else body
+        if len(data) >= threshold:
+            body = compress(data, encoding)
+            headers['Content-Encoding'] = encoding
+        return body
+
     def _add_credentials(self, username, password):
         if username and password:
             self.http.add_credentials(username, password)
 
-    # how to reuse the http object?
+    # the http object can't be pickled so it's rebuilt from the config
     def __getstate__(self):
-        state = self.__data__.copy()
+        state = self.__dict__.copy()
         del state['http']
+        state['breakers'] = dict()
         return state
 
     def __setstate__(self, state):
-        state['http'] = httplib2.Http()
-        self.__data__ = state
+        self.__dict__.update(state)
+        self.http = self._build_http(self.config)
+        self._add_credentials(self.config.username, self.config.password)
 
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Retry policy and circuit breaker used by the REST Request.
+
+Both are disabled by default; see Config.retries and Config.breaker_threshold.
+
+"""
+import time
+import random
+import socket
+import threading
+
+import httplib2
+from six.moves import http_client
+
+from .utils import get_logger
+
+
+log = get_logger(__name__)
+
+# Clock for elapsed times and timeouts, which doesn't jump when the system
+# clock is set. Python 2 doesn't have one, so it falls back to time.time().
+monotonic = getattr(time, "monotonic", time.time)
+
+# Errors raised when the server can't be reached or drops the connection
+connection_errors = (socket.error, httplib2.HttpLib2Error, http_client.HTTPException)
+
+
+class CircuitOpenError(SystemError):
+    """Raised instead of sending a request to a server that's failing."""
+
+
+class RetryPolicy(object):
+    """
+    Decides whether a failed request is retried and how long to wait.
+
+    Only requests with an idempotent method are retried. The wait before each
+    retry is chosen at random between 0 and the exponential backoff for the
+    attempt ("full jitter") so clients that failed together don't retry
+    together.
+
+    :param retries: Max number of retries per request. Defaults to 0.
+    :type retries: int
+
+    :param backoff: Backoff in seconds before the first retry. Defaults to 0.1.
+    :type backoff: float
+
+    :param max_backoff: Max backoff in seconds. Defaults to 10.
+    :type max_backoff: float
+
+    :param max_elapsed: Optional max total seconds spent on a request,
+        including retries. Defaults to None (no limit).
+    :type max_elapsed: float
+
+    :param methods: HTTP methods that are retried. Defaults to GET, PUT,
+        and DELETE.
+    :type methods: list
+
+    :param statuses: HTTP status codes that are retried. Defaults to 502,
+        503, and 504.
+    :type statuses: list
+
+    """
+    def __init__(self, retries=0, backoff=0.1, max_backoff=10, max_elapsed=None,
+                 methods=("GET", "PUT", "DELETE"), statuses=(502, 503, 504)):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_elapsed = max_elapsed
+        self.methods = frozenset(methods)
+        self.statuses = frozenset(statuses)
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Returns the RetryPolicy defined by the config.
+
+        :param config: Config object.
+        :type config: bulbs.config.Config
+
+        :rtype: RetryPolicy
+
+        """
+        default = cls()
+        return cls(getattr(config, "retries", default.retries),
+                   getattr(config, "retry_backoff", default.backoff),
+                   getattr(config, "retry_max_backoff", default.max_backoff),
+                   getattr(config, "retry_max_elapsed", default.max_elapsed),
+                   getattr(config, "retry_methods", default.methods),
+                   getattr(config, "retry_statuses", default.statuses))
+
+    def is_failure(self, status):
+        """
+        Returns True if the status means the server failed to handle the request.
+
+        :param status: HTTP status code.
+        :type status: int
+
+        :rtype: bool
+
+        """
+        return status in self.statuses
+
+    def get_delay(self, method, attempt, elapsed):
+        """
+        Returns the seconds to wait before retrying, or None to give up.
+
+        :param method: HTTP method of the failed request.
+        :type method: str
+
+        :param attempt: Number of the failed attempt, starting at 0.
+        :type attempt: int
+
+        :param elapsed: Seconds elapsed since the first attempt.
+        :type elapsed: float
+
+        :rtype: float or None
+
+        """
+        if attempt >= self.retries or method not in self.methods:
+            return None
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        if self.max_elapsed is not None and elapsed + delay > self.max_elapsed:
+            return None
+        return delay
+
+
+class CircuitBreaker(object):
+    """
+    Fails fast while a server is failing instead of sending it requests.
+
+    The circuit opens after threshold consecutive failures. While it's open
+    requests raise CircuitOpenError. After reset_timeout seconds one trial
+    request is let through: if it succeeds the circuit closes, and if it
+    fails the circuit stays open for another reset_timeout.
+
+    :param threshold: Number of consecutive failures that opens the circuit.
+    :type threshold: int
+
+    :param reset_timeout: Seconds to wait before sending a trial request.
+        Defaults to 30.
+    :type reset_timeout: float
+
+    :param name: Name used in errors and log messages, e.g. the endpoint.
+    :type name: str
+
+    """
+    def __init__(self, threshold, reset_timeout=30, name=None):
+        assert threshold > 0
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """
+        Raises CircuitOpenError if the request shouldn't be sent.
+
+        :rtype: None
+
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return
+            now = monotonic()
+            if now - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError("Circuit open for %s" % self.name)
+            # let this request through as the trial, fail fast for the rest
+            self.opened_at = now
+
+    def record_success(self):
+        """
+        Closes the circuit.
+
+        :rtype: None
+
+        """
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        """
+        Records a failure, and opens the circuit if it's at the threshold.
+
+        :rtype: None
+
+        """
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                if self.opened_at is None:
+                    log.warning("Opening circuit for %s after %d failures",
+                                self.name, self.failures)
+                self.opened_at = monotonic()
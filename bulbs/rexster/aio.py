@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Async client and Graph for Rexster (Python 3.5+, requires aiohttp).
+
+"""
+from bulbs.aio import AsyncRequest, AsyncIndexMixin, AsyncGraph as BaseAsyncGraph, \
+    execute_script
+
+from .client import RexsterClient, RexsterResponse, RexsterResult
+from .index import VertexIndexProxy, EdgeIndexProxy, ManualIndex
+
+
+class AsyncRexsterRequest(AsyncRequest):
+    """Makes async HTTP requests to Rexster and returns a RexsterResponse."""
+
+    response_class = RexsterResponse
+
+
+class AsyncRexsterClient(RexsterClient):
+    """
+    Low-level client whose request methods are coroutines.
+
+    Only the methods that post-process the Response are overridden here, and
+    gremlin(), which may register the script first; the rest of the 
+    RexsterClient methods return the AsyncRequest coroutine as is.
+
+    :param config: Optional Config object. Defaults to default Config.
+    :type config: bulbs.config.Config
+
+    Example:
+
+    >>> from bulbs.rexster.aio import AsyncRexsterClient
+    >>> client = AsyncRexsterClient()
+    >>> script = client.scripts.get("get_vertices")
+    >>> response = await client.gremlin(script, params=None)
+    >>> result = response.results.next()
+
+    """
+    request_class = AsyncRexsterRequest
+
+    def gremlin(self, script, params=None, load=None, stream=False, read_only=False):
+        """
+        Executes a Gremlin script and returns the Response.
+
+        :param script: Gremlin script to execute.
+        :type script: str
+
+        :param params: Param bindings for the script.
+        :type params: dict
+
+        :rtype: coroutine
+
+        """
+        send = lambda script: self._send_gremlin(script, params, load, stream, read_only)
+        return execute_script(self.scripts, send, script)
+
+    async def get_or_create_vertex_index(self, index_name, index_params=None):
+        script = self.scripts.get('get_or_create_vertex_index')
+        params = dict(index_name=index_name, index_params=index_params)
+        resp = await self.gremlin(script, params)
+        result = {'name': index_name, 'type': 'manual', 'class': 'vertex'}
+        resp.results = RexsterResult(result, self.config)
+        return resp
+
+    async def get_or_create_edge_index(self, index_name, index_params=None):
+        script = self.scripts.get('get_or_create_edge_index')
+        params = dict(index_name=index_name, index_params=index_params)
+        resp = await self.gremlin(script, params)
+        result = {'name': index_name, 'type': 'manual', 'class': 'edge'}
+        resp.results = RexsterResult(result, self.config)
+        return resp
+
+    async def delete_edge_index(self, name):
+        """
+        Deletes the edge index with the index_name.
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :rtype: RexsterResponse
+
+        """
+        return await self.delete_index(name)
+
+    async def create_indexed_vertex(self, data, index_name, keys=None):
+        """
+        Creates a vertex, indexes it, and returns the Response.
+
+        :param data: Property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: RexsterResponse
+
+        """
+        data = self._remove_null_values(data)
+        params = dict(data=data,index_name=index_name,keys=keys)
+        script = self.scripts.get("create_indexed_vertex")
+        resp = await self.gremlin(script,params)
+        resp.results = resp.one()
+        return resp
+
+    async def create_indexed_edge(self, outV, label, inV, data, index_name, keys=None):
+        """
+        Creates a edge, indexes it, and returns the Response.
+
+        :param outV: Outgoing vertex ID.
+        :type outV: int
+
+        :param label: Edge label.
+        :type label: str
+
+        :param inV: Incoming vertex ID.
+        :type inV: int
+
+        :param data: Property data.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: RexsterResponse
+
+        """
+        data = self._remove_null_values(data)
+        edge_params = dict(outV=outV,label=label,inV=inV,label_var=self.config.label_var)
+        params = dict(data=data,index_name=index_name,keys=keys)
+        params.update(edge_params)
+        script = self.scripts.get("create_indexed_edge")
+        resp = await self.gremlin(script,params)
+        resp.results = resp.one()
+        return resp
+
+
+class AsyncVertexIndexProxy(VertexIndexProxy):
+    """Manage vertex indices on Rexster from an asyncio event loop."""
+
+    async def create(self, index_name):
+        resp = await self.client.create_vertex_index(index_name)
+        return self._add_index(index_name, resp)
+
+    async def get(self, index_name):
+        resp = await self.client.get_vertex_index(index_name)
+        if resp.results:
+            return self._add_index(index_name, resp)
+
+    async def get_or_create(self, index_name, index_params=None):
+        resp = await self.client.get_or_create_vertex_index(index_name, index_params)
+        return self._add_index(index_name, resp)
+
+    async def delete(self, index_name):
+        try:
+            return await self.client.delete_vertex_index(index_name)
+        except LookupError:
+            return None
+
+    def _add_index(self, index_name, resp):
+        index = self.index_class(self.client, resp.results)
+        self.client.registry.add_index(index_name, index)
+        return index
+
+
+class AsyncEdgeIndexProxy(EdgeIndexProxy):
+    """Manage edge indices on Rexster from an asyncio event loop."""
+
+    async def create(self, index_name, *args, **kwds):
+        resp = await self.client.create_edge_index(index_name, *args, **kwds)
+        return self._add_index(index_name, resp)
+
+    async def get(self, index_name):
+        resp = await self.client.get_edge_index(index_name)
+        if resp.results:
+            return self._add_index(index_name, resp)
+
+    async def get_or_create(self, index_name, index_params=None):
+        resp = await self.client.get_or_create_edge_index(index_name, index_params)
+        return self._add_index(index_name, resp)
+
+    async def delete(self, index_name):
+        try:
+            return await self.client.delete_edge_index(index_name)
+        except LookupError:
+            return None
+
+    def _add_index(self, index_name, resp):
+        index = self.index_class(self.client, resp.results)
+        self.client.registry.add_index(index_name, index)
+        return index
+
+
+class AsyncManualIndex(AsyncIndexMixin, ManualIndex):
+    """Rexster's manual index with coroutine lookups."""
+
+    @classmethod
+    def get_proxy_class(cls, base_type):
+        """
+        Returns the async IndexProxy class.
+
+        :param base_type: Index base type, either vertex or edge.
+        :type base_type: str
+
+        :rtype: class
+
+        """
+        class_map = dict(vertex=AsyncVertexIndexProxy, edge=AsyncEdgeIndexProxy)
+        return class_map[base_type]
+
+
+class AsyncGraph(BaseAsyncGraph):
+    """
+    The asyncio interface to Rexster.
+
+    :param config: Optional. Defaults to the default config.
+    :type config: bulbs.config.Config
+
+    Example:
+
+    >>> from bulbs.rexster.aio import AsyncGraph
+    >>> async with AsyncGraph() as g:
+    ...     james = await g.vertices.create(name="James")
+    ...     julie = await g.vertices.create(name="Julie")
+    ...     await g.edges.create(james, "knows", julie)
+
+    """
+    client_class = AsyncRexsterClient
+    default_index = AsyncManualIndex
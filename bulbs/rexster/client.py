@@ -12,12 +12,13 @@ from bulbs.registry import Registry
 from bulbs.utils import get_logger
 
 # specific to this client
-from bulbs.json import JSONTypeSystem
-from bulbs.base import Client, Response, Result 
-from bulbs.rest import Request, RESPONSE_HANDLERS
+from bulbs.base import Client, Response, Result, get_type_system
+from bulbs.codec import get_content_codec
+from bulbs.rest import Request, RESPONSE_HANDLERS, POST
+from bulbs.stream import StreamResponse
 from bulbs.groovy import GroovyScripts
 
-from bulbs.utils import json, build_path, get_file_path, urlsplit, coerce_id
+from bulbs.utils import build_path, get_file_path, urlsplit, coerce_id
 
 
 # The default URIs
@@ -36,6 +37,9 @@ gremlin_path = "tp/gremlin"
 transaction_path = "tp/batch/tx"
 multi_get_path = "tp/batch"
 
+# Keys of the element metadata Rexster includes with the property data
+private_keys = frozenset(['_id','_type','_outV','_inV','_label'])
+
 
 class RexsterResult(Result):
     """
@@ -51,14 +55,19 @@ class RexsterResult(Result):
     :ivar data: The data in the result.
 
     """
+    __slots__ = ['_id', '_properties']
+
     def __init__(self, result, config):
-        self.config = config
+        super(RexsterResult, self).__init__(result, config)
 
-        # The raw result.
-        self.raw = result
+        # Parsed out of the data on first access.
+        self._id = None
+        self._properties = None
 
-        # The data in the result.
-        self.data = result
+    @property
+    def data(self):
+        """The data in the result."""
+        return self.raw
 
     def get_id(self):
         """
@@ -67,10 +76,10 @@ class RexsterResult(Result):
         :rtype: int or str
 
         """
-        _id = self.data['_id']
-
-        # OrientDB uses string IDs
-        return coerce_id(_id)
+        if self._id is None:
+            # OrientDB uses string IDs
+            self._id = coerce_id(self.data['_id'])
+        return self._id
                
     def get_type(self):
         """
@@ -88,13 +97,13 @@ class RexsterResult(Result):
         :rtype: dict
 
         """
-        property_data = dict()
-        private_keys = ['_id','_type','_outV','_inV','_label']
-        for key in self.data: # Python 3
-            value = self.data[key]
-            if key not in private_keys:
-                property_data.update({key:value})
-        return property_data
+        if self._properties is None:
+            property_data = dict()
+            for key in self.data: # Python 3
+                if key not in private_keys:
+                    property_data[key] = self.data[key]
+            self._properties = property_data
+        return self._properties
 
     def get_uri(self):
         """
@@ -250,7 +259,9 @@ class RexsterResponse(Response):
         headers, content = response
 
         if content:
-            content = json.loads(content.decode('utf-8'))
+            # Errors may be returned as JSON if the type system is binary
+            codec = get_content_codec(self.config, headers.get('content-type'))
+            content = codec.loads(content)
             return content
 
     def get_results(self):
@@ -275,11 +286,23 @@ class RexsterResponse(Response):
         return results, total_size
 
 
+class RexsterStreamResponse(StreamResponse, RexsterResponse):
+    """
+    RexsterResponse whose results are decoded as the HTTP body is read.
+
+    Rexster returns lists of results as a JSON array in the "results" key.
+
+    """
+    stream_path = "results"
+
+
 class RexsterRequest(Request):
     """Makes HTTP requests to Rexster and returns a RexsterResponse.""" 
     
     response_class = RexsterResponse
 
+    stream_response_class = RexsterStreamResponse
+
 
 class RexsterClient(Client):
     """
@@ -294,7 +317,7 @@ class RexsterClient(Client):
     :ivar config: Config object.
     :ivar registry: Registry object.
     :ivar scripts: GroovyScripts object.  
-    :ivar type_system: JSONTypeSystem object.
+    :ivar type_system: TypeSystem object selected by Config.type_system.
     :ivar request: RexsterRequest object.
 
     Example:
@@ -317,7 +340,7 @@ class RexsterClient(Client):
 
         self.config = config or Config(uri)
         self.registry = Registry(self.config)
-        self.type_system = JSONTypeSystem()
+        self.type_system = get_type_system(getattr(self.config, "type_system", "json"))
         self.request = self.request_class(self.config, self.type_system.content_type)
 
         # Rexster supports Gremlin so include the Gremlin-Groovy script library
@@ -337,7 +360,7 @@ class RexsterClient(Client):
 
     # Gremlin
 
-    def gremlin(self, script, params=None, load=None): 
+    def gremlin(self, script, params=None, load=None, stream=False, read_only=False): 
         """
         Executes a Gremlin script and returns the Response.
 
@@ -347,13 +370,26 @@ class RexsterClient(Client):
         :param params: Param bindings for the script.
         :type params: dict
 
+        :param stream: If True, decode the results as they're read. Defaults to False.
+        :type stream: bool
+
+        :param read_only: True if the script doesn't modify the database so it 
+            can be sent to a read replica. Defaults to False.
+        :type read_only: bool
+
         :rtype: RexsterResponse
 
         """
+        send = lambda script: self._send_gremlin(script, params, load, stream, read_only)
+        return self.scripts.execute(send, script)
+
+    def _send_gremlin(self, script, params, load, stream, read_only):
         params = dict(script=script, params=params)
         if self.config.server_scripts is True:
             params["load"] = load or [self.scripts.default_namespace]
-        return self.request.post(gremlin_path, params)
+        if stream:
+            return self.request.stream(POST, gremlin_path, params, read_only)
+        return self.request.post(gremlin_path, params, read_only)
 
 
     # Vertex Proxy
@@ -387,16 +423,19 @@ class RexsterClient(Client):
         path = build_path(vertex_path,_id)
         return self.request.get(path,params=None)
 
-    def get_all_vertices(self):
+    def get_all_vertices(self, stream=False):
         """
         Returns a Response containing all the vertices in the Graph.
 
+        :param stream: If True, decode the results as they're read. Defaults to False.
+        :type stream: bool
+
         :rtype: RexsterResponse
 
         """
         script = self.scripts.get("get_vertices")
         params = None
-        return self.gremlin(script, params)
+        return self.gremlin(script, params, stream=stream, read_only=True)
 
     def update_vertex(self, _id, data, keys=None):
         """
@@ -470,16 +509,19 @@ class RexsterClient(Client):
         path = build_path(edge_path, _id)
         return self.request.get(path, params=None)
 
-    def get_all_edges(self):
+    def get_all_edges(self, stream=False):
         """
         Returns a Response containing all the edges in the Graph.
 
+        :param stream: If True, decode the results as they're read. Defaults to False.
+        :type stream: bool
+
         :rtype: RexsterResponse
 
         """
         script = self.scripts.get("get_edges")
         params = None
-        return self.gremlin(script, params)
+        return self.gremlin(script, params, stream=stream, read_only=True)
 
     def update_edge(self,_id, data, keys=None):
         """
@@ -528,7 +570,7 @@ class RexsterClient(Client):
         """
         script = self.scripts.get('outE')
         params = dict(_id=_id,label=label,start=start,limit=limit)
-        return self.gremlin(script,params)
+        return self.gremlin(script, params, read_only=True)
 
     def inE(self,_id, label=None, start=None, limit=None):
         """
@@ -545,7 +587,7 @@ class RexsterClient(Client):
         """
         script = self.scripts.get('inE')
         params = dict(_id=_id,label=label,start=start,limit=limit)
-        return self.gremlin(script,params)
+        return self.gremlin(script, params, read_only=True)
 
     def bothE(self,_id, label=None, start=None, limit=None):
         """
@@ -562,7 +604,7 @@ class RexsterClient(Client):
         """
         script = self.scripts.get('bothE')
         params = dict(_id=_id,label=label,start=start,limit=limit)
-        return self.gremlin(script,params)
+        return self.gremlin(script, params, read_only=True)
 
     def outV(self,_id, label=None, start=None, limit=None):
         """
@@ -579,7 +621,7 @@ class RexsterClient(Client):
         """
         script = self.scripts.get('outV')
         params = dict(_id=_id,label=label,start=start,limit=limit)
-        return self.gremlin(script,params)
+        return self.gremlin(script, params, read_only=True)
         
     def inV(self,_id, label=None, start=None, limit=None):
         """
@@ -596,7 +638,7 @@ class RexsterClient(Client):
         """
         script = self.scripts.get('inV')
         params = dict(_id=_id,label=label,start=start,limit=limit)
-        return self.gremlin(script,params)
+        return self.gremlin(script, params, read_only=True)
         
     def bothV(self,_id, label=None, start=None, limit=None):
         """
@@ -613,7 +655,7 @@ class RexsterClient(Client):
         """
         script = self.scripts.get('bothV')
         params = dict(_id=_id,label=label,start=start,limit=limit)
-        return self.gremlin(script,params)
+        return self.gremlin(script, params, read_only=True)
 
     # Index Proxy - General
 
@@ -736,6 +778,29 @@ class RexsterClient(Client):
         """
         self.delete_index(name)
 
+    # Index Proxy - Bulk
+
+    def get_or_create_indices(self, indices):
+        """
+        Gets or creates the indices with one Gremlin script.
+
+        :param indices: List of (index_name, index_class, index_params) tuples,
+            where index_class is either "vertex" or "edge".
+        :type indices: list
+
+        :rtype: RexsterResponse with a result for each index
+
+        """
+        script = self.scripts.get('get_or_create_indices')
+        params = dict(indices=[list(index) for index in indices])
+        resp = self.gremlin(script, params)
+        results = []
+        for index_name, index_class, index_params in indices:
+            result = {'name': index_name, 'type': 'manual', 'class': index_class}
+            results.append(RexsterResult(result, self.config))
+        resp.results = results
+        return resp
+
     #def create_automatic_vertex_index(self,index_name,element_class,keys=None):
     #    keys = json.dumps(keys) if keys else "null"
     #    params = dict(index_name=index_name,element_class=element_class,keys=keys)
@@ -930,6 +995,28 @@ class RexsterClient(Client):
         resp = self.gremlin(script,params)
         resp.results = resp.one()
         return resp
+
+    def create_indexed_vertices(self, data_list, index_name, keys=None):
+        """
+        Creates the vertices in one transaction, indexes them, and returns the 
+        Response, which has the vertices in the order of the data.
+
+        :param data_list: Property data dicts.
+        :type data_list: list
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: RexsterResponse
+
+        """
+        data_list = [self._remove_null_values(data) for data in data_list]
+        params = dict(data_list=data_list,index_name=index_name,keys=keys)
+        script = self.scripts.get("create_indexed_vertices")
+        return self.gremlin(script,params)
     
     def update_indexed_vertex(self, _id, data, index_name, keys=None):
         """
@@ -955,6 +1042,32 @@ class RexsterClient(Client):
         script = self.scripts.get("update_indexed_vertex")
         return self.gremlin(script,params)
 
+    def patch_indexed_vertex(self, _id, data, index_name, keys=None):
+        """
+        Updates the changed properties of an indexed vertex, reindexes only 
+        those keys, and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param data: Changed property data. Properties set to None are removed.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: RexsterResponse
+
+        """
+        removed = self._get_null_keys(data)
+        data = self._remove_null_values(data)
+        params = dict(_id=_id,data=data,removed=removed,index_name=index_name,keys=keys)
+        script = self.scripts.get("patch_indexed_vertex")
+        return self.gremlin(script,params)
+
     # Model Proxy - Edge
 
     def create_indexed_edge(self, outV, label, inV, data, index_name, keys=None):
@@ -990,6 +1103,32 @@ class RexsterClient(Client):
         resp = self.gremlin(script,params)
         resp.results = resp.one()
         return resp
+
+    def create_indexed_edges(self, label, edges, index_name, keys=None):
+        """
+        Creates the edges in one transaction, indexes them, and returns the 
+        Response, which has the edges in the order they were passed in.
+
+        :param label: Edge label.
+        :type label: str
+
+        :param edges: List of (outV, inV, data) tuples.
+        :type edges: list
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: RexsterResponse
+
+        """
+        edges = [(outV, inV, self._remove_null_values(data)) for outV, inV, data in edges]
+        params = dict(label=label,edges=edges,index_name=index_name,keys=keys,
+                      label_var=self.config.label_var)
+        script = self.scripts.get("create_indexed_edges")
+        return self.gremlin(script,params)
         
     def update_indexed_edge(self, _id, data, index_name, keys=None):
         """
@@ -1015,6 +1154,32 @@ class RexsterClient(Client):
         script = self.scripts.get("update_indexed_edge")
         return self.gremlin(script,params)
 
+    def patch_indexed_edge(self, _id, data, index_name, keys=None):
+        """
+        Updates the changed properties of an indexed edge, reindexes only 
+        those keys, and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :param data: Changed property data. Properties set to None are removed.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: RexsterResponse
+
+        """
+        removed = self._get_null_keys(data)
+        data = self._remove_null_values(data)
+        params = dict(_id=_id,data=data,removed=removed,index_name=index_name,keys=keys)
+        script = self.scripts.get("patch_indexed_edge")
+        return self.gremlin(script,params)
+
     # Utils
 
     def warm_cache(self):
@@ -1038,12 +1203,32 @@ class RexsterClient(Client):
     # TODO: manual/custom index API
 
     def multi_get_vertices(self, id_list):
+        """
+        Gets the vertices with the IDs via Rexster's batch extension and returns 
+        the Response. The vertices that don't exist aren't returned.
+
+        :param id_list: Vertex IDs.
+        :type id_list: list
+
+        :rtype: RexsterResponse
+
+        """
         path = build_path(multi_get_path,"vertices")
         idList = self._build_url_list(id_list)
         params = dict(idList=idList)
         return self.request.get(path,params)
 
     def multi_get_edges(self, id_list):
+        """
+        Gets the edges with the IDs via Rexster's batch extension and returns 
+        the Response. The edges that don't exist aren't returned.
+
+        :param id_list: Edge IDs.
+        :type id_list: list
+
+        :rtype: RexsterResponse
+
+        """
         path = build_path(multi_get_path,"edges")
         idList = self._build_url_list(id_list)
         params = dict(idList=idList)
@@ -1058,6 +1243,10 @@ class RexsterClient(Client):
         params = dict(tx=transaction.actions)
         return self.request.post(self.transction_path,params)
 
+    def _get_null_keys(self, data):
+        """Returns the keys of properties set to null, which are removed."""
+        return [key for key in data if data[key] is None]
+
     def _remove_null_values(self, data):
         """Removes null property values because they aren't valid in Neo4j."""
         # using PUTs to overwrite all properties so no need
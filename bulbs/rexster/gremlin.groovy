@@ -34,6 +34,35 @@ def create_indexed_vertex(data,index_name,keys) {
   return transaction(createIndexedVertex);
 }
 
+// Creates the vertices in one transaction and returns them in order.
+def create_indexed_vertices(data_list,index_name,keys) {
+  def createIndexedVertices = {
+    index = g.idx(index_name)
+    vertices = []
+    for (data in data_list) {
+      vertex = g.addVertex()
+      for (entry in data.entrySet()) {
+        if (entry.value == null) continue;
+        vertex.setProperty(entry.key,entry.value)
+        if (keys == null || keys.contains(entry.key))
+	  index.put(entry.key,String.valueOf(entry.value),vertex)
+      }
+      vertices.add(vertex)
+    }
+    return vertices
+  }
+  def transaction = { final Closure closure ->
+    try {
+      results = closure();
+      g.commit();
+      return results; 
+    } catch (e) {
+      g.rollback();
+      throw e;
+    }
+  }
+  return transaction(createIndexedVertices);
+}
 
 def update_indexed_vertex(_id, data, index_name, keys) {
   def updateIndexedVertex = { 
@@ -69,6 +98,38 @@ def update_indexed_vertex(_id, data, index_name, keys) {
   return transaction(updateIndexedVertex);
 }
 
+def patch_indexed_vertex(_id, data, removed, index_name, keys) {
+  def patchIndexedVertex = {
+    vertex = g.v(_id);
+    index = g.idx(index_name);
+    // only the changed keys are removed from and added to the index
+    for (String key in removed + data.keySet()) {
+      value = vertex.getProperty(key);
+      if (value != null && (keys == null || keys.contains(key)))
+	index.remove(key, String.valueOf(value), vertex);
+    }
+    for (String key in removed)
+      vertex.removeProperty(key);
+    for (entry in data.entrySet()) {
+      vertex.setProperty(entry.key, entry.value);
+      if (keys == null || keys.contains(entry.key))
+	index.put(entry.key, String.valueOf(entry.value), vertex);
+    }
+    return vertex;
+  }
+  def transaction = { final Closure closure ->
+    try {
+      results = closure();
+      g.commit();
+      return results; 
+    } catch (e) {
+      g.rollback();
+      throw e;
+    }
+  }
+  return transaction(patchIndexedVertex);
+}
+
 
 // Model Proxy - Edge
 
@@ -98,6 +159,38 @@ def create_indexed_edge(outV,label,inV,data,index_name,keys,label_var) {
   return transaction(createIndexedEdge);
 }
 
+// Creates the edges, a list of [outV, inV, data], in one transaction and
+// returns them in order.
+def create_indexed_edges(label,edges,index_name,keys,label_var) {
+  def createIndexedEdges = {
+    index = g.idx(index_name)
+    results = []
+    for (item in edges) {
+      edge = g.addEdge(g.v(item[0]),g.v(item[1]),label)
+      for (entry in item[2].entrySet()) {
+        if (entry.value == null) continue;
+        edge.setProperty(entry.key,entry.value)
+        if (keys == null || keys.contains(entry.key))
+	  index.put(entry.key,String.valueOf(entry.value),edge)
+      }
+      index.put(label_var,String.valueOf(label),edge)
+      results.add(edge)
+    }
+    return results
+  }
+  def transaction = { final Closure closure ->
+    try {
+      results = closure();
+      g.commit();
+      return results; 
+    } catch (e) {
+      g.rollback();
+      throw e;
+    }
+  }
+  return transaction(createIndexedEdges);
+}
+
 // don't need to update indexed label, it can't change
 def update_indexed_edge(_id, data, index_name, keys) {
   def updateIndexedEdge = {
@@ -130,3 +223,35 @@ def update_indexed_edge(_id, data, index_name, keys) {
   }
   return transaction(updateIndexedEdge);
 }
+
+def patch_indexed_edge(_id, data, removed, index_name, keys) {
+  def patchIndexedEdge = {
+    edge = g.e(_id);
+    index = g.idx(index_name);
+    // only the changed keys are removed from and added to the index
+    for (String key in removed + data.keySet()) {
+      value = edge.getProperty(key);
+      if (value != null && (keys == null || keys.contains(key)))
+	index.remove(key, String.valueOf(value), edge);
+    }
+    for (String key in removed)
+      edge.removeProperty(key);
+    for (entry in data.entrySet()) {
+      edge.setProperty(entry.key, entry.value);
+      if (keys == null || keys.contains(entry.key))
+	index.put(entry.key, String.valueOf(entry.value), edge);
+    }
+    return edge;
+  }
+  def transaction = { final Closure closure ->
+    try {
+      results = closure();
+      g.commit();
+      return results; 
+    } catch (e) {
+      g.rollback();
+      throw e;
+    }
+  }
+  return transaction(patchIndexedEdge);
+}
@@ -7,7 +7,10 @@
 An interface for interacting with indices on Rexster.
 
 """
-from bulbs.utils import initialize_element, initialize_elements, get_one_result
+from bulbs.utils import initialize_element, initialize_elements, get_one_result, \
+    expire_lookup
+from bulbs.factory import evict_index
+from bulbs.element import lookup_elements
 
 
 class IndexProxy(object):
@@ -19,6 +22,15 @@ class IndexProxy(object):
 
         # The Client object for the database.
         self.client = client
+
+    def get_index_params(self):
+        """
+        Returns the params used to create the index.
+
+        :rtype: dict or None
+
+        """
+        return None
     
 
 class VertexIndexProxy(IndexProxy):
@@ -92,6 +104,7 @@ class VertexIndexProxy(IndexProxy):
         :rtype: bulbs.rexster.client.RexsterResponse
 
         """
+        evict_index(self.client, "vertex", index_name)
         try:
             return self.client.delete_vertex_index(index_name)
         except LookupError:
@@ -172,6 +185,7 @@ class EdgeIndexProxy(IndexProxy):
         :rtype: bulbs.rexster.client.RexsterResponse
 
         """
+        evict_index(self.client, "edge", index_name)
         try:
             return self.client.delete_edge_index(index_name)
         except LookupError:
@@ -263,6 +277,17 @@ class Index(object):
         method = getattr(self.client, method_name)
         return method
 
+    def _caches_lookups(self):
+        # The server writes to automatic indices, so their cached lookups 
+        # couldn't be kept current.
+        return self.client.cache is not None and self.index_type == "manual"
+
+    def _lookup_elements(self, key, value):
+        load = lambda: self.client.lookup_vertex(self.index_name, key, value)
+        multi_get = self._get_method(vertex="multi_get_vertices", edge="multi_get_edges")
+        return lookup_elements(self.client, self.index_class, self.index_name,
+                               key, value, load, multi_get)
+
     def lookup(self, key=None, value=None, **pair):
         """
         Return a generator containing all the elements with key property equal 
@@ -282,6 +307,11 @@ class Index(object):
                      the form of name='James'.
         """
         key, value = self._get_key_value(key, value, pair)
+        if self._caches_lookups():
+            elements = self._lookup_elements(key, value)
+            if elements:
+                return (element for element in elements)
+            return None
         resp = self.client.lookup_vertex(self.index_name,key,value)
         return initialize_elements(self.client,resp)
 
@@ -340,6 +370,7 @@ class ManualIndex(Index):
         key, value = self._get_key_value(key,value,pair)
         put = self._get_method(vertex="put_vertex", edge="put_edge")
         resp = put(self.index_name,key,value,_id)
+        expire_lookup(self.client, self.index_class, self.index_name, key, value)
         return resp
 
     def update(self,_id,key=None,value=None,**pair):
@@ -360,8 +391,8 @@ class ManualIndex(Index):
                      the form of name='James'.
         """
         key, value = self._get_key_value(key,value,pair)
-        for result in self.get(key,value):
-            self.remove(self.index_name, result._id, key, value)
+        for element in self.lookup(key, value) or []:
+            self.remove(element._id, key, value)
         return self.put(_id,key,value)
 
 
@@ -403,6 +434,9 @@ class ManualIndex(Index):
                      the form of name='James'.
         """
         key, value = self._get_key_value(key,value,pair)
+        if self._caches_lookups():
+            elements = self._lookup_elements(key, value)
+            return elements[0] if elements else None
         resp = self.client.lookup_vertex(self.index_name,key,value)
         if resp.total_size > 0:
             result = get_one_result(resp)
@@ -426,7 +460,9 @@ class ManualIndex(Index):
         """
         key, value = self._get_key_value(key, value, pair)
         remove = self._get_method(vertex="remove_vertex", edge="remove_edge")
-        return remove(self.index_name,_id,key,value)
+        resp = remove(self.index_name,_id,key,value)
+        expire_lookup(self.client, self.index_class, self.index_name, key, value)
+        return resp
 
 
 class AutomaticIndex(Index):
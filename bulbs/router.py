@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Routes reads across read replicas and everything else to the master.
+
+The master is Config.root_uri. Replicas are added with Config.add_endpoint().
+
+"""
+import itertools
+import threading
+
+from .utils import get_logger
+from .retry import monotonic
+
+
+log = get_logger(__name__)
+
+# Endpoint roles
+MASTER = "master"
+REPLICA = "replica"
+
+# Load balancing strategies
+ROUND_ROBIN = "round_robin"
+LEAST_OUTSTANDING = "least_outstanding"
+
+
+class Endpoint(object):
+    """
+    A read replica.
+
+    :param uri: Root URI of the replica.
+    :type uri: str
+
+    :ivar outstanding: Number of requests in flight.
+    :ivar ejected_until: Time until which the replica isn't used.
+
+    """
+    def __init__(self, uri):
+        self.uri = uri.rstrip("/")
+        self.outstanding = 0
+        self.ejected_until = 0
+
+    def is_available(self, now):
+        return now >= self.ejected_until
+
+
+class Router(object):
+    """
+    Chooses the endpoint for each request.
+
+    Read-only requests are balanced across the replicas that haven't been
+    ejected, round robin or by least outstanding requests. Writes, and reads
+    when no replica is available, go to the master.
+
+    :param config: Config object.
+    :type config: bulbs.config.Config
+
+    :raises: ValueError if the load balancer is unknown.
+
+    """
+    def __init__(self, config):
+        self.config = config
+        self.replicas = [Endpoint(uri) for uri, role
+                         in getattr(config, "endpoints", []) if role == REPLICA]
+        self.load_balancer = getattr(config, "load_balancer", ROUND_ROBIN)
+        self.eject_timeout = getattr(config, "eject_timeout", 30)
+        if self.load_balancer not in (ROUND_ROBIN, LEAST_OUTSTANDING):
+            raise ValueError("Unknown load balancer: %s" % self.load_balancer)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def get_endpoint(self, read_only):
+        """
+        Returns the replica for the request, or None for the master.
+
+        :param read_only: True if the request doesn't modify the database.
+        :type read_only: bool
+
+        :rtype: Endpoint or None
+
+        """
+        if not read_only or not self.replicas:
+            return None
+        now = monotonic()
+        available = [replica for replica in self.replicas if replica.is_available(now)]
+        if not available:
+            return None
+        if self.load_balancer == LEAST_OUTSTANDING:
+            return min(available, key=lambda replica: replica.outstanding)
+        return available[next(self._counter) % len(available)]
+
+    def get_uri(self, endpoint, uri):
+        """
+        Returns the URI rewritten to the endpoint.
+
+        :param endpoint: Replica, or None for the master.
+        :type endpoint: Endpoint or None
+
+        :param uri: URI built from the master's root URI.
+        :type uri: str
+
+        :rtype: str
+
+        """
+        if endpoint is None:
+            return uri
+        root_uri = self.config.root_uri.rstrip("/")
+        return endpoint.uri + uri[len(root_uri):]
+
+    def begin(self, endpoint):
+        if endpoint is not None:
+            with self._lock:
+                endpoint.outstanding += 1
+
+    def end(self, endpoint):
+        if endpoint is not None:
+            with self._lock:
+                endpoint.outstanding -= 1
+
+    def eject(self, endpoint):
+        """
+        Stops sending requests to the replica for eject_timeout seconds.
+
+        :param endpoint: Replica.
+        :type endpoint: Endpoint
+
+        :rtype: None
+
+        """
+        log.warning("Ejecting %s for %ss", endpoint.uri, self.eject_timeout)
+        endpoint.ejected_until = monotonic() + self.eject_timeout
+
+    # the lock can't be pickled
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_counter']
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Identity map that makes each element load once per session.
+
+Sessions are opt-in and scoped to the thread that opened them, so a Graph
+shared by the threads of a web server can open one session per request.
+
+"""
+import threading
+
+
+# The open session for each client, per thread
+_local = threading.local()
+
+
+def get_session(client):
+    """
+    Returns the session open for the client in this thread.
+
+    :param client: Client object.
+    :type client: bulbs.base.client.Client
+
+    :rtype: Session or None
+
+    """
+    sessions = getattr(_local, "sessions", None)
+    if sessions:
+        return sessions.get(id(client))
+
+
+def get_key(base_type, _id):
+    # IDs are keyed as strings so 1 and "1" map to the same element
+    return (base_type, str(_id))
+
+
+class Session(object):
+    """
+    Maps (type, ID) to the element loaded in the session.
+
+    While the session is open, gets and traversals return the element already
+    in the session instead of initializing a new one, and gets of elements in
+    the session don't go to the server. Elements are expired from the session
+    when they're saved, updated or deleted.
+
+    :param client: Client object.
+    :type client: bulbs.base.client.Client
+
+    :ivar identity_map: Dict of elements keyed by (type, ID).
+
+    Example:
+
+    >>> from bulbs.neo4jserver import Graph
+    >>> g = Graph()
+    >>> with g.session():
+    ...     james = g.vertices.get(1)
+    ...     assert g.vertices.get(1) is james
+
+    """
+    def __init__(self, client):
+        self.client = client
+        self.identity_map = {}
+        self._previous = None
+
+    def get(self, base_type, _id):
+        """
+        Returns the element in the session.
+
+        :param base_type: Base type, either "vertex" or "edge".
+        :type base_type: str
+
+        :param _id: Element ID.
+        :type _id: int or str
+
+        :rtype: Element or None
+
+        """
+        return self.identity_map.get(get_key(base_type, _id))
+
+    def add(self, element):
+        """
+        Adds the element to the session.
+
+        :param element: Initialized element.
+        :type element: Element
+
+        :rtype: None
+
+        """
+        key = get_key(element.get_base_type(), element._id)
+        self.identity_map[key] = element
+
+    def expire(self, base_type, _id):
+        """
+        Removes the element from the session so it's loaded again.
+
+        :param base_type: Base type, either "vertex" or "edge".
+        :type base_type: str
+
+        :param _id: Element ID.
+        :type _id: int or str
+
+        :rtype: None
+
+        """
+        self.identity_map.pop(get_key(base_type, _id), None)
+
+    def clear(self):
+        """
+        Removes all the elements from the session.
+
+        :rtype: None
+
+        """
+        self.identity_map.clear()
+
+    def open(self):
+        """
+        Makes this the client's session in this thread.
+
+        :rtype: Session
+
+        """
+        if not hasattr(_local, "sessions"):
+            _local.sessions = {}
+        self._previous = _local.sessions.get(id(self.client))
+        _local.sessions[id(self.client)] = self
+        return self
+
+    def close(self):
+        """
+        Closes the session, restoring the session it was opened in, if any.
+
+        :rtype: None
+
+        """
+        sessions = getattr(_local, "sessions", {})
+        if sessions.get(id(self.client)) is self:
+            if self._previous is not None:
+                sessions[id(self.client)] = self._previous
+            else:
+                del sessions[id(self.client)]
+        self._previous = None
+        self.clear()
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
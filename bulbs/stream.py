@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Streaming responses whose results are decoded as the HTTP body is read.
+
+The server returns large result sets as a JSON array -- either the entire
+body (Neo4j Server) or the value of a key in the body (Rexster's "results").
+ArrayParser scans the body incrementally and decodes each array element as
+soon as it's complete, so only one element is held in memory at a time.
+
+"""
+import re
+import base64
+
+import six
+import httplib2
+from six.moves import http_client
+
+from .codec import get_codec, get_content_codec
+from .compression import ACCEPT_ENCODING, get_decompressor
+from .utils import get_logger, urlsplit
+
+
+log = get_logger(__name__)
+
+# Parser modes
+ARRAY = "array"
+DOCUMENT = "document"
+
+# JSON syntax the parser has to track; everything else is skipped over
+whitespace_pattern = re.compile(br"[ \t\n\r]*")
+special_pattern = re.compile(br"[\"\[\]{},:]")
+string_pattern = re.compile(br"[\"\\]")
+
+
+class ArrayParser(object):
+    """
+    Incremental parser that decodes the elements of a JSON array.
+
+    :param loads: Function that decodes a JSON document, e.g. Codec.loads.
+    :type loads: function
+
+    :param key: Key of the array in the top-level object, or None if the
+                document itself is the array. Defaults to None.
+    :type key: str or None
+
+    :ivar mode: None until enough of the body has been read to know whether
+                it contains the array; then ARRAY or DOCUMENT.
+    :ivar done: True once the end of the array has been read.
+
+    """
+    def __init__(self, loads, key=None):
+        self.loads = loads
+        self.key = key.encode('utf-8') if key is not None else None
+        self.mode = None
+        self.done = False
+        self._buffer = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._string_start = None
+        self._string = None
+        self._expect_value = False
+        self._start = None
+
+    @property
+    def buffer(self):
+        """The unparsed bytes; in DOCUMENT mode, all the bytes fed so far."""
+        return bytes(self._buffer)
+
+    def feed(self, data):
+        """
+        Feeds the next chunk of the body and returns the elements it completed.
+
+        :param data: The next chunk of the body.
+        :type data: bytes
+
+        :rtype: list
+
+        """
+        if self.done:
+            return []
+        self._buffer.extend(data)
+        if self.mode is None:
+            self._find_array()
+        if self.mode == ARRAY:
+            return self._scan()
+        return []
+
+    def _find_array(self):
+        buf = self._buffer
+        if self._depth == 0:
+            pos = whitespace_pattern.match(buf).end()
+            if pos == len(buf):
+                return
+            first = buf[pos:pos+1]
+            if self.key is None and first == b"[":
+                return self._enter_array(pos)
+            if self.key is None or first != b"{":
+                return self._set_document()
+            self._depth = 1
+            self._pos = pos + 1
+        while self.mode is None:
+            pos = self._pos
+            if self._expect_value:
+                pos = whitespace_pattern.match(buf, pos).end()
+                if pos >= len(buf):
+                    return
+                if buf[pos:pos+1] == b"[":
+                    return self._enter_array(pos)
+                return self._set_document()
+            if self._in_string:
+                if not self._skip_string():
+                    return
+                if self._depth == 1:
+                    self._string = bytes(buf[self._string_start:self._pos-1])
+                continue
+            match = special_pattern.search(buf, pos)
+            if match is None:
+                self._pos = max(pos, len(buf))
+                return
+            char, self._pos = match.group(), match.end()
+            if char == b"\"":
+                self._in_string = True
+                self._string_start = self._pos
+            elif char in (b"{", b"["):
+                self._depth += 1
+            elif char in (b"}", b"]"):
+                self._depth -= 1
+                if self._depth == 0:
+                    # the key isn't in the document
+                    return self._set_document()
+            elif char == b":" and self._depth == 1:
+                self._expect_value = (self._string == self.key)
+
+    def _enter_array(self, pos):
+        # only the array's elements need to be kept from here on
+        del self._buffer[:pos+1]
+        self.mode = ARRAY
+        self._pos = 0
+        self._depth = 0
+
+    def _set_document(self):
+        self.mode = DOCUMENT
+
+    def _skip_string(self):
+        # Returns True if the end of the string was found
+        buf = self._buffer
+        while True:
+            match = string_pattern.search(buf, self._pos)
+            if match is None:
+                self._pos = max(self._pos, len(buf))
+                return False
+            if match.group() == b"\\":
+                # skip the escaped character, which may be in the next chunk
+                self._pos = match.end() + 1
+                continue
+            self._pos = match.end()
+            self._in_string = False
+            return True
+
+    def _scan(self):
+        values = []
+        buf = self._buffer
+        while True:
+            if self._in_string:
+                if not self._skip_string():
+                    break
+                continue
+            pos = self._pos
+            if self._start is None:
+                pos = whitespace_pattern.match(buf, pos).end()
+                if pos >= len(buf):
+                    self._pos = pos
+                    break
+                char = buf[pos:pos+1]
+                if char == b"]":
+                    self.done = True
+                    break
+                if char == b",":
+                    self._pos = pos + 1
+                    continue
+                self._start = pos
+            match = special_pattern.search(buf, pos)
+            if match is None:
+                self._pos = max(pos, len(buf))
+                break
+            char, self._pos = match.group(), match.end()
+            if char == b"\"":
+                self._in_string = True
+            elif char in (b"{", b"["):
+                self._depth += 1
+            elif char in (b"}", b"]") and self._depth > 0:
+                self._depth -= 1
+            elif char in (b",", b"]") and self._depth == 0:
+                values.append(self.loads(bytes(buf[self._start:match.start()])))
+                self._start = None
+                if char == b"]":
+                    self.done = True
+                    break
+        self._compact()
+        return values
+
+    def _compact(self):
+        # discard the elements that have been decoded
+        end = self._pos if self._start is None else self._start
+        end = min(end, len(self._buffer))
+        if end:
+            del self._buffer[:end]
+            self._pos -= end
+            if self._start is not None:
+                self._start -= end
+
+
+class BodyStream(object):
+    """
+    Iterates over the chunks of an HTTP response body as they're received.
+
+    :param connection: The connection the response was received on.
+    :type connection: http.client.HTTPConnection
+
+    :param response: The response.
+    :type response: http.client.HTTPResponse
+
+    :param chunk_size: Maximum size of each chunk in bytes.
+    :type chunk_size: int
+
+    """
+    def __init__(self, connection, response, chunk_size):
+        self.connection = connection
+        self.response = response
+        self.chunk_size = chunk_size
+        encoding = response.getheader('content-encoding')
+        self.decompressor = get_decompressor(encoding)
+
+    def __iter__(self):
+        while True:
+            chunk = self.response.read(self.chunk_size)
+            if not chunk:
+                break
+            chunk = self._decompress(chunk)
+            if chunk:
+                yield chunk
+        if self.decompressor is not None:
+            yield self.decompressor.flush()
+
+    def read(self):
+        """
+        Returns the rest of the body.
+
+        :rtype: bytes
+
+        """
+        content = self._decompress(self.response.read())
+        if self.decompressor is not None:
+            content += self.decompressor.flush()
+        return content
+
+    def _decompress(self, chunk):
+        if self.decompressor is None:
+            return chunk
+        return self.decompressor.decompress(chunk)
+
+    def close(self):
+        """
+        Closes the response and its connection.
+
+        :rtype: None
+
+        """
+        self.response.close()
+        self.connection.close()
+
+
+def open_stream(uri, method, body, headers, config, chunk_size):
+    """
+    Sends an HTTP request and returns the response before its body is read.
+
+    :param uri: Request URI.
+    :type uri: str
+
+    :param method: HTTP method.
+    :type method: str
+
+    :param body: Request body or None.
+    :type body: str or bytes
+
+    :param headers: Request headers.
+    :type headers: dict
+
+    :param config: Config object.
+    :type config: bulbs.config.Config
+
+    :param chunk_size: Maximum size of each chunk of the body in bytes.
+    :type chunk_size: int
+
+    :return: A tuple containing the httplib2.Response headers and a BodyStream.
+    :rtype: tuple
+
+    """
+    parts = urlsplit(uri)
+    connection_class = http_client.HTTPConnection
+    if parts.scheme == "https":
+        connection_class = http_client.HTTPSConnection
+    connection = connection_class(parts.hostname, parts.port, timeout=config.timeout)
+    path = parts.path or "/"
+    if parts.query:
+        path = "%s?%s" % (path, parts.query)
+    headers = dict(headers)
+    headers['Accept-Encoding'] = ACCEPT_ENCODING
+    if config.username and config.password:
+        # httplib2 waits for the challenge; send the credentials up front
+        credentials = "%s:%s" % (config.username, config.password)
+        token = base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+        headers['Authorization'] = "Basic %s" % token
+    if isinstance(body, six.text_type):
+        body = body.encode('utf-8')
+    try:
+        connection.request(method, path, body, headers)
+        response = connection.getresponse()
+    except Exception:
+        connection.close()
+        raise
+    return httplib2.Response(response), BodyStream(connection, response, chunk_size)
+
+
+class StreamResponse(object):
+    """
+    Mixin for a Response whose results are decoded as the body is read.
+
+    If the body contains a JSON array of results, results is a generator
+    that reads and decodes the body one element at a time, and total_size
+    is None because the size isn't known until the generator is exhausted.
+    Otherwise, e.g. for errors, single results, and MessagePack bodies, the
+    whole body is read and handled by the Response class it's mixed into.
+
+    :param response: Tuple containing the httplib2.Response and a BodyStream.
+    :type response: tuple
+
+    :param config: Config object.
+    :type config: bulbs.config.Config
+
+    :cvar stream_path: Key of the results array in the body, or None if the
+                       body is the array.
+
+    """
+    stream_path = None
+
+    def __init__(self, response, config):
+        headers, stream = response
+        self.config = config
+        codec = get_codec(getattr(config, "json_codec", "auto"))
+        parser = ArrayParser(codec.loads, self.stream_path)
+        values = []
+        chunks = iter(stream)
+        # Only JSON bodies can be parsed incrementally
+        is_json = get_content_codec(config, headers.get('content-type')) is codec
+        if 200 <= headers.status < 300 and is_json:
+            # read enough to know whether the body contains the array
+            for chunk in chunks:
+                values.extend(parser.feed(chunk))
+                if parser.mode is not None:
+                    break
+        if parser.mode != ARRAY:
+            try:
+                content = parser.buffer + stream.read()
+            finally:
+                stream.close()
+            super(StreamResponse, self).__init__((headers, content), config)
+            return
+        self.headers = headers
+        self.content = None
+        self.results = self._stream_results(parser, values, chunks, stream)
+        self.total_size = None
+        self.raw = None
+
+    def _stream_results(self, parser, values, chunks, stream):
+        try:
+            for value in values:
+                yield self.result_class(value, self.config)
+            for chunk in chunks:
+                for value in parser.feed(chunk):
+                    yield self.result_class(value, self.config)
+                if parser.done:
+                    break
+        finally:
+            stream.close()
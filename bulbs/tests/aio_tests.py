@@ -0,0 +1,134 @@
+import inspect
+import unittest
+
+from bulbs.config import Config
+from bulbs.groovy import registered
+
+try:
+    import asyncio
+    from bulbs.neo4jserver.aio import AsyncGraph, AsyncNeo4jClient, AsyncExactIndex
+    from bulbs.rexster.aio import AsyncRexsterClient
+    from bulbs.titan.aio import AsyncTitanClient
+    from bulbs.aio import AsyncRequest, AsyncVertex, AsyncVertexProxy
+except (ImportError, SyntaxError):
+    # async requires Python 3.5+ and aiohttp
+    AsyncGraph = None
+
+
+class FakeHeaders(dict):
+    pass
+
+
+class FakeClientResponse(object):
+    status = 201
+    reason = "Created"
+    headers = FakeHeaders({'Content-Type': "application/json"})
+
+
+@unittest.skipIf(AsyncGraph is None, "async requires Python 3.5+ and aiohttp")
+class AsyncTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config("http://localhost:7474/db/data/")
+
+    def test_client_methods_return_coroutines(self):
+        client = AsyncNeo4jClient(self.config)
+        coroutine = client.get_vertex(1)
+        assert inspect.iscoroutine(coroutine)
+        coroutine.close()
+
+    def test_graph_defers_index_lookups(self):
+        # building the graph must not make any requests
+        g = AsyncGraph(self.config)
+        assert isinstance(g.vertices, AsyncVertexProxy)
+        assert g.vertices.index is None
+        assert g.client.request.session is None
+        assert g.client.registry.get_class("vertex") is AsyncVertex
+
+    def test_build_http_response(self):
+        request = AsyncRequest(self.config, "application/json")
+        http_resp = request._build_http_response(FakeClientResponse())
+        assert http_resp.status == 201
+        assert http_resp['status'] == "201"
+        assert http_resp['content-type'] == "application/json"
+
+
+class FakeServer(object):
+    """Fakes a Gremlin server that keeps the methods defined by scripts."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.scripts = []
+        self.methods = set()
+
+    def send(self, script, params, load, stream, read_only):
+        # returns a future, like the request coroutine, that's already done
+        future = self.loop.create_future()
+        try:
+            future.set_result(self._execute(script))
+        except SystemError as error:
+            future.set_exception(error)
+        return future
+
+    def _execute(self, script):
+        self.scripts.append(script)
+        for line in script.splitlines():
+            if line.startswith("def "):
+                self.methods.add(line.split("(")[0][4:].strip())
+        name = script.splitlines()[-1].split("(")[0]
+        if name not in self.methods:
+            raise SystemError("groovy.lang.MissingMethodException: No signature of "
+                              "method: Script3.%s() is applicable" % name)
+        return script
+
+
+@unittest.skipIf(AsyncGraph is None, "async requires Python 3.5+ and aiohttp")
+class AsyncRegisterScriptsTestCase(unittest.TestCase):
+
+    client_class = AsyncRexsterClient if AsyncGraph is not None else None
+    root_uri = "http://localhost:8182/graphs/emptygraph"
+
+    def setUp(self):
+        registered.clear()
+        config = Config(self.root_uri)
+        config.register_scripts = True
+        self.client = self.client_class(config)
+        self.loop = asyncio.new_event_loop()
+        self.server = FakeServer(self.loop)
+        self.client._send_gremlin = self.server.send
+
+    def tearDown(self):
+        self.loop.close()
+        registered.clear()
+
+    def test_register_again_if_unknown(self):
+        script = self.client.scripts.get("get_vertices")
+        self.loop.run_until_complete(self.client.gremlin(script))
+        self.server.methods.clear()   # the server restarted
+        self.loop.run_until_complete(self.client.gremlin(script))
+        registration = self.client.scripts.registrations[script]
+        assert self.server.scripts == [registration.script, script, registration.script]
+
+    def test_registered_after_it_is_sent(self):
+        script = self.client.scripts.get("get_vertices")
+        coroutine = self.client.gremlin(script)
+        assert registered == set()
+        self.loop.run_until_complete(coroutine)
+        assert len(registered) == 1
+
+
+class AsyncTitanRegisterScriptsTestCase(AsyncRegisterScriptsTestCase):
+
+    client_class = AsyncTitanClient if AsyncGraph is not None else None
+    root_uri = "http://localhost:8182/graphs/graph"
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(AsyncTestCase))
+    suite.addTest(unittest.makeSuite(AsyncRegisterScriptsTestCase))
+    suite.addTest(unittest.makeSuite(AsyncTitanRegisterScriptsTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -0,0 +1,85 @@
+import json
+import unittest
+
+from bulbs.config import Config
+from bulbs.model import NodeProxy, RelationshipProxy
+from bulbs.rexster.client import RexsterClient
+from bulbs.titan.client import TitanClient
+from bulbs.tests import fakes
+from bulbs.tests.fakes import Person, Knows
+
+
+class FakeHttp(fakes.FakeHttp):
+    """Returns the elements that the bulk create scripts would create."""
+
+    def __init__(self):
+        self.scripts = []
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        body = json.loads(body)
+        params = body['params']
+        self.scripts.append((body['script'], params))
+        start = len(self.scripts) * 100
+        if 'data_list' in params:
+            results = [dict(data, _id=str(start + i), _type="vertex")
+                       for i, data in enumerate(params['data_list'])]
+        else:
+            results = [dict(data, _id=str(start + i), _type="edge", _outV=outV,
+                            _inV=inV, _label=params['label'])
+                       for i, (outV, inV, data) in enumerate(params['edges'])]
+        return self.response(dict(results=results))
+
+
+class BulkCreateTestCase(unittest.TestCase):
+
+    client_class = RexsterClient
+
+    def setUp(self):
+        config = Config("http://localhost:8182/graphs/emptygraph")
+        config.batch_size = 2
+        self.client = self.client_class(config)
+        self.http = FakeHttp()
+        self.client.request.http = self.http
+        self.people = NodeProxy(Person, self.client)
+        self.knows = RelationshipProxy(Knows, self.client)
+
+    def test_create_many(self):
+        data = (dict(name="James", age=34), dict(name="Julie"), dict(name="Jim"))
+        people = self.people.create_many(data)
+        assert len(self.http.scripts) == 2
+        script, params = self.http.scripts[0]
+        assert len(params['data_list']) == 2
+        assert params['data_list'][1] == dict(element_type="person", name="Julie")
+        assert [person.name for person in people] == ["James", "Julie", "Jim"]
+        assert [person.eid for person in people] == [100, 101, 200]
+        assert people[0].age == 34 and people[1].age is None
+        assert isinstance(people[2], Person)
+
+    def test_validated_before_sending(self):
+        data = [dict(name="James"), dict(age=34)]
+        self.assertRaises(ValueError, self.people.create_many, data)
+        assert self.http.scripts == []
+
+    def test_create_many_edges(self):
+        james, julie = self.people.create_many([dict(name="James"), dict(name="Julie")])
+        edges = self.knows.create_many_edges([(james, julie, None), (1, 2, dict(weight=5))])
+        script, params = self.http.scripts[1]
+        assert params['label'] == "knows"
+        assert params['edges'][0][:2] == [100, 101]
+        assert [edge.weight for edge in edges] == [1, 5]
+        assert edges[1]._outV == 1 and edges[1]._inV == 2
+
+
+class TitanBulkCreateTestCase(BulkCreateTestCase):
+
+    client_class = TitanClient
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(BulkCreateTestCase))
+    suite.addTest(unittest.makeSuite(TitanBulkCreateTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -0,0 +1,295 @@
+import json
+import time
+import unittest
+
+from six.moves.urllib.parse import urlsplit, parse_qs
+
+from bulbs.config import Config
+from bulbs.cache import LocalCache, index_string
+from bulbs.element import Vertex, VertexProxy
+from bulbs.model import NodeProxy
+from bulbs.rexster.client import RexsterClient, RexsterResult
+from bulbs.rexster.index import ManualIndex
+from bulbs.tests import fakes
+from bulbs.tests.fakes import Person
+
+
+VERTEX = {'_id': "1", '_type': "vertex", 'name': "James"}
+
+
+class FakeHttp(fakes.FakeHttp):
+    """Returns vertex 1, or 404 for other vertices, and records the URIs."""
+
+    def __init__(self):
+        self.uris = []
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        self.uris.append(uri)
+        if "/vertices/2" in uri:
+            return self.response(status=404)
+        results = [VERTEX] if "/indices/" in uri else VERTEX
+        return self.response(dict(results=results))
+
+
+class FakeRexster(fakes.FakeHttp):
+    """Keeps the vertices and the person index, and records the requests."""
+
+    def __init__(self):
+        self.vertices = {1: dict(element_type="person", name="James"),
+                         2: dict(element_type="person", name="Julie")}
+        self.index = {}
+        for _id, data in self.vertices.items():
+            self._index(_id, data)
+        self.requests = []
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        parts = urlsplit(uri)
+        params = json.loads(body) if body else {}
+        params.update((name, values[0]) for name, values in parse_qs(parts.query).items())
+        if "idList" in params:
+            self.requests.append("multi_get")
+            results = [self._result(int(_id)) for _id in json.loads(params['idList'])
+                       if int(_id) in self.vertices]
+        elif "/indices/" in parts.path:
+            self.requests.append(dict(GET="lookup", PUT="put", DELETE="remove")[method])
+            ids = self.index.setdefault((params['key'], index_string(params['value'])), [])
+            if method == "PUT":
+                ids.append(int(params['id']))
+            elif method == "DELETE":
+                ids.remove(int(params['id']))
+            results = [self._result(_id) for _id in ids]
+        elif "/vertices/" in parts.path:
+            self.requests.append("delete")
+            _id = int(parts.path.rsplit("/", 1)[1])
+            data = self.vertices.pop(_id)
+            self._unindex(_id, data)
+            results = None
+        else:
+            self.requests.append("gremlin")
+            results = self._gremlin(params['params'])
+        return self.response(dict(results=results))
+
+    def _gremlin(self, params):
+        if '_id' not in params:
+            # create_indexed_vertex
+            _id = max(self.vertices) + 1
+            self.vertices[_id] = params['data']
+            self._index(_id, params['data'])
+        else:
+            # patch_indexed_vertex
+            _id = params['_id']
+            data = self.vertices[_id]
+            self._unindex(_id, data)
+            data.update(params['data'])
+            self._index(_id, data)
+        return [self._result(_id)]
+
+    def _index(self, _id, data):
+        for key, value in data.items():
+            self.index.setdefault((key, index_string(value)), []).append(_id)
+
+    def _unindex(self, _id, data):
+        for key, value in data.items():
+            self.index[(key, index_string(value))].remove(_id)
+
+    def _result(self, _id):
+        return dict(self.vertices[_id], _id=str(_id), _type="vertex")
+
+
+class LocalCacheTestCase(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = LocalCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert len(cache) == 2
+
+    def test_ttl(self):
+        cache = LocalCache(ttl=60)
+        cache.set("a", 1, ttl=0.01)
+        cache.set("b", 2)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+    def test_incr(self):
+        cache = LocalCache()
+        assert cache.incr("a") == 1
+        assert cache.incr("a") == 2
+
+
+class ElementCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        config = Config("http://localhost:8182/graphs/emptygraph")
+        config.cache = LocalCache()
+        self.client = RexsterClient(config)
+        self.http = FakeHttp()
+        self.client.request.http = self.http
+        self.vertices = VertexProxy(Vertex, self.client)
+        result = RexsterResult(dict(name="vertex", type="manual"), config)
+        result.raw['class'] = "vertex"
+        self.index = ManualIndex(self.client, result)
+
+    def test_read_through(self):
+        james = self.vertices.get(1)
+        again = self.vertices.get(1)
+        assert again is not james
+        assert again.name == "James"
+        assert len(self.http.uris) == 1
+
+    def test_negative_caching(self):
+        assert self.vertices.get(2) is None
+        assert self.vertices.get(2) is None
+        assert len(self.http.uris) == 1
+
+    def test_write_through_invalidation(self):
+        self.vertices.get(1)
+        self.vertices.update(1, name="James T")
+        self.vertices.get(1)
+        self.vertices.delete(1)
+        self.vertices.get(1)
+        assert len(self.http.uris) == 5
+
+    def test_lookup(self):
+        james = list(self.index.lookup(name="James"))[0]
+        list(self.index.lookup(name="James"))
+        assert len(self.http.uris) == 1
+        self.index.put(james._id, name="Jim")
+        list(self.index.lookup(name="James"))
+        assert len(self.http.uris) == 2
+        list(self.index.lookup(name="Jim"))
+        assert len(self.http.uris) == 3
+
+    def test_disabled(self):
+        self.client.config.cache = None
+        self.vertices.get(1)
+        self.vertices.get(1)
+        assert len(self.http.uris) == 2
+
+
+class IndexLookupCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        config = Config("http://localhost:8182/graphs/emptygraph")
+        config.cache = LocalCache()
+        self.client = RexsterClient(config)
+        self.http = FakeRexster()
+        self.client.request.http = self.http
+        self.vertices = VertexProxy(Vertex, self.client)
+        self.people = NodeProxy(Person, self.client)
+        result = RexsterResult(dict(name="person", type="manual"), config)
+        result.raw['class'] = "vertex"
+        self.index = ManualIndex(self.client, result)
+
+    def _names(self, value, key="name"):
+        people = self.index.lookup(key, value) or []
+        return sorted(person.name for person in people)
+
+    def _requests(self):
+        requests, self.http.requests = self.http.requests, []
+        return requests
+
+    def test_cached_lookup(self):
+        assert self._names("James") == ["James"]
+        assert self._names("James") == ["James"]
+        assert self.index.get_unique(name="James").name == "James"
+        assert self._requests() == ["lookup"]
+
+    def test_cached_ids_use_multi_get(self):
+        assert self._names("James") == ["James"]
+        self.client.cache.backend.delete(self.client.cache._element_key("vertex", "1"))
+        assert self._names("James") == ["James"]
+        assert self._requests() == ["lookup", "multi_get"]
+
+    def test_put_and_remove(self):
+        assert self._names("James") == ["James"]
+        self.index.put(2, name="James")
+        assert self._names("James") == ["James", "Julie"]
+        self.index.remove(1, name="James")
+        assert self._names("James") == ["Julie"]
+        assert self._requests() == ["lookup", "put", "lookup", "remove", "lookup"]
+
+    def test_update(self):
+        assert self._names("James") == ["James"]
+        self.index.update(2, name="James")
+        assert self._names("James") == ["Julie"]
+
+    def test_writes_expire_only_their_lookups(self):
+        assert self._names("James") == ["James"]
+        assert self._names("Julie") == ["Julie"]
+        self.index.put(1, name="Jim")
+        assert self._names("James") == ["James"]
+        assert self._names("Jim") == ["James"]
+        assert self._requests() == ["lookup", "lookup", "put", "lookup"]
+
+    def test_update_expires_the_index(self):
+        result = RexsterResult(dict(name="place", type="manual"), self.client.config)
+        result.raw['class'] = "vertex"
+        places = ManualIndex(self.client, result)
+        assert self._names("Julie") == ["Julie"]
+        assert list(places.lookup(name="Julie"))[0].name == "Julie"
+        self.people.update(2, name="Jules")
+        assert self._names("Julie") == []
+        assert list(places.lookup(name="Julie"))[0].name == "Jules"
+        assert self._requests() == ["lookup", "lookup", "gremlin", "lookup", "multi_get"]
+
+    def test_delete_leaves_out_the_element(self):
+        assert self._names("James") == ["James"]
+        self.vertices.delete(1)
+        assert self._names("James") == []
+        assert self._requests() == ["lookup", "delete", "multi_get"]
+
+    def test_model_writes(self):
+        assert self._names("Jim") == []
+        jim = self.people.create(name="Jim")
+        assert self._names("Jim") == ["Jim"]
+        self._requests()
+        jim.name = "Jimmy"
+        jim.save()
+        assert self._names("Jim") == []
+        assert self._names("Jimmy") == ["Jimmy"]
+        assert self._requests() == ["gremlin", "lookup", "lookup"]
+        self.vertices.delete(jim._id)
+        assert self._names("Jimmy") == []
+
+    def test_empty_lookup_is_cached(self):
+        assert self.index.lookup(name="Jim") is None
+        assert self.index.get_unique(name="Jim") is None
+        assert self._requests() == ["lookup"]
+
+    def test_bool_lookup_then_write(self):
+        assert self._names("true", key="active") == []
+        self.people.create(name="Jim", active=True)
+        assert self._names("true", key="active") == ["Jim"]
+        assert self._names(True, key="active") == ["Jim"]
+        assert self._requests() == ["lookup", "gremlin", "lookup"]
+
+    def test_index_string(self):
+        assert index_string(True) == "true"
+        assert index_string(None) == "null"
+        assert index_string(1.0) == "1.0"
+        assert index_string(1e20) == "1.0E20"
+        assert index_string(0.0001) == "1.0E-4"
+        assert index_string(b"James") == "James"
+
+    def test_disabled(self):
+        self.client.config.cache = None
+        self._names("James")
+        self._names("James")
+        assert self._requests() == ["lookup", "lookup"]
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(LocalCacheTestCase))
+    suite.addTest(unittest.makeSuite(ElementCacheTestCase))
+    suite.addTest(unittest.makeSuite(IndexLookupCacheTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from bulbs.codec import Codec, get_codec, register_codec, codec_classes
+
+
+class FakeCodec(Codec):
+
+    name = "fake"
+    module_name = "json"
+
+
+class CodecTestCase(unittest.TestCase):
+
+    def _installed_codecs(self):
+        for name in codec_classes:
+            try:
+                yield get_codec(name)
+            except ImportError:
+                continue
+
+    def test_round_trip(self):
+        value = {'name': u"Jérôme", 'ages': [1, 2.5, None, True]}
+        for codec in self._installed_codecs():
+            content = codec.dumps(value)
+            if not isinstance(content, bytes):
+                content = content.encode('utf-8')
+            assert codec.loads(content) == value, codec.name
+
+    def test_loads_bytes(self):
+        content = u'{"name": "Jérôme"}'.encode('utf-8')
+        for codec in self._installed_codecs():
+            assert codec.loads(content)['name'] == u"Jérôme", codec.name
+
+    def test_auto_codec(self):
+        codec = get_codec("auto")
+        assert codec is get_codec()
+        assert codec.name in codec_classes
+
+    def test_unknown_codec(self):
+        self.assertRaises(ValueError, get_codec, "nonexistent")
+
+    def test_register_codec(self):
+        register_codec(FakeCodec)
+        assert isinstance(get_codec("fake"), FakeCodec)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(CodecTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -0,0 +1,63 @@
+import zlib
+import unittest
+
+from bulbs.config import Config
+from bulbs.compression import compress, get_decompressor
+from bulbs.rexster.client import RexsterRequest
+
+
+class CompressionTestCase(unittest.TestCase):
+
+    def test_round_trip(self):
+        body = b'{"name": "James"}' * 100
+        for encoding in ("gzip", "deflate"):
+            decompressor = get_decompressor(encoding)
+            content = compress(body, encoding)
+            assert len(content) < len(body)
+            assert decompressor.decompress(content) + decompressor.flush() == body
+
+    def test_chunked_decompression(self):
+        body = b'{"name": "James"}' * 100
+        content = compress(body, "gzip")
+        decompressor = get_decompressor("GZIP")
+        chunks = [decompressor.decompress(content[i:i+7]) for i in range(0, len(content), 7)]
+        assert b"".join(chunks) + decompressor.flush() == body
+
+    def test_uncompressed(self):
+        assert get_decompressor(None) is None
+        assert get_decompressor("identity") is None
+
+    def test_unsupported_encoding(self):
+        self.assertRaises(ValueError, compress, b"{}", "br")
+
+    def test_request_compression(self):
+        config = Config("http://localhost:8182/graphs/emptygraph")
+        config.compression = "gzip"
+        config.compression_threshold = 100
+        request = RexsterRequest(config, "application/json")
+        uri, method, body, headers = request._build_request_args("vertices", "POST", {'a': 1})
+        assert 'Content-Encoding' not in headers
+        data = {'name': "James" * 100}
+        uri, method, body, headers = request._build_request_args("vertices", "POST", data)
+        assert headers['Content-Encoding'] == "gzip"
+        assert request.codec.loads(zlib.decompress(body, 16 + zlib.MAX_WBITS)) == data
+
+    def test_threshold_counts_encoded_bytes(self):
+        config = Config("http://localhost:8182/graphs/emptygraph")
+        config.compression = "gzip"
+        config.compression_threshold = 100
+        request = RexsterRequest(config, "application/json")
+        body = u"\u00e9" * 60
+        headers = {}
+        content = request._maybe_compress(body, headers)
+        assert headers['Content-Encoding'] == "gzip"
+        assert zlib.decompress(content, 16 + zlib.MAX_WBITS) == body.encode('utf-8')
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(CompressionTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -0,0 +1,171 @@
+import datetime
+import unittest
+
+import bulbs.json
+from bulbs.config import Config
+from bulbs.model import Node
+from bulbs.property import String, Integer, List, DateTime
+from bulbs.session import Session
+from bulbs.utils import initialize_element_list
+from bulbs.rexster.client import RexsterClient, RexsterResult
+
+
+class Person(Node):
+    element_type = "person"
+
+    name = String(nullable=False)
+    age = Integer()
+    tags = List()
+
+
+class Upper(String):
+
+    def to_python(self, type_system, value):
+        return value.upper()
+
+
+class Event(Node):
+    element_type = "event"
+
+    name = Upper()
+    count = Integer()
+    date = DateTime()
+
+
+class ConversionPlanTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config("http://localhost:8182/graphs/emptygraph")
+        self.client = RexsterClient(self.config)
+
+    def _load(self, **data):
+        event = Event(self.client)
+        raw = dict(_id="2", _type="vertex", element_type="event", **data)
+        event._initialize(RexsterResult(raw, self.config))
+        return event
+
+    def test_load(self):
+        event = self._load(name="launch", count="3", date=0)
+        assert event.name == "LAUNCH"
+        assert event.count == 3
+        assert event.date == datetime.datetime(1970, 1, 1)
+
+    def test_invalid_value_is_set_to_none(self):
+        event = self._load(name="launch", count="three")
+        assert event.count is None
+
+    def test_save_validates(self):
+        james = Person(self.client)
+        james.name = "James"
+        james.age = 34
+        data = james._get_property_data()
+        assert data['name'] == "James" and data['age'] == 34
+        object.__setattr__(james, "age", "34")
+        self.assertRaises(TypeError, james._get_property_data)
+        james.age = 34
+        object.__setattr__(james, "name", None)
+        self.assertRaises(ValueError, james._get_property_data)
+
+    def test_subclass_plan(self):
+        class Employee(Person):
+            element_type = "employee"
+            title = String()
+        keys = [entry[0] for entry in Employee._plan]
+        assert sorted(keys) == ["age", "name", "tags", "title"]
+        assert len(Person._plan) == 3
+
+
+class Stamped(Event):
+    element_type = "stamped"
+
+    def _initialize(self, result):
+        Event._initialize(self, result)
+        self.stamped = True
+
+
+class Counted(Event):
+    element_type = "counted"
+
+    def _set_property_data(self):
+        Event._set_property_data(self)
+        self.counted = True
+
+
+class ColumnConversionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config("http://localhost:8182/graphs/emptygraph")
+        self.client = RexsterClient(self.config)
+        self.client.registry.add_class(Event)
+        self.client.registry.add_class(Stamped)
+        self.client.registry.add_class(Counted)
+        self.numpy = bulbs.json.numpy
+
+    def tearDown(self):
+        bulbs.json.numpy = self.numpy
+
+    def _results(self, rows, element_type="event"):
+        return [RexsterResult(dict(row, _id=str(i), _type="vertex", 
+                                   element_type=element_type), self.config)
+                for i, row in enumerate(rows)]
+
+    def test_datetime_column(self):
+        python = self.client.type_system.python
+        values = [0, None, 1351000000.5, -1.25, 1351000000]
+        expected = [python.to_datetime(value) for value in values]
+        assert python.convert_column("to_datetime", values) == expected
+        bulbs.json.numpy = None
+        assert python.convert_column("to_datetime", values) == expected
+        self.assertRaises(TypeError, python.convert_column, "to_datetime", ["0"])
+
+    def test_column_matches_scalar(self):
+        python = self.client.type_system.python
+        values = ["3", 4, None]
+        assert python.convert_column("to_integer", values) == [3, 4, None]
+
+    def test_load_list(self):
+        rows = [dict(name="launch", count="3", date=0),
+                dict(name="land", count="three", date=1.5),
+                dict(name="orbit")]
+        events = initialize_element_list(self.client, self._results(rows))
+        assert [event.name for event in events] == ["LAUNCH", "LAND", "ORBIT"]
+        assert [event.count for event in events] == [3, None, None]
+        assert events[1].date == datetime.datetime(1970, 1, 1, 0, 0, 1, 500000)
+        assert events[2].date is None
+        assert events[0]._dirty == set()
+
+    def test_invalid_datetime_is_set_to_none(self):
+        rows = [dict(date=0), dict(date="never")]
+        events = initialize_element_list(self.client, self._results(rows))
+        assert events[0].date == datetime.datetime(1970, 1, 1)
+        assert events[1].date is None
+
+    def test_custom_initialize(self):
+        rows = [dict(name="launch", date=0)]
+        events = initialize_element_list(self.client, self._results(rows, "stamped"))
+        assert events[0].stamped is True
+        assert events[0].name == "LAUNCH"
+
+    def test_custom_set_property_data(self):
+        rows = [dict(name="launch", date=0)]
+        events = initialize_element_list(self.client, self._results(rows, "counted"))
+        assert events[0].counted is True
+        assert events[0].name == "LAUNCH"
+        assert events[0]._dirty == set()
+
+    def test_session(self):
+        rows = [dict(name="launch")]
+        with Session(self.client):
+            first = initialize_element_list(self.client, self._results(rows) * 2)
+            again = initialize_element_list(self.client, self._results(rows))
+        assert first[0] is first[1] is again[0]
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(ConversionPlanTestCase))
+    suite.addTest(unittest.makeSuite(ColumnConversionTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
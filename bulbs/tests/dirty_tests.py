@@ -0,0 +1,113 @@
+import json
+import unittest
+
+from bulbs.config import Config
+from bulbs.model import Node
+from bulbs.property import Integer
+from bulbs.rexster.client import RexsterClient, RexsterResult
+from bulbs.tests import fakes
+from bulbs.tests.fakes import Person
+
+
+VERTEX = {'_id': "1", '_type': "vertex", 'element_type': "person",
+          'name': "James", 'age': 34, 'tags': ["a"]}
+
+
+class Period(Node):
+    element_type = "period"
+
+    start = Integer()
+    end = Integer()
+
+    checked = []
+
+    def __check__(self, data):
+        self.checked.append(data)
+        if data['end'] < data['start']:
+            raise ValueError("end is before start")
+
+
+class FakeHttp(fakes.FakeHttp):
+    """Records the Gremlin scripts and params that are posted."""
+
+    def __init__(self):
+        self.scripts = []
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        body = json.loads(body)
+        self.scripts.append((body['script'], body['params']))
+        return self.response(dict(results=[VERTEX]))
+
+
+class DirtyTrackingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        config = Config("http://localhost:8182/graphs/emptygraph")
+        self.client = RexsterClient(config)
+        self.http = FakeHttp()
+        self.client.request.http = self.http
+        self.james = Person(self.client)
+        self.james._initialize(RexsterResult(dict(VERTEX), config))
+
+    def test_unchanged_save_is_noop(self):
+        self.james.save()
+        self.james.age = 34
+        self.james.save()
+        assert self.http.scripts == []
+
+    def test_only_changed_keys_are_sent(self):
+        self.james.age = 35
+        self.james.save()
+        script, params = self.http.scripts[0]
+        assert "patchIndexedVertex" in script
+        assert params['data'] == {'age': 35}
+        assert params['removed'] == []
+        self.james.save()
+        assert len(self.http.scripts) == 1
+
+    def test_removed_property(self):
+        self.james.age = None
+        self.james.save()
+        script, params = self.http.scripts[0]
+        assert params['data'] == {}
+        assert params['removed'] == ['age']
+        assert 'age' not in self.james._data
+
+    def test_normal_attribute(self):
+        self.james.nickname = "Jim"
+        self.james.save()
+        script, params = self.http.scripts[0]
+        assert params['data'] == {'nickname': "Jim"}
+
+    def test_data_does_not_hide_changes(self):
+        self.james.name = "James T"
+        self.james.data()
+        self.james.save()
+        script, params = self.http.scripts[0]
+        assert params['data'] == {'name': "James T"}
+
+    def test_check_gets_unchanged_keys(self):
+        period = Period(self.client)
+        raw = dict(_id="2", _type="vertex", element_type="period", start=1, end=5)
+        period._initialize(RexsterResult(raw, self.client.config))
+        period.save()
+        assert [(data['start'], data['end']) for data in Period.checked] == [(1, 5)]
+        period.end = 0
+        self.assertRaises(ValueError, period.save)
+        period.end = 3
+        period.save()
+        script, params = self.http.scripts[0]
+        assert params['data'] == {'end': 3}
+
+    def test_changed_property_is_validated(self):
+        self.james.name = None
+        self.assertRaises(ValueError, self.james.save)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(DirtyTrackingTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -0,0 +1,136 @@
+import json
+import unittest
+
+import bulbs.factory
+from bulbs.config import Config
+from bulbs.rexster import Graph as RexsterGraph
+from bulbs.titan import Graph as TitanGraph
+from bulbs.neo4jserver import Graph as Neo4jGraph
+from bulbs.tests import fakes
+from bulbs.tests.fakes import Person, Knows
+
+
+class FakeHttp(fakes.FakeHttp):
+    """Gets or creates indices."""
+
+    def __init__(self):
+        self.requests = []
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        body = json.loads(body) if body else None
+        self.requests.append((uri, body))
+        if body is None or "7474" not in uri:
+            content = dict(results=[])
+        elif 'script' in body:
+            content = []
+        else:
+            # Neo4j's create index endpoint
+            content = dict(body['config'], template="%s/%s/{key}/{value}" % (uri, body['name']))
+        return self.response(content)
+
+
+class LazyIndexTestCase(unittest.TestCase):
+
+    graph_class = RexsterGraph
+    root_uri = "http://localhost:8182/graphs/emptygraph"
+
+    def setUp(self):
+        bulbs.factory.indices.clear()
+        self.http = FakeHttp()
+
+    def tearDown(self):
+        bulbs.factory.indices.clear()
+
+    def _graph(self):
+        g = self.graph_class(Config(self.root_uri))
+        g.client.request.http = self.http
+        g.add_proxy("people", Person)
+        g.add_proxy("knows", Knows)
+        return g
+
+    def test_no_requests_until_used(self):
+        g = self._graph()
+        assert self.http.requests == []
+        assert g.vertices.index.index_name == "vertex"
+        assert len(self.http.requests) == 1
+        assert g.vertices.index is g.vertices.index
+        assert len(self.http.requests) == 1
+        assert g.client.registry.get_index("vertex") is g.vertices.index
+
+    def test_cached_across_graphs(self):
+        g = self._graph()
+        index = g.people.index
+        requests = len(self.http.requests)
+        other = self._graph()
+        assert other.people.index.index_name == "person"
+        assert other.people.index.client is other.client
+        assert index.client is g.client
+        assert len(self.http.requests) == requests
+
+    def test_ensure_indices(self):
+        g = self._graph()
+        g.ensure_indices()
+        assert len(self.http.requests) == 1
+        uri, body = self.http.requests[0]
+        names = [index[:2] for index in body['params']['indices']]
+        assert names == [["vertex", "vertex"], ["edge", "edge"],
+                         ["person", "vertex"], ["knows", "edge"]]
+        assert g.knows.index.index_name == "knows"
+        assert g.knows.index.index_class == "edge"
+        assert g.people.index.index_class == "vertex"
+        assert len(self.http.requests) == 1
+        self._graph().ensure_indices()
+        assert len(self.http.requests) == 1
+
+    def test_set_index(self):
+        g = self._graph()
+        g.people.index = None
+        assert g.people.index is None
+        assert self.http.requests == []
+
+    def test_evict_deleted_index(self):
+        g = self._graph()
+        g.people.index
+        index_proxy = g.factory.build_index_proxy(Person, g.default_index)
+        index_proxy.delete("person")
+        self._graph().people.index
+        assert len(self.http.requests) == 3
+
+
+class Neo4jLazyIndexTestCase(LazyIndexTestCase):
+
+    graph_class = Neo4jGraph
+    root_uri = "http://localhost:7474/db/data/"
+
+
+class TitanLazyIndexTestCase(LazyIndexTestCase):
+
+    graph_class = TitanGraph
+
+    def test_no_requests_until_used(self):
+        g = self._graph()
+        assert g.vertices.index.index_name == "vertex"
+        assert g.vertices.index is g.vertices.index
+        assert self.http.requests == []
+
+    def test_ensure_indices(self):
+        g = self._graph()
+        g.ensure_indices()
+        assert g.people.index.index_name == "person"
+        assert g.knows.index.index_class == "edge"
+        assert self.http.requests == []
+
+    def test_evict_deleted_index(self):
+        # Titan's key indices can't be deleted
+        pass
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(LazyIndexTestCase))
+    suite.addTest(unittest.makeSuite(Neo4jLazyIndexTestCase))
+    suite.addTest(unittest.makeSuite(TitanLazyIndexTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -0,0 +1,55 @@
+"""
+Fake HTTP connections and models shared by the tests that run without a
+database server.
+
+"""
+import json
+
+import httplib2
+
+from bulbs.model import Node, Relationship
+from bulbs.property import String, Integer, Bool, List
+
+
+class FakeHttp(object):
+    """
+    Stands in for httplib2.Http. Subclasses override request() to fake a
+    server and build what it returns with response().
+
+    """
+    def add_credentials(self, username, password):
+        pass
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        return self.response(dict(results=[]))
+
+    def response(self, content=None, status=200):
+        """
+        Returns the httplib2 response and the JSON encoded content.
+
+        :param content: Decoded content, or None for an empty body.
+        :type content: dict or list
+
+        :param status: HTTP status code.
+        :type status: int
+
+        :rtype: tuple
+
+        """
+        body = b'' if content is None else json.dumps(content).encode('utf-8')
+        return httplib2.Response(dict(status=str(status))), body
+
+
+class Person(Node):
+    element_type = "person"
+
+    name = String(nullable=False)
+    age = Integer()
+    tags = List()
+    active = Bool()
+
+
+class Knows(Relationship):
+    label = "knows"
+
+    weight = Integer(default=1)
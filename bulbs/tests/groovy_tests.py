@@ -0,0 +1,186 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+import bulbs.groovy
+from bulbs.config import Config
+from bulbs.groovy import registered, parsed, get_methods
+from bulbs.utils import get_file_path
+from bulbs.rexster.client import RexsterClient
+from bulbs.neo4jserver.client import Neo4jClient
+from bulbs.neo4jserver.batch import Neo4jBatchClient
+from bulbs.tests import fakes
+
+
+class FakeHttp(fakes.FakeHttp):
+    """Fakes a Gremlin server that keeps the methods defined by scripts."""
+
+    def __init__(self):
+        self.scripts = []
+        self.methods = set()
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        script = json.loads(body)['script']
+        self.scripts.append(script)
+        for line in script.splitlines():
+            if line.startswith("def "):
+                self.methods.add(line.split("(")[0][4:].strip())
+        name = script.splitlines()[-1].split("(")[0]
+        if name.startswith("get_vertices_") and name not in self.methods:
+            message = "groovy.lang.MissingMethodException: No signature of " \
+                      "method: Script3.%s() is applicable" % name
+            return self.response(dict(message=message), 500)
+        if name == "fail":
+            return self.response(dict(message="script error"), 500)
+        return self.response(dict(results=[]))
+
+
+class RegisterScriptsTestCase(unittest.TestCase):
+
+    client_class = RexsterClient
+    root_uri = "http://localhost:8182/graphs/emptygraph"
+
+    def setUp(self):
+        registered.clear()
+        self.config = Config(self.root_uri)
+        self.config.register_scripts = True
+        self.client = self.client_class(self.config)
+        self.http = FakeHttp()
+        self.client.request.http = self.http
+
+    def test_call(self):
+        script = self.client.scripts.get("get_vertices")
+        method = self.client.scripts.get_method("get_vertices")
+        assert script == "get_vertices_%s()" % method.sha1
+        assert script in self.client.scripts.registrations
+
+    def test_registered_once(self):
+        script = self.client.scripts.get("get_vertices")
+        self.client.gremlin(script)
+        self.client.gremlin(script)
+        registration = self.client.scripts.registrations[script]
+        assert self.http.scripts == [registration.script, script]
+        assert registration.script.startswith("def " + registration.name)
+
+    def test_call_is_smaller(self):
+        script = self.client.scripts.get("create_indexed_vertex")
+        method = self.client.scripts.get_method("create_indexed_vertex")
+        assert len(script) < len(method.body) / 4
+
+    def test_registered_once_per_server(self):
+        script = self.client.scripts.get("get_vertices")
+        self.client.gremlin(script)
+        client = self.client_class(self.config)
+        client.request.http = self.http
+        client.gremlin(client.scripts.get("get_vertices"))
+        assert self.http.scripts[1] == script
+
+    def test_register_again_if_unknown(self):
+        script = self.client.scripts.get("get_vertices")
+        self.client.gremlin(script)
+        self.http.methods.clear()   # the server restarted
+        self.client.gremlin(script)
+        registration = self.client.scripts.registrations[script]
+        assert self.http.scripts == [registration.script, script, registration.script]
+
+    def test_other_errors_are_raised(self):
+        self.assertRaises(SystemError, self.client.gremlin, "fail()")
+
+    def test_not_registered(self):
+        self.config.register_scripts = False
+        script = self.client.scripts.get("get_vertices")
+        self.client.gremlin(script)
+        assert self.http.scripts == [script]
+        assert script == self.client.scripts.get_method("get_vertices").body
+
+
+class Neo4jRegisterScriptsTestCase(RegisterScriptsTestCase):
+
+    client_class = Neo4jClient
+    root_uri = "http://localhost:7474/db/data/"
+
+
+class BatchRegisterScriptsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        registered.clear()
+        self.config = Config("http://localhost:7474/db/data/")
+        self.config.register_scripts = True
+        self.client = Neo4jBatchClient(self.config)
+
+    def test_queued_with_definition(self):
+        script = self.client.scripts.get("get_vertices")
+        self.client.gremlin(script)
+        self.client.gremlin(script)
+        registration = self.client.scripts.registrations[script]
+        scripts = [message['body']['script'] for message in self.client.get_messages()]
+        assert scripts == [registration.script, registration.script]
+        assert registered == set()
+
+
+class ScriptCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+        self.file_path = os.path.join(self.temp_dir, "gremlin.groovy")
+        shutil.copy(get_file_path(bulbs.groovy.__file__, "gremlin.groovy"), self.file_path)
+        self.Parser = bulbs.groovy.Parser
+
+    def tearDown(self):
+        bulbs.groovy.Parser = self.Parser
+        parsed.pop(self.file_path, None)
+        shutil.rmtree(self.temp_dir)
+
+    def _fail_to_parse(self):
+        def parser(file_path):
+            raise AssertionError("parsed %s" % file_path)
+        bulbs.groovy.Parser = parser
+
+    def test_process_cache(self):
+        methods = get_methods(self.file_path)
+        self._fail_to_parse()
+        assert get_methods(self.file_path) is methods
+
+    def test_file_changed(self):
+        methods = get_methods(self.file_path)
+        with open(self.file_path, "a") as fout:
+            fout.write("\ndef added() {\n  g.V\n}\n")
+        assert "added" in get_methods(self.file_path)
+        assert "added" not in methods
+
+    def test_disk_cache(self):
+        methods = get_methods(self.file_path, self.cache_dir)
+        assert len(os.listdir(self.cache_dir)) == 1
+        parsed.clear()
+        self._fail_to_parse()
+        cached = get_methods(self.file_path, self.cache_dir)
+        assert cached == methods
+        assert list(cached) == list(methods)
+
+    def test_corrupt_disk_cache(self):
+        methods = get_methods(self.file_path, self.cache_dir)
+        cache_path = os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0])
+        with open(cache_path, "w") as fout:
+            fout.write("{")
+        parsed.clear()
+        assert get_methods(self.file_path, self.cache_dir) == methods
+
+    def test_unwritable_cache_dir(self):
+        with open(self.cache_dir, "w") as fout:
+            fout.write("not a directory")
+        assert "get_vertices" in get_methods(self.file_path, self.cache_dir)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(RegisterScriptsTestCase))
+    suite.addTest(unittest.makeSuite(Neo4jRegisterScriptsTestCase))
+    suite.addTest(unittest.makeSuite(BatchRegisterScriptsTestCase))
+    suite.addTest(unittest.makeSuite(ScriptCacheTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
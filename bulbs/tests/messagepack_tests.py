@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import json
+import datetime
+import unittest
+
+import httplib2
+
+from bulbs.config import Config
+from bulbs.cache import LocalCache
+from bulbs.base import get_type_system
+from bulbs.model import Node, NodeProxy
+from bulbs.property import String, Long, DateTime
+from bulbs.rexster.client import RexsterClient
+from bulbs.titan.client import TitanClient
+from bulbs.messagepack import MessagePackTypeSystem, MessagePackCodec, msgpack
+from bulbs.tests import fakes
+
+
+class Event(Node):
+    element_type = "event"
+
+    name = String()
+    count = Long()
+    date = DateTime()
+
+
+class FakeHttp(fakes.FakeHttp):
+    """Returns the created vertex as MessagePack."""
+
+    def __init__(self, error=None):
+        self.requests = []
+        self.error = error
+        self.codec = MessagePackCodec() if msgpack is not None else None
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        self.requests.append((headers, body))
+        if self.error is not None:
+            content = json.dumps(dict(message=self.error)).encode('utf-8')
+            headers = {'status': "500", 'content-type': "application/json"}
+            return httplib2.Response(headers), content
+        body = self.codec.loads(body)
+        if 'params' in body:
+            # a Gremlin script
+            results = [dict(body['params']['data'], _id="1", _type="vertex")]
+        else:
+            # Titan creates vertices with the REST API
+            results = dict(body, _id="1", _type="vertex")
+        content = self.codec.dumps(dict(results=results))
+        headers = {'status': "200", 'content-type': "application/x-msgpack"}
+        return httplib2.Response(headers), content
+
+
+@unittest.skipIf(msgpack is None, "the MessagePack type system requires msgpack")
+class MessagePackTestCase(unittest.TestCase):
+
+    client_class = RexsterClient
+
+    def setUp(self):
+        self.config = Config("http://localhost:8182/graphs/emptygraph")
+        self.config.type_system = "msgpack"
+        self.client = self.client_class(self.config)
+        self.http = FakeHttp()
+        self.client.request.http = self.http
+
+    def test_type_system(self):
+        assert isinstance(self.client.type_system, MessagePackTypeSystem)
+        assert isinstance(self.client.request.codec, MessagePackCodec)
+        self.assertRaises(ValueError, get_type_system, "xml")
+
+    def test_round_trip(self):
+        events = NodeProxy(Event, self.client)
+        date = datetime.datetime(2012, 10, 23, 13, 5, 2, 123456)
+        event = events.create(name=u"Jérôme", count=2 ** 62, date=date)
+        headers, body = self.http.requests[0]
+        assert headers['Content-Type'] == "application/x-msgpack"
+        assert headers['Accept'] == "application/x-msgpack"
+        assert isinstance(body, bytes)
+        assert event.eid == 1
+        assert event.name == u"Jérôme"
+        assert event.count == 2 ** 62
+        assert event.date == date
+
+    def test_json_timestamps(self):
+        python = self.client.type_system.python
+        assert python.to_datetime(0) == datetime.datetime(1970, 1, 1)
+        values = [msgpack.Timestamp(1, 500000000), None, 2]
+        dates = python.convert_column("to_datetime", values)
+        assert dates[0] == datetime.datetime(1970, 1, 1, 0, 0, 1, 500000)
+        assert dates[1] is None and dates[2].second == 2
+
+    def test_json_error(self):
+        self.http.error = "script error"
+        self.assertRaises(SystemError, self.client.create_vertex, dict(name="James"))
+
+    def test_packed_cache(self):
+        cache = LocalCache(packed=True)
+        raw = {'_id': "1", '_type': "vertex", 'tags': ["a", "b"]}
+        cache.set("v1", raw)
+        assert cache.get("v1") == raw
+        assert cache.get("v1") is not cache.get("v1")
+        assert cache.incr("gen") == 1 and cache.incr("gen") == 2
+
+
+class TitanMessagePackTestCase(MessagePackTestCase):
+
+    client_class = TitanClient
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(MessagePackTestCase))
+    suite.addTest(unittest.makeSuite(TitanMessagePackTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
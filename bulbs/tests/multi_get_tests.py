@@ -0,0 +1,111 @@
+import json
+import unittest
+
+from six.moves.urllib.parse import urlsplit, parse_qs
+
+from bulbs.config import Config
+from bulbs.cache import LocalCache
+from bulbs.session import Session
+from bulbs.element import Vertex, VertexProxy, Edge, EdgeProxy
+from bulbs.rexster.client import RexsterClient
+from bulbs.titan.client import TitanClient
+from bulbs.neo4jserver.client import Neo4jClient
+from bulbs.tests import fakes
+
+
+# Only elements 1 and 3 exist
+EXISTING = [1, 3]
+
+
+class FakeHttp(fakes.FakeHttp):
+    """Returns the existing elements for the requested IDs."""
+
+    def __init__(self):
+        self.id_lists = []
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        if body is not None:
+            # a Gremlin script
+            body = json.loads(body)
+            id_list = body['params']['id_list']
+            edges = "get_edges" in body['script']
+        else:
+            # Rexster's batch extension
+            id_list = json.loads(parse_qs(urlsplit(uri).query)['idList'][0])
+            edges = "edges" in uri
+        self.id_lists.append(id_list)
+        base_type = "edge" if edges else "vertex"
+        found = [_id for _id in id_list if int(_id) in EXISTING]
+        if "7474" in uri:
+            kind = "relationship" if base_type == "edge" else "node"
+            results = [{'self': "http://localhost:7474/db/data/%s/%s" % (kind, _id),
+                        'data': {'n': int(_id)}} for _id in found]
+            return self.response(results)
+        results = [{'_id': str(_id), '_type': base_type, 'n': int(_id)} for _id in found]
+        return self.response(dict(results=results))
+
+
+class MultiGetTestCase(unittest.TestCase):
+
+    client_class = RexsterClient
+    root_uri = "http://localhost:8182/graphs/emptygraph"
+
+    def setUp(self):
+        self.config = Config(self.root_uri)
+        self.config.multi_get_size = 2
+        self.client = self.client_class(self.config)
+        self.http = FakeHttp()
+        self.client.request.http = self.http
+        self.vertices = VertexProxy(Vertex, self.client)
+        self.edges = EdgeProxy(Edge, self.client)
+
+    def test_order_and_misses(self):
+        vertices = self.vertices.get_many([3, 2, 1])
+        assert [v.n if v else None for v in vertices] == [3, None, 1]
+        assert len(self.http.id_lists) == 2
+
+    def test_duplicate_ids(self):
+        vertices = self.vertices.get_many([1, "1"])
+        assert vertices[0] is vertices[1]
+        assert len(self.http.id_lists) == 1
+
+    def test_edges(self):
+        edges = self.edges.get_many([1, 2])
+        assert edges[0].n == 1 and edges[1] is None
+
+    def test_session(self):
+        with Session(self.client):
+            james = self.vertices.get_many([1])[0]
+            again = self.vertices.get_many([1, 3])
+            assert again[0] is james
+        assert self.http.id_lists[1] == [3]
+
+    def test_cache(self):
+        self.config.cache = LocalCache()
+        self.vertices.get_many([1, 2])
+        vertices = self.vertices.get_many([1, 2, 3])
+        assert [v.n if v else None for v in vertices] == [1, None, 3]
+        assert len(self.http.id_lists) == 2
+        assert self.http.id_lists[1] == [3]
+
+
+class TitanMultiGetTestCase(MultiGetTestCase):
+
+    client_class = TitanClient
+
+
+class Neo4jMultiGetTestCase(MultiGetTestCase):
+
+    client_class = Neo4jClient
+    root_uri = "http://localhost:7474/db/data/"
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(MultiGetTestCase))
+    suite.addTest(unittest.makeSuite(TitanMultiGetTestCase))
+    suite.addTest(unittest.makeSuite(Neo4jMultiGetTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -0,0 +1,112 @@
+import time
+import threading
+import unittest
+
+from bulbs.config import Config
+from bulbs.pool import ConnectionPool
+from bulbs.rexster.client import RexsterRequest
+from bulbs.tests import fakes
+
+
+class FakeHttp(fakes.FakeHttp):
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.connections = dict()
+        self.credentials = []
+
+    def add_credentials(self, username, password):
+        self.credentials.append((username, password))
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        with self.pool.lock:
+            self.pool.active += 1
+            self.pool.max_active = max(self.pool.active, self.pool.max_active)
+        time.sleep(0.01)
+        with self.pool.lock:
+            self.pool.active -= 1
+        if uri.endswith("error"):
+            raise IOError(uri)
+        return dict(status="200", http=id(self)), b""
+
+
+class FakePool(ConnectionPool):
+
+    def __init__(self, *args, **kwds):
+        super(FakePool, self).__init__(*args, **kwds)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.built = 0
+
+    def _build_http(self):
+        self.built += 1
+        return FakeHttp(self)
+
+
+class ConnectionPoolTestCase(unittest.TestCase):
+
+    def _run_threads(self, pool, uris):
+        threads = [threading.Thread(target=pool.request, args=(uri,))
+                   for uri in uris]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_reuses_connections(self):
+        pool = FakePool(max_size=2)
+        resp1, content = pool.request("http://localhost:7474/db/data/")
+        resp2, content = pool.request("http://localhost:7474/db/data/")
+        assert resp1['http'] == resp2['http']
+        assert pool.built == 1
+
+    def test_max_size(self):
+        pool = FakePool(max_size=3)
+        self._run_threads(pool, ["http://localhost:7474/"] * 12)
+        assert pool.max_active <= 3
+        assert pool.built <= 3
+
+    def test_max_per_host(self):
+        pool = FakePool(max_size=4, max_per_host=1)
+        self._run_threads(pool, ["http://localhost:7474/"] * 6)
+        assert pool.max_active == 1
+
+    def test_discards_connection_on_error(self):
+        pool = FakePool(max_size=1)
+        self.assertRaises(IOError, pool.request, "http://localhost:7474/error")
+        assert pool._size == 0
+        pool.request("http://localhost:7474/")
+        assert pool.built == 2
+
+    def test_add_credentials(self):
+        pool = FakePool(max_size=1)
+        pool.request("http://localhost:7474/")
+        pool.add_credentials("james", "secret")
+        http = pool._acquire()
+        assert http.credentials == [("james", "secret")]
+
+    def test_add_credentials_while_checked_out(self):
+        pool = FakePool(max_size=1)
+        http = pool._acquire()
+        pool.add_credentials("james", "secret")
+        pool._release(http)
+        pool.request("http://localhost:7474/")
+        http = pool._acquire()
+        assert http.credentials == [("james", "secret")]
+
+    def test_request_uses_pool_from_config(self):
+        config = Config("http://localhost:8182/graphs/emptygraph")
+        config.pool_size = 5
+        request = RexsterRequest(config, "application/json")
+        assert isinstance(request.http, ConnectionPool)
+        assert request.http.max_size == 5
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(ConnectionPoolTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
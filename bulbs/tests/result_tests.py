@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+import pickle
+import unittest
+
+from bulbs.config import Config
+from bulbs.utils import initialize_element
+from bulbs.element import Vertex, Edge, CompactVertex, CompactEdge, coerce_vertex
+from bulbs.neo4jserver.client import Neo4jClient, Neo4jResult
+from bulbs.rexster.client import RexsterResult
+from bulbs.titan.client import TitanResult
+
+
+class ResultTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config("http://localhost:7474/db/data/")
+        neo4j_raw = {'self': "http://localhost:7474/db/data/relationship/12",
+                     'start': "http://localhost:7474/db/data/node/1",
+                     'end': "http://localhost:7474/db/data/node/2",
+                     'type': "knows", 'data': {'weight': 1}}
+        rexster_raw = {'_id': "5", '_type': "vertex", 'name': "James"}
+        self.results = [Neo4jResult(neo4j_raw, self.config),
+                        RexsterResult(rexster_raw, self.config),
+                        TitanResult(dict(rexster_raw), self.config)]
+
+    def test_neo4j_result(self):
+        result = self.results[0]
+        assert result.get_id() == 12
+        assert result.get_type() == "edge"
+        assert result.get_outV() == 1
+        assert result.get_inV() == 2
+        assert result.data == {'weight': 1}
+
+    def test_rexster_result(self):
+        result = self.results[1]
+        assert result.get_id() == 5
+        assert result.get_type() == "vertex"
+        assert result.get_data() == {'name': "James"}
+        assert result.data['_type'] == "vertex"
+
+    def test_slots(self):
+        for result in self.results:
+            assert not hasattr(result, '__dict__'), type(result)
+
+    def test_pickle(self):
+        for result in self.results:
+            result.get_id()
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                copy = pickle.loads(pickle.dumps(result, protocol))
+                assert copy.raw == result.raw
+                assert copy.get_id() == result.get_id()
+                assert copy.get_type() == result.get_type()
+
+
+class ElementInitializationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Neo4jClient(Config("http://localhost:7474/db/data/"))
+        raw = {'self': "http://localhost:7474/db/data/node/1", 'data': {'name': "James"}}
+        self.result = Neo4jResult(raw, self.client.config)
+
+    def test_data_is_copied_on_write(self):
+        james = initialize_element(self.client, self.result)
+        assert james.name == "James"
+        james.name = "James T"
+        assert self.result.get_data() == {'name': "James"}
+        assert james.data() == {'name': "James T"}
+
+    def test_shared_proxies(self):
+        james = initialize_element(self.client, self.result)
+        julie = initialize_element(self.client, self.result)
+        assert james._vertices is julie._vertices
+        assert james._edges is julie._edges
+        assert 'eid' not in james.__dict__
+        assert james.eid == 1
+
+    def test_pickle(self):
+        james = initialize_element(self.client, self.result)
+        copy = pickle.loads(pickle.dumps(james))
+        assert copy.eid == 1
+        assert copy.data() == james.data()
+        assert copy._vertices.client is copy._client
+
+
+class CompactElementTestCase(unittest.TestCase):
+
+    def setUp(self):
+        config = Config("http://localhost:7474/db/data/")
+        config.compact_elements = True
+        self.client = Neo4jClient(config)
+        vertex_raw = {'self': "http://localhost:7474/db/data/node/1", 
+                      'data': {'name': "James"}}
+        edge_raw = {'self': "http://localhost:7474/db/data/relationship/12",
+                    'start': "http://localhost:7474/db/data/node/1",
+                    'end': "http://localhost:7474/db/data/node/2",
+                    'type': "knows", 'data': {'weight': 1}}
+        self.vertex_result = Neo4jResult(vertex_raw, config)
+        self.edge_result = Neo4jResult(edge_raw, config)
+
+    def test_vertex(self):
+        james = initialize_element(self.client, self.vertex_result)
+        assert isinstance(james, CompactVertex)
+        assert isinstance(james, Vertex) and not isinstance(james, Edge)
+        assert not hasattr(james, '__dict__')
+        assert james._client is self.client
+        assert james.eid == 1 and james.name == "James"
+        assert repr(james) == "<Vertex: http://localhost:7474/db/data/node/1>"
+        assert coerce_vertex(james) == 1
+        james.name = "James T"
+        assert self.vertex_result.get_data() == {'name': "James"}
+        assert james.data() == {'name': "James T"}
+
+    def test_edge(self):
+        knows = initialize_element(self.client, self.edge_result)
+        assert isinstance(knows, CompactEdge)
+        assert isinstance(knows, Edge) and not isinstance(knows, Vertex)
+        assert knows._outV == 1 and knows._inV == 2
+        assert knows.label() == "knows" and knows.weight == 1
+
+    def test_class_is_shared(self):
+        james = initialize_element(self.client, self.vertex_result)
+        julie = initialize_element(self.client, self.vertex_result)
+        assert type(james) is type(julie)
+        assert james == julie
+        assert james._vertices is julie._vertices
+
+    def test_models_are_not_compacted(self):
+        assert Vertex.get_compact_class(self.client) is not Vertex
+        from bulbs.model import Node
+        assert Node.get_compact_class(self.client) is Node
+
+    def test_pickle(self):
+        james = initialize_element(self.client, self.vertex_result)
+        james.name = "James T"
+        copy = pickle.loads(pickle.dumps(james))
+        assert isinstance(copy, CompactVertex)
+        assert copy.eid == 1
+        assert copy.data() == {'name': "James T"}
+        assert copy._client.config.compact_elements is True
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(ResultTestCase))
+    suite.addTest(unittest.makeSuite(ElementInitializationTestCase))
+    suite.addTest(unittest.makeSuite(CompactElementTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
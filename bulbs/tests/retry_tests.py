@@ -0,0 +1,113 @@
+import time
+import socket
+import unittest
+
+from bulbs.config import Config
+from bulbs.retry import RetryPolicy, CircuitBreaker, CircuitOpenError
+from bulbs.rexster.client import RexsterRequest
+from bulbs.tests import fakes
+
+
+class FakeHttp(fakes.FakeHttp):
+    """Returns the queued outcomes: an HTTP status or an exception."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.requests = 0
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        self.requests += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        content = dict(results=[]) if outcome == 200 else None
+        return self.response(content, outcome)
+
+
+class RetryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config("http://localhost:8182/graphs/emptygraph")
+        self.config.retries = 2
+        self.config.retry_backoff = 0.001
+
+    def _build_request(self, outcomes):
+        request = RexsterRequest(self.config, "application/json")
+        request.http = FakeHttp(outcomes)
+        return request
+
+    def test_retries_idempotent_requests(self):
+        request = self._build_request([503, socket.error("reset"), 200])
+        resp = request.get("vertices/1")
+        assert resp.headers.status == 200
+        assert request.http.requests == 3
+
+    def test_gives_up_after_retries(self):
+        self.config.retry_statuses = [500]
+        request = self._build_request([500, 500, 500, 200])
+        self.assertRaises(SystemError, request.get, "vertices/1")
+        assert request.http.requests == 3
+
+    def test_does_not_retry_post(self):
+        request = self._build_request([socket.error("reset"), 200])
+        self.assertRaises(socket.error, request.post, "vertices", {'name': "James"})
+        assert request.http.requests == 1
+
+    def test_max_elapsed(self):
+        policy = RetryPolicy(retries=5, backoff=1, max_elapsed=0.5)
+        assert policy.get_delay("GET", 0, 0.6) is None
+        for attempt in range(5):
+            delay = policy.get_delay("GET", attempt, 0.2)
+            assert delay is None or delay <= 0.3
+
+    def test_backoff_is_bounded(self):
+        policy = RetryPolicy(retries=10, backoff=1, max_backoff=4)
+        for attempt in range(10):
+            assert 0 <= policy.get_delay("GET", attempt, 0) <= 4
+
+
+class CircuitBreakerTestCase(unittest.TestCase):
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(2, reset_timeout=60)
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+        self.assertRaises(CircuitOpenError, breaker.before_request)
+
+    def test_trial_request_closes_circuit(self):
+        breaker = CircuitBreaker(1, reset_timeout=0)
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_success()
+        assert breaker.opened_at is None
+        assert breaker.failures == 0
+
+    def test_ignores_system_clock_changes(self):
+        breaker = CircuitBreaker(1, reset_timeout=60)
+        breaker.record_failure()
+        system_time = time.time
+        time.time = lambda: system_time() + 3600
+        try:
+            self.assertRaises(CircuitOpenError, breaker.before_request)
+        finally:
+            time.time = system_time
+
+    def test_request_fails_fast(self):
+        config = Config("http://localhost:8182/graphs/emptygraph")
+        config.breaker_threshold = 1
+        request = RexsterRequest(config, "application/json")
+        request.http = FakeHttp([socket.error("refused"), 200])
+        self.assertRaises(socket.error, request.get, "vertices/1")
+        self.assertRaises(CircuitOpenError, request.get, "vertices/1")
+        assert request.http.requests == 1
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(RetryTestCase))
+    suite.addTest(unittest.makeSuite(CircuitBreakerTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -0,0 +1,106 @@
+import time
+import socket
+import unittest
+
+from bulbs.config import Config
+from bulbs.router import Router
+from bulbs.rexster.client import RexsterRequest
+from bulbs.tests import fakes
+
+
+MASTER_URI = "http://master:8182/graphs/emptygraph"
+
+
+class FakeHttp(fakes.FakeHttp):
+    """Records the requested URIs; hosts in down raise a socket error."""
+
+    def __init__(self, down=()):
+        self.down = down
+        self.uris = []
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        self.uris.append(uri)
+        if any(host in uri for host in self.down):
+            raise socket.error("refused")
+        return self.response(dict(results=[]))
+
+
+class RouterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(MASTER_URI)
+        self.config.add_endpoint("http://replica1:8182/graphs/emptygraph")
+        self.config.add_endpoint("http://replica2:8182/graphs/emptygraph/")
+
+    def _build_request(self, down=()):
+        request = RexsterRequest(self.config, "application/json")
+        request.http = FakeHttp(down)
+        return request
+
+    def test_reads_go_to_replicas(self):
+        request = self._build_request()
+        request.get("vertices/1")
+        request.get("vertices/1")
+        request.post("tp/gremlin", {'script': "g.V"}, read_only=True)
+        assert request.http.uris == [
+            "http://replica1:8182/graphs/emptygraph/vertices/1",
+            "http://replica2:8182/graphs/emptygraph/vertices/1",
+            "http://replica1:8182/graphs/emptygraph/tp/gremlin"]
+
+    def test_writes_go_to_master(self):
+        request = self._build_request()
+        request.post("vertices", {'name': "James"})
+        request.delete("vertices/1")
+        assert all(uri.startswith(MASTER_URI) for uri in request.http.uris)
+
+    def test_failed_replica_is_ejected(self):
+        request = self._build_request(down=["replica1"])
+        for i in range(3):
+            request.get("vertices/1")
+        hosts = [uri.split("/")[2] for uri in request.http.uris]
+        assert hosts.count("replica1:8182") == 1
+        assert hosts[-1] == "replica2:8182"
+
+    def test_ejection_ignores_system_clock_changes(self):
+        request = self._build_request(down=["replica1"])
+        request.get("vertices/1")
+        system_time = time.time
+        time.time = lambda: system_time() + 3600
+        try:
+            request.get("vertices/1")
+            request.get("vertices/1")
+        finally:
+            time.time = system_time
+        hosts = [uri.split("/")[2] for uri in request.http.uris]
+        assert hosts.count("replica1:8182") == 1
+
+    def test_falls_back_to_master(self):
+        request = self._build_request(down=["replica"])
+        request.get("vertices/1")
+        assert request.http.uris[-1] == MASTER_URI + "/vertices/1"
+
+    def test_least_outstanding(self):
+        self.config.load_balancer = "least_outstanding"
+        router = Router(self.config)
+        busy = router.get_endpoint(True)
+        router.begin(busy)
+        assert router.get_endpoint(True) is not busy
+        router.end(busy)
+
+    def test_master_role(self):
+        self.config.add_endpoint("http://master2:8182/graphs/emptygraph", "master")
+        assert self.config.root_uri == "http://master2:8182/graphs/emptygraph"
+        self.assertRaises(ValueError, self.config.add_endpoint, MASTER_URI, "slave")
+
+    def test_unknown_load_balancer(self):
+        self.config.load_balancer = "random"
+        self.assertRaises(ValueError, Router, self.config)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(RouterTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
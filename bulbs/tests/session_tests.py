@@ -0,0 +1,91 @@
+import threading
+import unittest
+
+from bulbs.config import Config
+from bulbs.element import Vertex, VertexProxy, Edge, EdgeProxy
+from bulbs.session import Session
+from bulbs.rexster.client import RexsterClient
+from bulbs.tests import fakes
+
+
+VERTEX = {'_id': "1", '_type': "vertex", 'name': "James"}
+EDGE = {'_id': "2", '_type': "edge", '_outV': "1", '_inV': "1", '_label': "knows"}
+
+
+class FakeHttp(fakes.FakeHttp):
+    """Returns vertex 1 and edge 2, and counts the requests."""
+
+    def __init__(self):
+        self.requests = 0
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        self.requests += 1
+        if method == "POST":
+            results = [VERTEX]
+        elif "/edges/" in uri:
+            results = EDGE
+        else:
+            results = VERTEX
+        return self.response(dict(results=results))
+
+
+class SessionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = RexsterClient(Config("http://localhost:8182/graphs/emptygraph"))
+        self.http = FakeHttp()
+        self.client.request.http = self.http
+        self.vertices = VertexProxy(Vertex, self.client)
+        self.edges = EdgeProxy(Edge, self.client)
+
+    def test_no_session(self):
+        assert self.vertices.get(1) is not self.vertices.get(1)
+        assert self.http.requests == 2
+
+    def test_repeated_gets(self):
+        with Session(self.client):
+            james = self.vertices.get(1)
+            assert self.vertices.get("1") is james
+            knows = self.edges.get(2)
+            assert self.edges.get(2) is knows
+            assert knows.outV() is james
+        assert self.http.requests == 2
+
+    def test_traversal_returns_session_element(self):
+        with Session(self.client):
+            james = self.vertices.get(1)
+            assert list(james.outV()) == [james]
+
+    def test_expired_on_update_and_delete(self):
+        with Session(self.client) as session:
+            james = self.vertices.get(1)
+            self.vertices.update(1, name="James T")
+            assert session.get("vertex", 1) is None
+            assert self.vertices.get(1) is not james
+            self.vertices.delete(1)
+            assert session.get("vertex", 1) is None
+
+    def test_closed_session(self):
+        session = Session(self.client).open()
+        james = self.vertices.get(1)
+        session.close()
+        assert self.vertices.get(1) is not james
+        assert not session.identity_map
+
+    def test_scoped_to_thread(self):
+        with Session(self.client):
+            james = self.vertices.get(1)
+            elements = []
+            thread = threading.Thread(target=lambda: elements.append(self.vertices.get(1)))
+            thread.start()
+            thread.join()
+            assert elements[0] is not james
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(SessionTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -0,0 +1,47 @@
+import os
+import sys
+import json
+import unittest
+import subprocess
+
+from bulbs.config import Config
+from bulbs.groovy import GroovyScripts
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Modules that shouldn't be imported until they're used; omnijson imports ujson
+LAZY_MODULES = ["yaml", "numpy", "dateutil.parser", "orjson",
+                "bulbs.neo4jserver.batch", "bulbs.rexster.batch", "bulbs.titan.batch"]
+
+CHILD = """
+import sys
+import json
+import bulbs.neo4jserver, bulbs.rexster, bulbs.titan
+for backend in (bulbs.neo4jserver, bulbs.rexster, bulbs.titan):
+    backend.Graph()
+print(json.dumps(sorted(name for name in %r if name in sys.modules)))
+"""
+
+
+class StartupTestCase(unittest.TestCase):
+
+    def test_lazy_modules(self):
+        code = CHILD % LAZY_MODULES
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT_DIR)
+        assert json.loads(output.decode('utf-8')) == []
+
+    def test_scripts_parsed_on_first_use(self):
+        scripts = GroovyScripts(Config("http://localhost:8182/graphs/emptygraph"))
+        assert scripts._unparsed
+        assert scripts.get("get_vertices")
+        assert scripts._unparsed == []
+        assert "get_vertices" in scripts.get_methods("gremlin")
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(StartupTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from bulbs.codec import get_codec
+from bulbs.stream import ArrayParser, ARRAY, DOCUMENT
+
+
+VALUES = [{'a': [1, {'b': u"x]\"},["}], 'c': None}, u"s,]\\", 3, [], {},
+          True, u"Jérôme", -1.5]
+
+
+class ArrayParserTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.codec = get_codec()
+
+    def _dumps(self, value):
+        content = self.codec.dumps(value)
+        if not isinstance(content, bytes):
+            content = content.encode('utf-8')
+        return content
+
+    def _parse(self, content, key=None, chunk_size=1):
+        parser = ArrayParser(self.codec.loads, key)
+        values = []
+        for start in range(0, len(content), chunk_size):
+            values.extend(parser.feed(content[start:start+chunk_size]))
+        return parser, values
+
+    def test_array(self):
+        content = b"  \n" + self._dumps(VALUES)
+        for chunk_size in (1, 3, len(content)):
+            parser, values = self._parse(content, None, chunk_size)
+            assert parser.mode == ARRAY
+            assert parser.done is True
+            assert values == VALUES
+
+    def test_keyed_array(self):
+        document = {'version': "2.[", 'other': {'results': 1}, 'results': VALUES}
+        content = self._dumps(document)
+        for chunk_size in (1, 3, len(content)):
+            parser, values = self._parse(content, "results", chunk_size)
+            assert parser.mode == ARRAY
+            assert values == VALUES
+
+    def test_empty_array(self):
+        parser, values = self._parse(b"[ ]")
+        assert parser.done is True
+        assert values == []
+
+    def test_document(self):
+        documents = [(b'{"a": 1}', None),
+                     (b'"java.lang.IllegalArgumentException: ..."', None),
+                     (b'null', None),
+                     (b'{"results": {"a": 1}}', "results"),
+                     (b'{"other": [1]}', "results")]
+        for content, key in documents:
+            parser, values = self._parse(content, key)
+            assert parser.mode == DOCUMENT, content
+            assert parser.buffer == content
+            assert values == []
+
+    def test_buffer_is_bounded(self):
+        parser = ArrayParser(self.codec.loads)
+        element = self._dumps({'name': "x" * 100})
+        parser.feed(b"[")
+        for i in range(1000):
+            parser.feed(element + b",")
+            assert len(parser.buffer) <= len(element) + 1
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(ArrayParserTestCase))
+    return suite
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 James Thornton (http://jamesthornton.com)
+# BSD License (see LICENSE for details)
+#
+"""
+Async client and Graph for Titan (Python 3.5+, requires aiohttp).
+
+"""
+from bulbs.aio import AsyncRequest, AsyncIndexMixin, AsyncGraph as BaseAsyncGraph, \
+    execute_script
+
+from .client import TitanClient, TitanResponse
+from .index import VertexIndexProxy, EdgeIndexProxy, KeyIndex
+
+
+class AsyncTitanRequest(AsyncRequest):
+    """Makes async HTTP requests to Titan and returns a TitanResponse."""
+
+    response_class = TitanResponse
+
+
+class AsyncTitanClient(TitanClient):
+    """
+    Low-level client whose request methods are coroutines.
+
+    None of the TitanClient methods post-process the Response so they all
+    return the AsyncRequest coroutine as is, except gremlin(), which may 
+    register the script first.
+
+    :param config: Optional Config object. Defaults to default Config.
+    :type config: bulbs.config.Config
+
+    Example:
+
+    >>> from bulbs.titan.aio import AsyncTitanClient
+    >>> client = AsyncTitanClient()
+    >>> script = client.scripts.get("get_vertices")
+    >>> response = await client.gremlin(script, params=None)
+    >>> result = response.results.next()
+
+    """
+    request_class = AsyncTitanRequest
+
+    def gremlin(self, script, params=None, load=None, stream=False, read_only=False):
+        """
+        Executes a Gremlin script and returns the Response.
+
+        :param script: Gremlin script to execute.
+        :type script: str
+
+        :param params: Param bindings for the script.
+        :type params: dict
+
+        :rtype: coroutine
+
+        """
+        send = lambda script: self._send_gremlin(script, params, load, stream, read_only)
+        return execute_script(self.scripts, send, script)
+
+
+class AsyncVertexIndexProxy(VertexIndexProxy):
+    """Manage vertex key indices on Titan from an asyncio event loop."""
+
+    async def get_or_create(self, index_name="vertex", index_params=None):
+        # Titan's key index doesn't require a server round trip
+        return self.get(index_name)
+
+
+class AsyncEdgeIndexProxy(EdgeIndexProxy):
+    """Manage edge key indices on Titan from an asyncio event loop."""
+
+    async def get_or_create(self, index_name="edge", index_params=None):
+        # Titan's key index doesn't require a server round trip
+        return self.get(index_name)
+
+
+class AsyncKeyIndex(AsyncIndexMixin, KeyIndex):
+    """Titan's key index with coroutine lookups."""
+
+    @classmethod
+    def get_proxy_class(cls, base_type):
+        """
+        Returns the async IndexProxy class.
+
+        :param base_type: Index base type, either vertex or edge.
+        :type base_type: str
+
+        :rtype: class
+
+        """
+        class_map = dict(vertex=AsyncVertexIndexProxy, edge=AsyncEdgeIndexProxy)
+        return class_map[base_type]
+
+    async def keys(self):
+        """Return the index's keys."""
+        # Titan does not support edge indices.
+        resp = await self.client.get_vertex_keys()
+        return [result.raw for result in resp.results]
+
+
+class AsyncGraph(BaseAsyncGraph):
+    """
+    The asyncio interface to Titan.
+
+    :param config: Optional. Defaults to the default config.
+    :type config: bulbs.config.Config
+
+    Example:
+
+    >>> from bulbs.titan.aio import AsyncGraph
+    >>> async with AsyncGraph() as g:
+    ...     james = await g.vertices.create(name="James")
+    ...     julie = await g.vertices.create(name="Julie")
+    ...     await g.edges.create(james, "knows", julie)
+
+    """
+    client_class = AsyncTitanClient
+    default_index = AsyncKeyIndex
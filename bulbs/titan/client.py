@@ -23,7 +23,7 @@ from bulbs.utils import json, build_path, get_file_path, urlsplit, coerce_id
 ##### Titan
 
 from bulbs.rexster.client import RexsterClient, \
-    RexsterResponse, RexsterResult
+    RexsterResponse, RexsterResult, RexsterStreamResponse
 
 # The default URIs
 TITAN_URI = "http://localhost:8182/graphs/graph"
@@ -55,7 +55,7 @@ class TitanResult(RexsterResult):
     :ivar data: The data in the result.
 
     """
-    pass
+    __slots__ = []
 
 
 class TitanResponse(RexsterResponse):
@@ -82,11 +82,17 @@ class TitanResponse(RexsterResponse):
 
 
 
+class TitanStreamResponse(RexsterStreamResponse, TitanResponse):
+    """TitanResponse whose results are decoded as the HTTP body is read."""
+
+
 class TitanRequest(Request):
     """Makes HTTP requests to Rexster and returns a RexsterResponse.""" 
     
     response_class = TitanResponse
 
+    stream_response_class = TitanStreamResponse
+
 
 data_type = dict(string="String", 
                  integer="Integer", 
@@ -106,7 +112,7 @@ class TitanClient(RexsterClient):
     :ivar config: Config object.
     :ivar registry: Registry object.
     :ivar scripts: GroovyScripts object.  
-    :ivar type_system: JSONTypeSystem object.
+    :ivar type_system: TypeSystem object selected by Config.type_system.
     :ivar request: TitanRequest object.
 
     Example:
@@ -194,6 +200,39 @@ class TitanClient(RexsterClient):
         params = build_params(_label=label, _limit=limit, _properties=properties)
         return self.request.get(path, params)
 
+    # Multi-Get
+
+    def multi_get_vertices(self, id_list):
+        """
+        Gets the vertices with the IDs and returns the Response. 
+        The vertices that don't exist aren't returned.
+
+        :param id_list: Vertex IDs.
+        :type id_list: list
+
+        :rtype: TitanResponse
+
+        """
+        # Titan's Rexster doesn't include the batch extension 
+        script = self.scripts.get("get_vertices_by_id")
+        params = dict(id_list=list(id_list))
+        return self.gremlin(script, params, read_only=True)
+
+    def multi_get_edges(self, id_list):
+        """
+        Gets the edges with the IDs and returns the Response. 
+        The edges that don't exist aren't returned.
+
+        :param id_list: Edge IDs.
+        :type id_list: list
+
+        :rtype: TitanResponse
+
+        """
+        script = self.scripts.get("get_edges_by_id")
+        params = dict(id_list=list(id_list))
+        return self.gremlin(script, params, read_only=True)
+
     # Key Indices
 
     # Titan-Specific Index Methods
@@ -316,6 +355,12 @@ class TitanClient(RexsterClient):
     def delete_edge_index(self, name):
         raise NotImplementedError
 
+    # Index Proxy - Bulk
+    # Titan's key indices don't have to be created
+
+    def get_or_create_indices(self, indices):
+        raise NotImplementedError
+
     # Index Container - Vertex
 
     def put_vertex(self, index_name, key, value, _id):
@@ -402,6 +447,29 @@ class TitanClient(RexsterClient):
 
         """
         return self.create_vertex(data)
+
+    def create_indexed_vertices(self, data_list, index_name, keys=None):
+        """
+        Creates the vertices in one transaction, indexes them, and returns the 
+        Response, which has the vertices in the order of the data.
+
+        :param data_list: Property data dicts.
+        :type data_list: list
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index.
+        :type keys: list
+
+        :rtype: TitanResponse
+
+        """
+        # Titan maintains its own key indices
+        data_list = [self._remove_null_values(data) for data in data_list]
+        params = dict(data_list=data_list)
+        script = self.scripts.get("create_vertices")
+        return self.gremlin(script,params)
     
     def update_indexed_vertex(self, _id, data, index_name, keys=None):
         """
@@ -424,6 +492,32 @@ class TitanClient(RexsterClient):
         """
         return self.update_vertex(_id, data)
 
+    def patch_indexed_vertex(self, _id, data, index_name, keys=None):
+        """
+        Updates the changed properties of a vertex and returns the Response.
+
+        :param _id: Vertex ID.
+        :type _id: int
+
+        :param data: Changed property data. Properties set to None are removed.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: TitanResponse
+
+        """
+        # Titan maintains its own key indices
+        removed = self._get_null_keys(data)
+        data = self._remove_null_values(data)
+        params = dict(_id=_id,data=data,removed=removed)
+        script = self.scripts.get("patch_vertex")
+        return self.gremlin(script,params)
+
     # Model Proxy - Edge
 
     def create_indexed_edge(self, outV, label, inV, data, index_name, keys=None):
@@ -452,6 +546,32 @@ class TitanClient(RexsterClient):
 
         """
         return self.create_edge(outV, label, inV, data)
+
+    def create_indexed_edges(self, label, edges, index_name, keys=None):
+        """
+        Creates the edges in one transaction, indexes them, and returns the 
+        Response, which has the edges in the order they were passed in.
+
+        :param label: Edge label.
+        :type label: str
+
+        :param edges: List of (outV, inV, data) tuples.
+        :type edges: list
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: TitanResponse
+
+        """
+        # Titan maintains its own key indices
+        edges = [(outV, inV, self._remove_null_values(data)) for outV, inV, data in edges]
+        params = dict(label=label,edges=edges)
+        script = self.scripts.get("create_edges")
+        return self.gremlin(script,params)
         
     def update_indexed_edge(self, _id, data, index_name, keys=None):
         """
@@ -474,6 +594,32 @@ class TitanClient(RexsterClient):
         """
         return self.update_edge(_id, data)
 
+    def patch_indexed_edge(self, _id, data, index_name, keys=None):
+        """
+        Updates the changed properties of an edge and returns the Response.
+
+        :param _id: Edge ID.
+        :type _id: int
+
+        :param data: Changed property data. Properties set to None are removed.
+        :type data: dict
+
+        :param index_name: Name of the index.
+        :type index_name: str
+
+        :param keys: Property keys to index. Defaults to None (indexes all properties).
+        :type keys: list
+
+        :rtype: TitanResponse
+
+        """
+        # Titan maintains its own key indices
+        removed = self._get_null_keys(data)
+        data = self._remove_null_values(data)
+        params = dict(_id=_id,data=data,removed=removed)
+        script = self.scripts.get("patch_edge")
+        return self.gremlin(script,params)
+
 
 
 # Utils
@@ -19,6 +19,15 @@ class IndexProxy(object):
 
         # The Client object for the database.
         self.client = client
+
+    def get_index_params(self):
+        """
+        Returns the params used to create the index.
+
+        :rtype: dict or None
+
+        """
+        return None
     
 
 class VertexIndexProxy(IndexProxy):
@@ -267,6 +276,8 @@ class Index(object):
                      the form of name='James'.
         """
         key, value = self._get_key_value(key, value, pair)
+        # Titan's key indices are written by the server, so their lookups
+        # aren't cached.
         resp = self.client.lookup_vertex(self.index_name,key,value)
         return initialize_elements(self.client,resp)
 
@@ -9,6 +9,7 @@ import inspect
 import logging
 import numbers
 import codecs
+import itertools
 
 import six  # Python 3
 import time
@@ -16,6 +17,8 @@ import datetime
 import calendar
 import omnijson as json # supports Python 2.5-3.2
 
+from .session import get_session
+
 
 #
 # Python 3 
@@ -78,17 +81,104 @@ log = get_logger(__name__)
 def initialize_elements(client,response):
     # return None if there were no results; otherwise,
     # return a generator of initialized elements.
-    if response.total_size > 0:
+    # Streamed responses don't know their size until the results are read.
+    if response.total_size is None or response.total_size > 0:
         # yield doesn't work for conditionals
-        return (initialize_element(client, result) for result in response.results)
+        return _initialize_chunks(client, response.results)
+
+def _initialize_chunks(client, results):
+    # Initializes the elements a chunk of results at a time so Models can 
+    # convert their Property data a column at a time.
+    size = getattr(client.config, "hydrate_size", 1000)
+    for chunk in get_chunks(results, size):
+        for element in initialize_element_list(client, chunk):
+            yield element
+
+def initialize_element_list(client, results):
+    # results should be a list of Result objects. Elements of the same class
+    # are initialized together if the class defines _initialize_many().
+    session = get_session(client)
+    elements = []
+    loaded = {}     # elements added to the session in this chunk
+    groups = {}     # element class => (elements, results)
+    for result in results:
+        key = (result.get_type(), result.get_id())
+        element = loaded.get(key)
+        if element is None:
+            element, is_new = _get_element(client, session, result)
+            if is_new:
+                group = groups.setdefault(type(element), ([], []))
+                group[0].append(element)
+                group[1].append(result)
+                if session is not None:
+                    loaded[key] = element
+        elements.append(element)
+    for element_class in groups:
+        group_elements, group_results = groups[element_class]
+        initialize_many = getattr(element_class, "_initialize_many", None)
+        if initialize_many is not None:
+            initialize_many(group_elements, group_results)
+        else:
+            for element, result in zip(group_elements, group_results):
+                element._initialize(result)
+        if session is not None:
+            for element in group_elements:
+                session.add(element)
+    return elements
 
 def initialize_element(client,result):
     # result should be a single Result object, not a list or generator
-    element_class = get_element_class(client,result)
-    element = element_class(client)
-    element._initialize(result)
+    session = get_session(client)
+    element, is_new = _get_element(client, session, result)
+    if is_new:
+        element._initialize(result)
+        if session is not None:
+            session.add(element)
     return element
 
+def _get_element(client, session, result):
+    # Returns the element already loaded in the session, if any; otherwise,
+    # returns a new element of the result's class, which isn't initialized.
+    # The second value is True if the element is new.
+    if session is not None:
+        element = session.get(result.get_type(), result.get_id())
+        if element is not None:
+            return element, False
+    element_class = get_element_class(client,result)
+    if getattr(client.config, "compact_elements", False):
+        element_class = element_class.get_compact_class(client)
+    return element_class(client), True
+
+def expire_element(client, base_type, _id):
+    # Write-through invalidation: removes the element from the session and
+    # the cache after it's created, updated, or deleted.
+    session = get_session(client)
+    if session is not None:
+        session.expire(base_type, _id)
+    cache = getattr(client, "cache", None)
+    if cache is not None:
+        cache.expire(base_type, _id)
+
+def expire_lookup(client, index_class, index_name, key, value):
+    # Expires the cached index lookup after the key/value pair is modified.
+    cache = getattr(client, "cache", None)
+    if cache is not None:
+        cache.expire_lookup(index_class, index_name, key, value)
+
+def expire_indexed(client, index_class, index_name, data, keys=None):
+    # Expires the cached lookups of the data's indexed key/value pairs,
+    # e.g. after an element is created with or patched from that data.
+    for key, value in data.items():
+        if value is not None and (keys is None or key in keys):
+            expire_lookup(client, index_class, index_name, key, value)
+
+def expire_index(client, index_class, index_name):
+    # Expires all the cached lookups of an index, e.g. after an element is 
+    # reindexed and the values it was indexed by aren't known.
+    cache = getattr(client, "cache", None)
+    if cache is not None:
+        cache.expire_index(index_class, index_name)
+
 def get_element_class(client,result):
     element_key = get_element_key(client,result)
     element_class = client.registry.get_class(element_key)
@@ -131,6 +221,15 @@ def get_one_result(resp):
     return result
     
 
+def get_results_list(resp):
+    # Returns the Response's results as a list, whether the Response contains 
+    # no results, a single Result object, or a generator of Result objects.
+    if resp.results is None:
+        return []
+    if inspect.isgenerator(resp.results) or isinstance(resp.results, list):
+        return list(resp.results)
+    return [resp.results]
+
 def get_key_value(key, value, pair):
     """Return the key and value, regardless of how it was entered."""
     if pair:
@@ -172,7 +271,7 @@ def is_string(value):
     return isinstance(value, six.string_types)
 
 def encode_dict(d):
-    for key in d:
+    for key in list(d):
         val = d.pop(key)
         #key = encode_value(key)
         #d[key] = encode_value(val)
@@ -257,6 +356,26 @@ def extract(desired_keys, bigdict):
     subset = dict([(i, bigdict[i]) for i in desired_keys if i in bigdict])
     return subset
 
+def get_chunks(iterable, size):
+    """
+    Yields lists of up to size items from the iterable.
+
+    :param iterable: Items to chunk; can be a generator.
+    :type iterable: iterable
+
+    :param size: Max number of items in a chunk. None or 0 means no limit.
+    :type size: int
+
+    :rtype: generator
+
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size or None))
+        if not chunk:
+            return
+        yield chunk
+
 def get_file_path(current_filename, target_filename):
     """
     Returns the full file path for the target file.
@@ -1,6 +1,5 @@
 import os
 import io
-import yaml 
 from string import Template
 from .utils import get_file_path
 
@@ -37,6 +36,8 @@ class Yaml(object):
         return file_name
 
     def _get_templates(self,file_name):
+        # PyYAML is slow to import so it's only imported when it's used
+        import yaml
         templates = dict()
         with io.open(file_name, encoding='utf-8') as f:
             yaml_map = yaml.load(f)    
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    bench-elements
+    ~~~~~~~~~~~~~~
+
+    Micro-benchmark for utils.initialize_element, which builds an Element
+    from each result of a get or traversal. Prints the time and memory per
+    element for generic Vertices, compact Vertices, and for a Node model.
+
+    Usage: python scripts/bench-elements.py [count]
+
+"""
+import sys
+import os
+import gc
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None  # Python 2
+
+from bulbs.config import Config
+from bulbs.model import Node
+from bulbs.property import String, Integer
+from bulbs.utils import initialize_element
+from bulbs.neo4jserver.client import Neo4jClient, Neo4jResult
+
+
+class Person(Node):
+    element_type = "person"
+
+    name = String()
+    age = Integer()
+
+
+def build_results(config, count, element_type):
+    results = []
+    for i in range(count):
+        raw = {"self": "http://localhost:7474/db/data/node/%d" % i,
+               "data": {"element_type": element_type, "name": "James", "age": 34}}
+        results.append(Neo4jResult(raw, config))
+    return results
+
+
+def initialize(client, results):
+    return [initialize_element(client, result) for result in results]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    config = Config("http://localhost:7474/db/data/")
+    client = Neo4jClient(config)
+    client.registry.add_class(Person)
+    compact_config = Config("http://localhost:7474/db/data/")
+    compact_config.compact_elements = True
+    compact_client = Neo4jClient(compact_config)
+    print("%8s %10s %16s %18s" % ("element", "count", "usec per element", "bytes per element"))
+    runs = (("vertex", client, "vertex"), 
+            ("compact", compact_client, "vertex"),
+            ("person", client, "person"))
+    for name, run_client, element_type in runs:
+        results = build_results(config, count, element_type)
+        seconds = timeit.timeit(lambda: initialize(run_client, results), number=1)
+        size = 0
+        if tracemalloc is not None:
+            gc.collect()
+            tracemalloc.start()
+            elements = initialize(run_client, results)
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del elements
+        print("%8s %10d %16.2f %18d" % (name, count, seconds / count * 1e6, size // count))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    bench-models
+    ~~~~~~~~~~~~
+
+    Micro-benchmark for Model property conversion. Prints the time per
+    element to load (hydrate) a Node from a DB result, one at a time and a 
+    list at a time (which converts each Property a column at a time), and 
+    to dump its validated property data for a save.
+
+    Usage: python scripts/bench-models.py [count]
+
+"""
+import sys
+import os
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bulbs.config import Config
+from bulbs.model import Node
+from bulbs.property import String, Integer, Float, Bool, List, DateTime
+from bulbs.utils import initialize_element, initialize_element_list, get_chunks
+from bulbs.neo4jserver.client import Neo4jClient, Neo4jResult
+
+
+class Person(Node):
+    element_type = "person"
+
+    name = String(nullable=False)
+    age = Integer()
+    score = Float()
+    active = Bool()
+    tags = List()
+    created = DateTime()
+    updated = DateTime()
+
+
+def build_results(config, count):
+    results = []
+    for i in range(count):
+        raw = {"self": "http://localhost:7474/db/data/node/%d" % i,
+               "data": {"element_type": "person", "name": "James", "age": 34,
+                        "score": 0.5, "active": True, "tags": ["a", "b"],
+                        "created": 1351000000, "updated": 1351000000.5}}
+        results.append(Neo4jResult(raw, config))
+    return results
+
+
+def load(client, results):
+    return [initialize_element(client, result) for result in results]
+
+
+def load_many(client, results):
+    people = []
+    for chunk in get_chunks(results, client.config.hydrate_size):
+        people.extend(initialize_element_list(client, chunk))
+    return people
+
+
+def dump(people):
+    return [person._get_property_data() for person in people]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    config = Config("http://localhost:7474/db/data/")
+    client = Neo4jClient(config)
+    client.registry.add_class(Person)
+    results = build_results(config, count)
+    people = load(client, results)
+    print("%10s %10s %16s" % ("phase", "count", "usec per element"))
+    for phase, run in (("load", lambda: load(client, results)),
+                       ("load_many", lambda: load_many(client, results)),
+                       ("dump", lambda: dump(people))):
+        seconds = min(timeit.repeat(run, number=1, repeat=3))
+        print("%10s %10d %16.2f" % (phase, count, seconds / count * 1e6))
+
+
+if __name__ == '__main__':
+    main()
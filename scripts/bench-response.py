@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    bench-response
+    ~~~~~~~~~~~~~~
+
+    Micro-benchmark for Neo4jResponse.handle_response. The time per call
+    should stay flat as the response body grows.
+
+    Usage: python scripts/bench-response.py
+
+"""
+import sys
+import os
+import json
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import httplib2
+
+from bulbs.neo4jserver.client import Neo4jResponse
+
+
+def build_results(size):
+    node = {"self": "http://localhost:7474/db/data/node/1",
+            "data": {"name": "James", "age": 34}}
+    count = max(1, size // len(json.dumps(node)))
+    return json.dumps([node] * count).encode('utf-8')
+
+
+def build_string(size):
+    # a Gremlin script that returns a string that starts like an exception
+    return json.dumps("java.util.ArrayList " + "x" * size).encode('utf-8')
+
+
+def main():
+    headers = httplib2.Response(dict(status="200"))
+    # handle_response doesn't use any state set by __init__
+    resp = Neo4jResponse.__new__(Neo4jResponse)
+    print("%8s %12s %14s" % ("body", "size", "usec per call"))
+    for build_content in (build_results, build_string):
+        for size in (1 << 10, 1 << 16, 1 << 20, 1 << 24):
+            response = (headers, build_content(size))
+            number = 200
+            seconds = timeit.timeit(lambda: resp.handle_response(response), number=number)
+            name = build_content.__name__.split("_")[1]
+            print("%8s %12d %14.2f" % (name, len(response[1]), seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    bench-startup
+    ~~~~~~~~~~~~~
+
+    Startup benchmark for cold starts, e.g. CLI tools and serverless
+    handlers. For each backend it prints the median time, in a new Python
+    process each run, to import the backend package, to construct a Graph,
+    and to get or create its indices with ensure_indices(). The Graph
+    connects to a local stub server.
+
+    Usage: python scripts/bench-startup.py [runs]
+
+"""
+import sys
+import os
+import json
+import threading
+import subprocess
+
+from six.moves import BaseHTTPServer
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+BACKENDS = [("neo4jserver", "/db/data/"),
+            ("rexster", "/graphs/emptygraph"),
+            ("titan", "/graphs/graph")]
+
+CHILD = """
+import time
+start = time.time()
+import bulbs.%(backend)s as backend
+imported = time.time()
+g = backend.Graph(backend.Config(%(uri)r))
+g.add_proxy("people", backend.Node)
+constructed = time.time()
+g.ensure_indices()
+ensured = time.time()
+print("%%f %%f %%f" %% (imported - start, constructed - imported, ensured - constructed))
+"""
+
+
+class StubHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Answers Gremlin scripts and Neo4j index requests with empty results."""
+
+    def do_request(self):
+        length = int(self.headers.get('content-length') or 0)
+        body = json.loads(self.rfile.read(length).decode('utf-8')) if length else {}
+        if not self.path.startswith("/db/data/"):
+            content = dict(results=[], success=True)
+        elif 'script' in body:
+            content = []
+        else:
+            # Neo4j's create index endpoint
+            template = "http://%s:%d%s/%s/{key}/{value}" % (
+                self.server.server_address + (self.path, body.get('name')))
+            content = dict(template=template, type="exact", provider="lucene")
+        content = json.dumps(content).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', "application/json")
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_request
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def run(backend, uri):
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR)
+    code = CHILD % dict(backend=backend, uri=uri)
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT_DIR, env=env)
+    return [float(seconds) for seconds in output.split()]
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 11
+    server = start_server()
+    host, port = server.server_address
+    print("%12s %10s %10s %16s %10s" % ("backend", "import ms", "Graph() ms",
+                                        "ensure_indices ms", "total ms"))
+    for backend, path in BACKENDS:
+        uri = "http://%s:%d%s" % (host, port, path)
+        # the first run fills the Groovy script cache
+        run(backend, uri)
+        timings = [run(backend, uri) for i in range(runs)]
+        columns = [median(column) * 1000 for column in zip(*timings)]
+        total = median([sum(timing) for timing in timings]) * 1000
+        print("%12s %10.1f %10.1f %16.1f %10.1f" % tuple([backend] + columns + [total]))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
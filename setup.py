@@ -78,6 +78,7 @@ setup (
     zip_safe=False,
     platforms='any',
     install_requires=install_requires, 
+    extras_require={'async': ['aiohttp>=3.0'], 'numpy': ['numpy'], 'msgpack': ['msgpack>=1.0']},
     classifiers = [
         "Programming Language :: Python",
         'Programming Language :: Python :: 3',
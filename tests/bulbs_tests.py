@@ -1,5 +1,25 @@
 import unittest
 
+from bulbs.tests.aio_tests import suite as aio_suite
+from bulbs.tests.bulk_tests import suite as bulk_suite
+from bulbs.tests.cache_tests import suite as cache_suite
+from bulbs.tests.codec_tests import suite as codec_suite
+from bulbs.tests.compression_tests import suite as compression_suite
+from bulbs.tests.conversion_tests import suite as conversion_suite
+from bulbs.tests.dirty_tests import suite as dirty_suite
+from bulbs.tests.factory_tests import suite as factory_suite
+from bulbs.tests.groovy_tests import suite as groovy_suite
+from bulbs.tests.messagepack_tests import suite as messagepack_suite
+from bulbs.tests.multi_get_tests import suite as multi_get_suite
+from bulbs.tests.pool_tests import suite as pool_suite
+from bulbs.tests.result_tests import suite as result_suite
+from bulbs.tests.retry_tests import suite as retry_suite
+from bulbs.tests.router_tests import suite as router_suite
+from bulbs.tests.session_tests import suite as session_suite
+from bulbs.tests.startup_tests import suite as startup_suite
+from bulbs.tests.stream_tests import suite as stream_suite
+from bulbs.neo4jserver.tests.batch_tests import neo4j_batch_suite
+
 from bulbs.rexster.tests.bulbs_tests import test_suite as rexster_bulbs_suite
 from bulbs.rexster.tests.client_tests import rexster_client_suite
 
@@ -10,11 +30,41 @@ from bulbs.titan.tests.bulbs_tests import test_suite as titan_bulbs_suite
 from bulbs.titan.tests.client_tests import titan_client_suite
 
 
+def offline_suite():
+    # These don't require a server.
+
+    suite = unittest.TestSuite()
+
+    suite.addTest(aio_suite())
+    suite.addTest(bulk_suite())
+    suite.addTest(cache_suite())
+    suite.addTest(codec_suite())
+    suite.addTest(compression_suite())
+    suite.addTest(conversion_suite())
+    suite.addTest(dirty_suite())
+    suite.addTest(factory_suite())
+    suite.addTest(groovy_suite())
+    suite.addTest(messagepack_suite())
+    suite.addTest(multi_get_suite())
+    suite.addTest(pool_suite())
+    suite.addTest(result_suite())
+    suite.addTest(retry_suite())
+    suite.addTest(router_suite())
+    suite.addTest(session_suite())
+    suite.addTest(startup_suite())
+    suite.addTest(stream_suite())
+    suite.addTest(neo4j_batch_suite())
+
+    return suite
+
+
 def suite():
     # This requires Neo4j Server and Rexster are running.
     
     suite = unittest.TestSuite()
 
+    suite.addTest(offline_suite())
+
     suite.addTest(rexster_client_suite())
     suite.addTest(rexster_bulbs_suite())
 